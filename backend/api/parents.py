@@ -7,11 +7,8 @@ from pydantic import BaseModel
 from typing import List, Optional
 import logging
 
-from db import student_progress as db_progress
-from db import achievements as db_achievements
-from db import submissions as db_submissions
-from db import profiles as db_profiles
-from db.supabase_client import get_supabase_client
+from db.dashboard_cache import get_dashboard_cache
+from db.supabase_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +41,7 @@ async def get_parent_profile(authorization: Optional[str] = Header(None)):
         
         # For now, we'll get parent from Supabase client
         # In production, validate JWT token and extract user_id
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         # This is a placeholder - in production, extract user_id from JWT
         # For now, we'll need to pass parent_id as a query param or use proper auth
@@ -104,7 +101,7 @@ async def get_child_progress(
         
         # Verify parent has access to this student via RLS
         # For now, RLS policies handle this, so we can just fetch progress
-        progress = await db_progress.get_or_create_progress(student_id)
+        progress = await get_dashboard_cache().progress(student_id)
         return progress
     except Exception as e:
         logger.error(f"Error fetching child progress: {e}")
@@ -121,7 +118,7 @@ async def get_child_submissions(
             raise HTTPException(status_code=401, detail="Authorization required")
         
         # RLS policies handle access control
-        submissions = await db_submissions.get_student_submissions(student_id)
+        submissions = await get_dashboard_cache().submissions(student_id)
         return {"submissions": submissions}
     except Exception as e:
         logger.error(f"Error fetching child submissions: {e}")
@@ -138,7 +135,7 @@ async def get_child_achievements(
             raise HTTPException(status_code=401, detail="Authorization required")
         
         # RLS policies handle access control
-        achievements = await db_achievements.get_student_achievements(student_id)
+        achievements = await get_dashboard_cache().achievements(student_id)
         return {"achievements": achievements}
     except Exception as e:
         logger.error(f"Error fetching child achievements: {e}")
@@ -155,8 +152,8 @@ async def get_child_sessions(
             raise HTTPException(status_code=401, detail="Authorization required")
         
         # Fetch sessions from database
-        supabase = get_supabase_client()
-        result = supabase.table("sessions").select("*").eq("student_id", student_id).order("created_at", desc=True).execute()
+        supabase = get_async_client()
+        result = await supabase.table("sessions").select("*").eq("student_id", student_id).order("created_at", desc=True).execute()
         
         return {"sessions": result.data if result.data else []}
     except Exception as e:
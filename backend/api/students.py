@@ -3,13 +3,12 @@ API endpoints for Student Progress and Achievements
 """
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+import asyncio
 import logging
 
-from db import student_progress as db_progress
-from db import achievements as db_achievements
-from db import submissions as db_submissions
 from db import profiles as db_profiles
+from db.dashboard_cache import get_dashboard_cache
 from nlp import recommender
 
 logger = logging.getLogger(__name__)
@@ -30,11 +29,39 @@ class AchievementResponse(BaseModel):
     achievement_type: str
     earned_at: str
 
+async def _load_recommendations(student_id: str) -> Dict[str, Any]:
+    """Recommended words from the student's latest profile"""
+    # Get latest profile
+    profiles = await db_profiles.get_student_profiles(student_id)
+    if not profiles:
+        return {"recommended_words": []}
+    
+    latest_profile = profiles[0]  # Already sorted by created_at desc
+    
+    # Get recommendations
+    recommender_instance = recommender.WordRecommender()
+    recommendations = await recommender_instance.recommend_words(
+        profile={
+            'word_scores': latest_profile.get('word_scores', {}),
+            'resonance_data': latest_profile.get('resonance_data', {})
+        },
+        count=7,
+        student_id=student_id
+    )
+    
+    return {
+        "recommended_words": recommendations,
+        "vocabulary_level": latest_profile.get('resonance_data', {}).get('vocabulary_level', 'beginner')
+    }
+
+async def _cached_recommendations(student_id: str) -> Dict[str, Any]:
+    return await get_dashboard_cache().get(student_id, 'recommendations', lambda: _load_recommendations(student_id))
+
 @router.get("/{student_id}/progress", response_model=StudentProgressResponse)
 async def get_student_progress(student_id: str):
     """Get student progress"""
     try:
-        progress = await db_progress.get_or_create_progress(student_id)
+        progress = await get_dashboard_cache().progress(student_id)
         return StudentProgressResponse(**progress)
     except Exception as e:
         logger.error(f"Error fetching progress: {e}")
@@ -44,7 +71,7 @@ async def get_student_progress(student_id: str):
 async def get_student_achievements(student_id: str):
     """Get all achievements for a student"""
     try:
-        achievements = await db_achievements.get_student_achievements(student_id)
+        achievements = await get_dashboard_cache().achievements(student_id)
         return {"achievements": achievements}
     except Exception as e:
         logger.error(f"Error fetching achievements: {e}")
@@ -54,27 +81,7 @@ async def get_student_achievements(student_id: str):
 async def get_student_recommendations(student_id: str):
     """Get recommended words for a student based on their latest profile"""
     try:
-        # Get latest profile
-        profiles = await db_profiles.get_student_profiles(student_id)
-        if not profiles:
-            return {"recommended_words": []}
-        
-        latest_profile = profiles[0]  # Already sorted by created_at desc
-        
-        # Get recommendations
-        recommender_instance = recommender.WordRecommender()
-        recommendations = await recommender_instance.recommend_words(
-            profile={
-                'word_scores': latest_profile.get('word_scores', {}),
-                'resonance_data': latest_profile.get('resonance_data', {})
-            },
-            count=7
-        )
-        
-        return {
-            "recommended_words": recommendations,
-            "vocabulary_level": latest_profile.get('resonance_data', {}).get('vocabulary_level', 'beginner')
-        }
+        return await _cached_recommendations(student_id)
     except Exception as e:
         logger.error(f"Error fetching recommendations: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -83,22 +90,49 @@ async def get_student_recommendations(student_id: str):
 async def get_student_submissions(student_id: str, limit: int = 50):
     """Get submission history for a student"""
     try:
-        submissions = await db_submissions.get_student_submissions(student_id, limit)
+        submissions = await get_dashboard_cache().submissions(student_id, limit)
         return {"submissions": submissions}
     except Exception as e:
         logger.error(f"Error fetching submissions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{student_id}/dashboard")
+async def get_student_dashboard(student_id: str, limit: int = 50):
+    """
+    Get everything the student dashboard shows in one call: progress,
+    achievements, recommendations and the latest submissions
+    
+    Sections come from the dashboard cache; missing ones are read concurrently.
+    """
+    try:
+        cache = get_dashboard_cache()
+        progress, achievements, recommendations, submissions = await asyncio.gather(
+            cache.progress(student_id),
+            cache.achievements(student_id),
+            _cached_recommendations(student_id),
+            cache.submissions(student_id, limit)
+        )
+        return {
+            "progress": StudentProgressResponse(**progress),
+            "achievements": achievements,
+            "recommended_words": recommendations["recommended_words"],
+            "vocabulary_level": recommendations.get("vocabulary_level"),
+            "submissions": submissions
+        }
+    except Exception as e:
+        logger.error(f"Error fetching dashboard: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{student_id}")
 async def get_student(student_id: str):
     """Get student information by ID"""
     try:
-        from db.supabase_client import get_supabase_client
-        supabase = get_supabase_client()
+        from db.supabase_client import get_async_client
+        supabase = get_async_client()
         
-        result = supabase.table("students").select("id, name, user_id").eq("id", student_id).maybe_single().execute()
+        result = await supabase.table("students").select("id, name, user_id").eq("id", student_id).maybe_single().execute()
         
-        if not result.data:
+        if not result or not result.data:
             raise HTTPException(status_code=404, detail="Student not found")
         
         return result.data
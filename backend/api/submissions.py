@@ -1,28 +1,48 @@
 """
 API endpoints for Submissions
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
+import asyncio
+import codecs
+import json
 import logging
+import os
+import tempfile
 
 from db import submissions as db_submissions
-from db.supabase_client import get_supabase_client
-from nlp import profiler, recommender
+from db.dashboard_cache import invalidate_student_dashboard
+from db.supabase_client import get_async_client
+from nlp import recommender
+from nlp.executor import get_profiling_executor, ProfilerBusyError, busy_exception
+from nlp.grade_levels import grade_level_to_progress_level
+from nlp.transcript_json import JSONTranscriptError
 from nlp.transcript_parser import TranscriptParser
+from nlp.transcript_stream import TranscriptStream, SpeakerSummary
 from utils.file_parser import extract_text_from_file
+from utils.jobs import Job, JobQueueFullError, JobRunner, get_job_queue, queue_full_exception
+from utils.stages import Stage, run_stages
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Streamed transcripts (override via environment)
+STREAM_READ_BYTES = 64 * 1024  # Upload read size
+STREAM_STORED_CONTENT_CHARS = int(os.getenv("STREAM_STORED_CONTENT_CHARS", "200000"))  # Transcript stored with a streamed submission
+
+# Submission job events (override via environment)
+JOB_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("JOB_EVENTS_KEEPALIVE_SECONDS", "15"))  # Comment sent on an idle event stream
+
 async def _ensure_student_exists(student_id: str):
     """Ensure student exists in database, create if anonymous"""
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         # Check if student exists
-        result = supabase.table("students").select("id").eq("id", student_id).execute()
+        result = await supabase.table("students").select("id").eq("id", student_id).execute()
         
         if result.data:
             return  # Student exists
@@ -41,11 +61,11 @@ async def _ensure_student_exists(student_id: str):
             
             try:
                 # First, ensure the system user exists in users table
-                user_check = supabase.table("users").select("id").eq("id", SYSTEM_ANON_USER_ID).execute()
+                user_check = await supabase.table("users").select("id").eq("id", SYSTEM_ANON_USER_ID).execute()
                 if not user_check.data:
                     # Try to create system user (may fail if auth.users doesn't have it)
                     try:
-                        supabase.table("users").insert({
+                        await supabase.table("users").insert({
                             "id": SYSTEM_ANON_USER_ID,
                             "email": "anonymous@palabam.local",
                             "role": "student"
@@ -60,14 +80,14 @@ async def _ensure_student_exists(student_id: str):
                     "user_id": SYSTEM_ANON_USER_ID,
                     "name": "Anonymous Student"
                 }
-                insert_result = supabase.table("students").insert(student_data).execute()
+                insert_result = await supabase.table("students").insert(student_data).execute()
                 
                 # Verify the student was actually created
                 if not insert_result.data:
                     raise Exception("Student insert returned no data")
                 
                 # Double-check by querying
-                verify_result = supabase.table("students").select("id").eq("id", student_id).execute()
+                verify_result = await supabase.table("students").select("id").eq("id", student_id).execute()
                 if not verify_result.data:
                     raise Exception(f"Student {student_id} was not created successfully")
                 
@@ -109,6 +129,128 @@ async def _ensure_student_exists(student_id: str):
             detail=f"Error checking student: {str(e)}"
         )
 
+async def _verify_student(student_id: str):
+    """Ensure the student exists (creating anonymous students), then double-check"""
+    await _ensure_student_exists(student_id)
+    
+    supabase = get_async_client()
+    student_check = await supabase.table("students").select("id").eq("id", student_id).execute()
+    if not student_check.data:
+        logger.error(f"Student {student_id} does not exist after _ensure_student_exists")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to create or verify student {student_id}. Please try again."
+        )
+
+async def _save_analysis(
+    student_id: str,
+    submission_id: str,
+    analysis: Dict[str, Any],
+    word_count: int
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Store a submission's analysis: profile, recommendations, progress,
+    points and achievements
+    
+    Independent writes run concurrently (see _analysis_stages). Every stage
+    runs unless one it depends on failed, and failures are raised together
+    as a StageError. Stage timings are logged. The student's dashboard cache
+    is invalidated once every write has finished.
+    
+    Returns:
+        (profile_id, recommendations)
+    """
+    try:
+        run = await run_stages(_analysis_stages(student_id, submission_id, analysis, word_count))
+    finally:
+        invalidate_student_dashboard(student_id)
+    logger.info(f"Saved analysis of submission {submission_id}: {run.timing_summary()}")
+    run.raise_for_errors()
+    return run.results['profile'], run.results['recommend']
+
+def _analysis_stages(
+    student_id: str,
+    submission_id: str,
+    analysis: Dict[str, Any],
+    word_count: int
+) -> List[Stage]:
+    """
+    Stages of _save_analysis and what each needs
+    
+    profile -> link, store_recommendations
+    recommend -> store_recommendations
+    progress -> achievements (which read the updated totals and level)
+    
+    The submission's words, count and streak were added to the student's
+    progress when it was stored, so a submission whose analysis fails still
+    counts; this adds its points and level.
+    """
+    from db import profiles as db_profiles
+    from db import recommendations as db_recommendations
+    from db import student_progress as db_progress
+    from db import achievements as db_achievements
+    
+    async def create_profile(results):
+        return await db_profiles.create_profile(
+            student_id=student_id,
+            resonance_data=analysis['resonance_data'],
+            word_scores=analysis['word_scores']
+        )
+    
+    async def link_submission(results):
+        # Link submission to profile
+        return await db_submissions.update_submission_profile(submission_id, results['profile'])
+    
+    async def recommend(results):
+        # Get recommendations with personalization
+        # Each recommendation includes: word, definition, example, difficulty_score,
+        # relic_type, rationale (why it was recommended), personalization_score
+        recommender_instance = recommender.WordRecommender()
+        return await recommender_instance.recommend_words(
+            profile={
+                'word_scores': analysis['word_scores'],
+                'resonance_data': analysis['resonance_data']
+            },
+            count=7,
+            student_id=student_id
+        )
+    
+    async def store_recommendations(results):
+        return await db_recommendations.create_recommendations_batch(
+            student_id=student_id,
+            profile_id=results['profile'],
+            recommendations=results['recommend']
+        )
+    
+    async def update_progress(results):
+        # Points (10 per submission + 5 per 100 words) and level in one
+        # atomic update. The profiler's grade band is stored as the matching
+        # progress level.
+        points = 10 + (word_count // 100) * 5
+        try:
+            return await db_progress.apply_progress_delta(
+                student_id,
+                points=points,
+                vocabulary_level=grade_level_to_progress_level(analysis['vocabulary_level'])
+            )
+        except Exception as e:
+            # As before, a progress error doesn't fail the submission
+            logger.error(f"Error updating progress for submission {submission_id}: {e}")
+            return None
+    
+    async def check_achievements(results):
+        # Evaluated against the row the progress stage returned (re-read if it failed)
+        return await db_achievements.check_and_award_achievements(student_id, progress=results['progress'])
+    
+    return [
+        Stage('profile', create_profile),
+        Stage('link', link_submission, after=('profile',)),
+        Stage('recommend', recommend),
+        Stage('store_recommendations', store_recommendations, after=('profile', 'recommend')),
+        Stage('progress', update_progress),
+        Stage('achievements', check_achievements, after=('progress',)),
+    ]
+
 class CreateSubmissionRequest(BaseModel):
     student_id: str
     type: str  # 'story-spark', 'upload', 'teacher-upload'
@@ -141,140 +283,208 @@ class DetectSpeakersResponse(BaseModel):
     format_detected: str
     speakers: List[SpeakerInfo]
 
-@router.post("/", response_model=SubmissionResponse)
-async def create_submission(request: CreateSubmissionRequest):
-    """Create a new submission and analyze it"""
-    try:
-        # Validate input
-        if not request.content or len(request.content.strip()) < 25:
-            raise HTTPException(
-                status_code=400,
-                detail="Content must be at least 25 words long. Please provide more text!"
-            )
+async def _accept_submission(request: CreateSubmissionRequest) -> Tuple[str, str, int]:
+    """
+    Validate a submission and store it (before analysis)
+    
+    Returns:
+        (submission_id, text to analyze, word count)
+    """
+    # Validate input
+    if not request.content or len(request.content.strip()) < 25:
+        raise HTTPException(
+            status_code=400,
+            detail="Content must be at least 25 words long. Please provide more text!"
+        )
+    
+    if not request.student_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Student ID is required"
+        )
+    
+    await _verify_student(request.student_id)
+    
+    # Parse transcript if multi-speaker, extract student text
+    content_to_analyze = request.content
+    if request.student_speaker_name:
+        # Multi-speaker transcript - extract only student's text
+        parser = TranscriptParser()
+        parsed_result = parser.parse(request.content)
+        content_to_analyze = parser.extract_student_text(parsed_result, request.student_speaker_name)
         
-        if not request.student_id:
+        if not content_to_analyze or len(content_to_analyze.strip()) < 25:
             raise HTTPException(
                 status_code=400,
-                detail="Student ID is required"
-            )
-        
-        # Ensure student exists (for anonymous students)
-        await _ensure_student_exists(request.student_id)
-        
-        # Verify student exists before proceeding (double-check)
-        supabase = get_supabase_client()
-        student_check = supabase.table("students").select("id").eq("id", request.student_id).execute()
-        if not student_check.data:
-            logger.error(f"Student {request.student_id} does not exist after _ensure_student_exists")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to create or verify student {request.student_id}. Please try again."
+                detail=f"Selected speaker '{request.student_speaker_name}' has insufficient text (minimum 25 words required)"
             )
-        
-        # Parse transcript if multi-speaker, extract student text
-        content_to_analyze = request.content
-        if request.student_speaker_name:
-            # Multi-speaker transcript - extract only student's text
-            parser = TranscriptParser()
-            parsed_result = parser.parse(request.content)
-            content_to_analyze = parser.extract_student_text(parsed_result, request.student_speaker_name)
+    
+    # Count words
+    word_count = len(content_to_analyze.split())
+    
+    if word_count < 25:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Content must be at least 25 words. You have {word_count} words."
+        )
+    
+    # Create submission (store original content, but analyze extracted text)
+    submission_id = await db_submissions.create_submission(
+        student_id=request.student_id,
+        submission_type=request.type,
+        content=request.content,  # Store original full transcript
+        source=request.source,
+        word_count=word_count
+    )
+    invalidate_student_dashboard(request.student_id)
+    return submission_id, content_to_analyze, word_count
+
+async def _complete_submission(
+    request: CreateSubmissionRequest,
+    submission_id: str,
+    analysis: Dict[str, Any],
+    word_count: int
+) -> SubmissionResponse:
+    """Store an accepted submission's analysis and build the response"""
+    profile_id, recommended_words = await _save_analysis(
+        request.student_id, submission_id, analysis, word_count
+    )
+    
+    # Get submission data
+    submission_data = await db_submissions.get_submission(submission_id)
+    
+    return SubmissionResponse(
+        id=submission_id,
+        student_id=request.student_id,
+        type=request.type,
+        source=request.source,
+        word_count=word_count,
+        profile_id=profile_id,
+        recommended_words=recommended_words,
+        vocabulary_level=analysis['vocabulary_level'],
+        created_at=submission_data['created_at'] if submission_data else "",
+        word_categories=analysis.get('word_categories', {})  # Include word categories
+    )
+
+@router.post("/", response_model=SubmissionResponse)
+async def create_submission(request: CreateSubmissionRequest):
+    """Create a new submission and analyze it"""
+    try:
+        executor = get_profiling_executor()
+        # Refuse a busy profiler before storing anything, so a retry can't duplicate the submission
+        with executor.reserve():
+            submission_id, content_to_analyze, word_count = await _accept_submission(request)
             
-            if not content_to_analyze or len(content_to_analyze.strip()) < 25:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Selected speaker '{request.student_speaker_name}' has insufficient text (minimum 25 words required)"
-                )
+            # Analyze the submission (using extracted student text) off the event loop
+            analysis = await executor.analyze_transcript(content_to_analyze)
         
-        # Count words
-        word_count = len(content_to_analyze.split())
-        
-        if word_count < 25:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Content must be at least 25 words. You have {word_count} words."
+        return await _complete_submission(request, submission_id, analysis, word_count)
+    except ProfilerBusyError as e:
+        raise busy_exception(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating submission: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+class SubmissionJobResponse(BaseModel):
+    job_id: str  # Same as the submission id
+    submission_id: str
+    status: str
+    word_count: int
+
+def _submission_job(
+    request: CreateSubmissionRequest,
+    submission_id: str,
+    content_to_analyze: str,
+    word_count: int
+) -> JobRunner:
+    """Analysis stages of create_submission, run on the job queue"""
+    async def run(job: Job) -> Dict[str, Any]:
+        job.set_stage('analyzing')
+        while True:
+            try:
+                analysis = await get_profiling_executor().analyze_transcript(content_to_analyze)
+                break
+            except ProfilerBusyError as e:
+                # Queued jobs wait for the profiler instead of failing
+                await asyncio.sleep(e.retry_after)
+        
+        job.set_stage('saving')
+        response = await _complete_submission(request, submission_id, analysis, word_count)
+        return response.model_dump()
+    
+    return run
+
+@router.post("/jobs", response_model=SubmissionJobResponse, status_code=202)
+async def create_submission_job(request: CreateSubmissionRequest):
+    """
+    Store a new submission and queue its analysis
+    
+    Returns as soon as the submission is stored. Poll GET /jobs/{job_id} or
+    follow GET /jobs/{job_id}/events for the result, which is the
+    create_submission response.
+    """
+    try:
+        queue = get_job_queue()
+        # Hold a queue place before storing anything, so a stored submission
+        # is never refused (and a retry can't duplicate it)
+        with queue.reserve():
+            submission_id, content_to_analyze, word_count = await _accept_submission(request)
+            job = queue.submit(
+                _submission_job(request, submission_id, content_to_analyze, word_count),
+                kind='submission',
+                job_id=submission_id,
+                reserved=True
             )
-        
-        # Create submission (store original content, but analyze extracted text)
-        submission_id = await db_submissions.create_submission(
-            student_id=request.student_id,
-            submission_type=request.type,
-            content=request.content,  # Store original full transcript
-            source=request.source,
+        return SubmissionJobResponse(
+            job_id=job.id,
+            submission_id=submission_id,
+            status=job.status,
             word_count=word_count
         )
-        
-        # Analyze the submission (using extracted student text)
-        profiler_instance = profiler.StoryProfiler()
-        analysis = profiler_instance.analyze_transcript(content_to_analyze)
-        
-        # Create profile
-        from db import profiles as db_profiles
-        profile_id = await db_profiles.create_profile(
-            student_id=request.student_id,
-            resonance_data=analysis['resonance_data'],
-            word_scores=analysis['word_scores']
-        )
-        
-        # Link submission to profile
-        await db_submissions.update_submission_profile(submission_id, profile_id)
-        
-        # Get recommendations with personalization
-        recommender_instance = recommender.WordRecommender()
-        recommendations = await recommender_instance.recommend_words(
-            profile={
-                'word_scores': analysis['word_scores'],
-                'resonance_data': analysis['resonance_data']
-            },
-            count=7
-        )
-        # Return full recommendation objects with rationale
-        # Each recommendation now includes: word, definition, example, difficulty_score, 
-        # relic_type, rationale (why it was recommended), personalization_score
-        recommended_words = recommendations
-        
-        # Store recommendations in database
-        from db import recommendations as db_recommendations
-        await db_recommendations.create_recommendations_batch(
-            student_id=request.student_id,
-            profile_id=profile_id,
-            recommendations=recommendations
-        )
-        
-        # Update student vocabulary level
-        from db import student_progress as db_progress
-        from db import achievements as db_achievements
-        
-        await db_progress.update_vocabulary_level(
-            request.student_id,
-            analysis['vocabulary_level']
-        )
-        
-        # Award points (10 points per submission + 5 per 100 words)
-        points = 10 + (word_count // 100) * 5
-        await db_progress.add_points(request.student_id, points)
-        
-        # Check for new achievements
-        await db_achievements.check_and_award_achievements(request.student_id)
-        
-        # Get submission data
-        submission_data = await db_submissions.get_submission(submission_id)
-        
-        return SubmissionResponse(
-            id=submission_id,
-            student_id=request.student_id,
-            type=request.type,
-            source=request.source,
-            word_count=word_count,
-            profile_id=profile_id,
-            recommended_words=recommended_words,
-            vocabulary_level=analysis['vocabulary_level'],
-            created_at=submission_data['created_at'] if submission_data else "",
-            word_categories=analysis.get('word_categories', {})  # Include word categories
-        )
+    except JobQueueFullError as e:
+        raise queue_full_exception(e)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error creating submission: {e}")
+        logger.error(f"Error creating submission job: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _get_job(job_id: str) -> Job:
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@router.get("/jobs/{job_id}")
+async def get_submission_job(job_id: str):
+    """Status of a submission job, with the submission response once completed"""
+    return _get_job(job_id).to_dict()
+
+@router.get("/jobs/{job_id}/events")
+async def submission_job_events(job_id: str):
+    """
+    Server-sent events for a submission job
+    
+    Sends the job's status (as GET /jobs/{job_id} returns it) now and on
+    every change, and closes the stream once the job has completed or failed.
+    """
+    job = _get_job(job_id)
+    
+    async def events():
+        async for state in job.updates(JOB_EVENTS_KEEPALIVE_SECONDS):
+            if state is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {json.dumps(state)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/student/{student_id}")
 async def get_student_submissions(student_id: str, limit: int = 50):
     """Get all submissions for a student"""
@@ -328,6 +538,250 @@ async def detect_speakers(request: DetectSpeakersRequest):
         logger.error(f"Error detecting speakers: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _request_text_chunks(request: Request) -> AsyncIterator[str]:
+    """Decode a (possibly chunked) UTF-8 request body as it arrives"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    async for data in request.stream():
+        text = decoder.decode(data)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+async def _upload_text_chunks(file: UploadFile) -> AsyncIterator[str]:
+    """Decode an uploaded UTF-8 text file a block at a time"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        data = await file.read(STREAM_READ_BYTES)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+def _check_streamable_file(file: UploadFile):
+    """Only plain text can be read incrementally (PDF and DOCX need the whole file)"""
+    filename = (file.filename or "").lower()
+    if not (filename.endswith('.txt') or filename.endswith('.md')):
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported file type for streaming. Supported types: .txt, .md"
+        )
+
+async def _read_transcript_stream(
+    chunks: AsyncIterator[str],
+    student_speaker_name: Optional[str] = None,
+    spool=None
+) -> Tuple[TranscriptStream, SpeakerSummary, str, int]:
+    """
+    Attribute a streamed transcript to speakers without holding it in memory
+    
+    Args:
+        chunks: Transcript text, in pieces
+        student_speaker_name: Speaker whose text is written to spool (the
+            whole transcript is written if None)
+        spool: Optional text file the student's text is written to
+        
+    Returns:
+        (stream, speaker summary, start of the transcript for storage,
+        words written to spool)
+    """
+    stream = TranscriptStream()
+    summary = SpeakerSummary()
+    stored = []
+    stored_chars = 0
+    selected: Optional[str] = None
+    spooled_words = 0
+    in_word = False  # Previous chunk ended mid-word
+    
+    def consume(fragments):
+        nonlocal selected, spooled_words
+        for speaker, text in fragments:
+            summary.add(speaker, text)
+            if spool is None or student_speaker_name is None:
+                continue
+            # Like extract_student_text, the first case-insensitive match is the student
+            if selected is None and speaker.lower() == student_speaker_name.lower():
+                selected = speaker
+            if speaker == selected:
+                spool.write(text)
+                spool.write('\n')
+                spooled_words += len(text.split())
+    
+    try:
+        async for chunk in chunks:
+            if stored_chars < STREAM_STORED_CONTENT_CHARS:
+                stored.append(chunk[:STREAM_STORED_CONTENT_CHARS - stored_chars])
+                stored_chars += len(stored[-1])
+            if spool is not None and student_speaker_name is None:
+                spool.write(chunk)
+                spooled_words += len(chunk.split())
+                if in_word and not chunk[0].isspace():
+                    spooled_words -= 1  # Word continued from the previous chunk
+                in_word = not chunk[-1].isspace()
+            consume(stream.feed(chunk))
+        consume(stream.close())
+    except JSONTranscriptError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON transcript: {e}")
+    
+    return stream, summary, ''.join(stored), spooled_words
+
+async def _create_streamed_submission(
+    chunks: AsyncIterator[str],
+    student_id: str,
+    submission_type: str,
+    source: str,
+    student_speaker_name: Optional[str]
+) -> SubmissionResponse:
+    """
+    create_submission for a transcript that is read incrementally
+    
+    Only the selected speaker's text is kept, in a temporary file that the
+    profiler reads in bounded chunks, so memory stays flat however long the
+    recording is. The submission stores the first STREAM_STORED_CONTENT_CHARS
+    characters of the transcript.
+    """
+    await _verify_student(student_id)
+    
+    spool = tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt', delete=False)
+    try:
+        with spool:
+            stream, summary, stored_content, word_count = await _read_transcript_stream(
+                chunks, student_speaker_name, spool
+            )
+        
+        if student_speaker_name and summary.find(student_speaker_name) is None:
+            speakers = ', '.join(speaker['name'] for speaker in summary.speakers()) or 'none'
+            raise HTTPException(
+                status_code=400,
+                detail=f"Speaker '{student_speaker_name}' not found in transcript (detected: {speakers})"
+            )
+        if word_count < 25:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Content must be at least 25 words. You have {word_count} words."
+            )
+        
+        executor = get_profiling_executor()
+        # Refuse a busy profiler before storing anything (see create_submission)
+        with executor.reserve():
+            submission_id = await db_submissions.create_submission(
+                student_id=student_id,
+                submission_type=submission_type,
+                content=stored_content,
+                source=source,
+                word_count=word_count
+            )
+            invalidate_student_dashboard(student_id)
+            
+            analysis = await executor.analyze_file(spool.name)
+    finally:
+        os.unlink(spool.name)
+    
+    profile_id, recommended_words = await _save_analysis(student_id, submission_id, analysis, word_count)
+    submission_data = await db_submissions.get_submission(submission_id)
+    
+    return SubmissionResponse(
+        id=submission_id,
+        student_id=student_id,
+        type=submission_type,
+        source=source,
+        word_count=word_count,
+        profile_id=profile_id,
+        recommended_words=recommended_words,
+        vocabulary_level=analysis['vocabulary_level'],
+        created_at=submission_data['created_at'] if submission_data else "",
+        word_categories=analysis.get('word_categories', {})
+    )
+
+@router.post("/stream", response_model=SubmissionResponse)
+async def create_submission_stream(
+    request: Request,
+    student_id: str,
+    type: str = "teacher-upload",
+    source: str = "text",
+    student_speaker_name: Optional[str] = None
+):
+    """Create a submission from a transcript sent as a plain-text (optionally chunked) request body"""
+    try:
+        return await _create_streamed_submission(
+            _request_text_chunks(request), student_id, type, source, student_speaker_name
+        )
+    except ProfilerBusyError as e:
+        raise busy_exception(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating streamed submission: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/stream/upload", response_model=SubmissionResponse)
+async def create_submission_from_file_stream(
+    student_id: str,
+    file: UploadFile = File(...),
+    type: str = "teacher-upload",
+    student_speaker_name: Optional[str] = None
+):
+    """Create a submission from an uploaded .txt/.md transcript, read incrementally"""
+    try:
+        _check_streamable_file(file)
+        return await _create_streamed_submission(
+            _upload_text_chunks(file), student_id, type, "file", student_speaker_name
+        )
+    except ProfilerBusyError as e:
+        raise busy_exception(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating submission from streamed file: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _streamed_speakers_response(stream: TranscriptStream, summary: SpeakerSummary) -> DetectSpeakersResponse:
+    speakers = summary.speakers()
+    word_count = sum(speaker['word_count'] for speaker in speakers)
+    if word_count < 25:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Transcript must be at least 25 words long. You have {word_count} words."
+        )
+    # Full texts are not kept for streamed transcripts, so text is the preview
+    return DetectSpeakersResponse(
+        format_detected=stream.format_detected or 'plain',
+        speakers=[
+            SpeakerInfo(name=speaker['name'], text=speaker['preview'], word_count=speaker['word_count'], preview=speaker['preview'])
+            for speaker in speakers
+        ]
+    )
+
+@router.post("/detect-speakers/stream", response_model=DetectSpeakersResponse)
+async def detect_speakers_stream(request: Request):
+    """Detect speakers in a transcript sent as a plain-text (optionally chunked) request body"""
+    try:
+        stream, summary, _, _ = await _read_transcript_stream(_request_text_chunks(request))
+        return _streamed_speakers_response(stream, summary)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error detecting speakers: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/detect-speakers/stream/upload", response_model=DetectSpeakersResponse)
+async def detect_speakers_file_stream(file: UploadFile = File(...)):
+    """Detect speakers in an uploaded .txt/.md transcript, read incrementally"""
+    try:
+        _check_streamable_file(file)
+        stream, summary, _, _ = await _read_transcript_stream(_upload_text_chunks(file))
+        return _streamed_speakers_response(stream, summary)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error detecting speakers: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/extract-text")
 async def extract_text_from_uploaded_file(
     file: UploadFile = File(...)
@@ -416,19 +870,22 @@ async def upload_file_for_student(
                 detail=f"File content must be at least 25 words. You have {word_count} words."
             )
         
-        # Create submission
         word_count = len(text_content.split())
-        submission_id = await db_submissions.create_submission(
-            student_id=student_id,
-            submission_type="upload",
-            content=text_content,
-            source="file",
-            word_count=word_count
-        )
-        
-        # Analyze (same as create_submission)
-        profiler_instance = profiler.StoryProfiler()
-        analysis = profiler_instance.analyze_transcript(text_content)
+        executor = get_profiling_executor()
+        # Refuse a busy profiler before storing anything (see create_submission)
+        with executor.reserve():
+            # Create submission
+            submission_id = await db_submissions.create_submission(
+                student_id=student_id,
+                submission_type="upload",
+                content=text_content,
+                source="file",
+                word_count=word_count
+            )
+            invalidate_student_dashboard(student_id)
+            
+            # Analyze (same as create_submission)
+            analysis = await executor.analyze_transcript(text_content)
         
         from db import profiles as db_profiles
         profile_id = await db_profiles.create_profile(
@@ -445,7 +902,8 @@ async def upload_file_for_student(
                 'word_scores': analysis['word_scores'],
                 'resonance_data': analysis['resonance_data']
             },
-            count=7
+            count=7,
+            student_id=student_id
         )
         # Return full recommendation objects (not just words)
         recommended_words = recommendations
@@ -457,6 +915,7 @@ async def upload_file_for_student(
             profile_id=profile_id,
             recommendations=recommendations
         )
+        invalidate_student_dashboard(student_id)
         
         return {
             "submission_id": submission_id,
@@ -464,6 +923,8 @@ async def upload_file_for_student(
             "recommended_words": recommended_words,
             "vocabulary_level": analysis['vocabulary_level']
         }
+    except ProfilerBusyError as e:
+        raise busy_exception(e)
     except HTTPException:
         raise
     except Exception as e:
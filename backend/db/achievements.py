@@ -1,12 +1,12 @@
 """
 Database operations for Achievements
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, NamedTuple, Optional
 from datetime import datetime
 import logging
 from uuid import uuid4
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,68 +22,93 @@ ACHIEVEMENT_TYPES = [
     'words_5000'
 ]
 
-async def check_and_award_achievements(student_id: str) -> List[Dict[str, Any]]:
+class AchievementRule(NamedTuple):
+    achievement_type: str
+    field: str  # student_progress column the rule reads
+    earned: Callable[[Any], bool]  # Called with the column's value
+
+# Achievements awarded from student progress, in the order they are reported
+ACHIEVEMENT_RULES = (
+    AchievementRule('first_story', 'submission_count', lambda count: count >= 1),
+    AchievementRule('streak_7', 'current_streak', lambda streak: streak >= 7),
+    AchievementRule('streak_30', 'current_streak', lambda streak: streak >= 30),
+    AchievementRule('words_1000', 'total_words_written', lambda words: words >= 1000),
+    AchievementRule('words_5000', 'total_words_written', lambda words: words >= 5000),
+    AchievementRule('vocabulary_master', 'vocabulary_level', lambda level: level == 'advanced'),
+    AchievementRule('consistent_writer', 'current_streak', lambda streak: streak >= 7),  # 7-day streak
+)
+
+# Value of a column missing from (or NULL in) a progress row
+_PROGRESS_DEFAULTS = {'vocabulary_level': 'beginner'}
+
+def earned_achievements(progress: Dict[str, Any]) -> List[str]:
+    """Achievement types a progress row qualifies for"""
+    earned = []
+    for rule in ACHIEVEMENT_RULES:
+        value = progress.get(rule.field)
+        if value is None:
+            value = _PROGRESS_DEFAULTS.get(rule.field, 0)
+        if rule.earned(value):
+            earned.append(rule.achievement_type)
+    return earned
+
+async def check_and_award_achievements(
+    student_id: str,
+    progress: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
     """
     Check student progress and award new achievements
     
+    The rules are evaluated in memory. The student's achievements are then
+    read once, and any newly earned ones are inserted in one batch (at most
+    two round trips, none if nothing is earned).
+    
+    Args:
+        student_id: UUID of the student
+        progress: The student's progress row, if the caller has just written
+            it (read from the database if None)
+    
     Returns:
         List of newly awarded achievements
     """
     try:
-        from .student_progress import get_progress
-        
-        progress = await get_progress(student_id)
-        if not progress:
+        if progress is None:
+            from .student_progress import get_progress
+            
+            progress = await get_progress(student_id)
+            if not progress:
+                return []
+        
+        earned = earned_achievements(progress)
+        if not earned:
             return []
         
-        newly_awarded = []
-        
-        # Check various achievement conditions
-        submission_count = progress.get("submission_count", 0)
-        total_words = progress.get("total_words_written", 0)
-        current_streak = progress.get("current_streak", 0)
-        vocabulary_level = progress.get("vocabulary_level", "beginner")
-        
-        # First story
-        if submission_count >= 1:
-            achievement = await award_achievement(student_id, "first_story")
-            if achievement:
-                newly_awarded.append(achievement)
-        
-        # Streak achievements
-        if current_streak >= 7:
-            achievement = await award_achievement(student_id, "streak_7")
-            if achievement:
-                newly_awarded.append(achievement)
-        
-        if current_streak >= 30:
-            achievement = await award_achievement(student_id, "streak_30")
-            if achievement:
-                newly_awarded.append(achievement)
-        
-        # Word count achievements
-        if total_words >= 1000:
-            achievement = await award_achievement(student_id, "words_1000")
-            if achievement:
-                newly_awarded.append(achievement)
-        
-        if total_words >= 5000:
-            achievement = await award_achievement(student_id, "words_5000")
-            if achievement:
-                newly_awarded.append(achievement)
-        
-        # Vocabulary level achievement
-        if vocabulary_level == "advanced":
-            achievement = await award_achievement(student_id, "vocabulary_master")
-            if achievement:
-                newly_awarded.append(achievement)
-        
-        # Consistent writer (7-day streak)
-        if current_streak >= 7:
-            achievement = await award_achievement(student_id, "consistent_writer")
-            if achievement:
-                newly_awarded.append(achievement)
+        supabase = get_async_client()
+        existing = await supabase.table("achievements").select("achievement_type").eq("student_id", student_id).execute()
+        awarded = {row["achievement_type"] for row in existing.data or []}
+        new_types = [achievement_type for achievement_type in earned if achievement_type not in awarded]
+        if not new_types:
+            return []
         
+        earned_at = datetime.utcnow().isoformat()
+        rows = [
+            {
+                "id": str(uuid4()),
+                "student_id": student_id,
+                "achievement_type": achievement_type,
+                "earned_at": earned_at
+            }
+            for achievement_type in new_types
+        ]
+        # A concurrent submission may award the same achievement first:
+        # duplicates are skipped and only the inserted rows come back
+        result = await supabase.table("achievements").upsert(
+            rows, on_conflict="student_id,achievement_type", ignore_duplicates=True
+        ).execute()
+        
+        newly_awarded = result.data or []
+        for achievement in newly_awarded:
+            logger.info(f"Awarded {achievement['achievement_type']} to student {student_id}")
         return newly_awarded
         
     except Exception as e:
@@ -98,10 +123,10 @@ async def award_achievement(student_id: str, achievement_type: str) -> Optional[
         Achievement data if newly awarded, None if already exists
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         # Check if already awarded
-        existing = supabase.table("achievements").select("*").eq("student_id", student_id).eq("achievement_type", achievement_type).execute()
+        existing = await supabase.table("achievements").select("*").eq("student_id", student_id).eq("achievement_type", achievement_type).execute()
         if existing.data:
             return None  # Already awarded
         
@@ -113,7 +138,7 @@ async def award_achievement(student_id: str, achievement_type: str) -> Optional[
             "earned_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("achievements").insert(achievement_data).execute()
+        result = await supabase.table("achievements").insert(achievement_data).execute()
         
         if result.data:
             logger.info(f"Awarded {achievement_type} to student {student_id}")
@@ -127,8 +152,8 @@ async def award_achievement(student_id: str, achievement_type: str) -> Optional[
 async def get_student_achievements(student_id: str) -> List[Dict[str, Any]]:
     """Get all achievements for a student"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("achievements").select("*").eq("student_id", student_id).order("earned_at", desc=True).execute()
+        supabase = get_async_client()
+        result = await supabase.table("achievements").select("*").eq("student_id", student_id).order("earned_at", desc=True).execute()
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"Error fetching achievements for student {student_id}: {e}")
@@ -137,8 +162,8 @@ async def get_student_achievements(student_id: str) -> List[Dict[str, Any]]:
 async def has_achievement(student_id: str, achievement_type: str) -> bool:
     """Check if student has a specific achievement"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("achievements").select("id").eq("student_id", student_id).eq("achievement_type", achievement_type).execute()
+        supabase = get_async_client()
+        result = await supabase.table("achievements").select("id").eq("student_id", student_id).eq("achievement_type", achievement_type).execute()
         return bool(result.data)
     except Exception as e:
         logger.error(f"Error checking achievement: {e}")
@@ -6,7 +6,7 @@ from datetime import datetime
 import logging
 from uuid import UUID, uuid4
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,18 +22,18 @@ async def create_class(teacher_id: str, name: str) -> Dict[str, Any]:
         Dictionary with class data including code
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         # For testing: if teacher doesn't exist, create a test teacher
         # In production, this should be validated
         try:
-            teacher_check = supabase.table("teachers").select("id").eq("id", teacher_id).execute()
+            teacher_check = await supabase.table("teachers").select("id").eq("id", teacher_id).execute()
             if not teacher_check.data:
                 # Create test teacher if doesn't exist (for testing only)
                 logger.warning(f"Teacher {teacher_id} not found, creating test teacher")
                 # Note: This will fail if user_id doesn't exist, but allows testing
                 try:
-                    supabase.table("teachers").insert({
+                    await supabase.table("teachers").insert({
                         "id": teacher_id,
                         "user_id": teacher_id,  # For testing, use same ID
                         "name": "Test Teacher"
@@ -44,7 +44,7 @@ async def create_class(teacher_id: str, name: str) -> Dict[str, Any]:
             pass  # Continue even if check fails
         
         # Generate unique code
-        code = _generate_unique_code(supabase)
+        code = await _generate_unique_code(supabase)
         
         class_data = {
             "id": str(uuid4()),
@@ -55,7 +55,7 @@ async def create_class(teacher_id: str, name: str) -> Dict[str, Any]:
             "updated_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("classes").insert(class_data).execute()
+        result = await supabase.table("classes").insert(class_data).execute()
         
         if result.data:
             logger.info(f"Created class {result.data[0]['id']} with code {code}")
@@ -67,7 +67,7 @@ async def create_class(teacher_id: str, name: str) -> Dict[str, Any]:
         logger.error(f"Error creating class: {e}")
         raise
 
-def _generate_unique_code(supabase, max_attempts: int = 10) -> str:
+async def _generate_unique_code(supabase, max_attempts: int = 10) -> str:
     """Generate a unique 6-character class code"""
     import random
     
@@ -77,7 +77,7 @@ def _generate_unique_code(supabase, max_attempts: int = 10) -> str:
         
         # Check if code exists
         try:
-            result = supabase.table("classes").select("code").eq("code", code).execute()
+            result = await supabase.table("classes").select("code").eq("code", code).execute()
             if not result.data:
                 return code
         except:
@@ -92,8 +92,8 @@ def _generate_unique_code(supabase, max_attempts: int = 10) -> str:
 async def get_class_by_code(code: str) -> Optional[Dict[str, Any]]:
     """Get a class by its code"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("classes").select("*").eq("code", code.upper()).single().execute()
+        supabase = get_async_client()
+        result = await supabase.table("classes").select("*").eq("code", code.upper()).single().execute()
         return result.data if result.data else None
     except Exception as e:
         logger.debug(f"Class with code {code} not found: {e}")
@@ -107,10 +107,10 @@ async def join_class(class_id: str, student_id: str) -> bool:
         True if successful, False if already joined
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         # Check if already joined
-        existing = supabase.table("class_students").select("*").eq("class_id", class_id).eq("student_id", student_id).execute()
+        existing = await supabase.table("class_students").select("*").eq("class_id", class_id).eq("student_id", student_id).execute()
         if existing.data:
             return False  # Already joined
         
@@ -121,7 +121,7 @@ async def join_class(class_id: str, student_id: str) -> bool:
             "joined_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("class_students").insert(join_data).execute()
+        result = await supabase.table("class_students").insert(join_data).execute()
         return bool(result.data)
     except Exception as e:
         logger.error(f"Error joining class: {e}")
@@ -130,8 +130,8 @@ async def join_class(class_id: str, student_id: str) -> bool:
 async def get_teacher_classes(teacher_id: str) -> List[Dict[str, Any]]:
     """Get all classes for a teacher"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("classes").select("*").eq("teacher_id", teacher_id).order("created_at", desc=True).execute()
+        supabase = get_async_client()
+        result = await supabase.table("classes").select("*").eq("teacher_id", teacher_id).order("created_at", desc=True).execute()
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"Error fetching classes for teacher {teacher_id}: {e}")
@@ -140,8 +140,8 @@ async def get_teacher_classes(teacher_id: str) -> List[Dict[str, Any]]:
 async def get_class_students(class_id: str) -> List[Dict[str, Any]]:
     """Get all students in a class"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("class_students").select("*, students(*)").eq("class_id", class_id).execute()
+        supabase = get_async_client()
+        result = await supabase.table("class_students").select("*, students(*)").eq("class_id", class_id).execute()
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"Error fetching students for class {class_id}: {e}")
@@ -150,13 +150,56 @@ async def get_class_students(class_id: str) -> List[Dict[str, Any]]:
 async def get_student_classes(student_id: str) -> List[Dict[str, Any]]:
     """Get all classes a student is enrolled in"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("class_students").select("*, classes(*)").eq("student_id", student_id).execute()
+        supabase = get_async_client()
+        result = await supabase.table("class_students").select("*, classes(*)").eq("student_id", student_id).execute()
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"Error fetching classes for student {student_id}: {e}")
         return []
 
+async def get_student_scheduler(student_id: str) -> Optional[str]:
+    """
+    Get the SRS scheduler chosen by a student's class
+    A student in several classes follows the one they joined most recently
+
+    Returns:
+        Scheduler name, or None if the student is not in a class
+    """
+    try:
+        supabase = get_async_client()
+        result = await supabase.table("class_students").select(
+            "joined_at, classes(scheduler)"
+        ).eq("student_id", student_id).order("joined_at", desc=True).limit(1).execute()
+        if not result.data:
+            return None
+        return (result.data[0].get("classes") or {}).get("scheduler")
+    except Exception as e:
+        logger.error(f"Error fetching scheduler for student {student_id}: {e}")
+        return None
+
+async def set_class_scheduler(class_id: str, teacher_id: str, scheduler: str) -> bool:
+    """
+    Set the SRS scheduler of a class owned by the teacher
+
+    Returns:
+        True if updated, False if the class was not found or not owned by the teacher
+    """
+    try:
+        supabase = get_async_client()
+        result = await supabase.table("classes").update({
+            "scheduler": scheduler,
+            "updated_at": datetime.utcnow().isoformat()
+        }).eq("id", class_id).eq("teacher_id", teacher_id).execute()
+
+        if result.data:
+            logger.info(f"Class {class_id} now uses the {scheduler} scheduler")
+            return True
+        logger.warning(f"Class {class_id} not found or not owned by teacher {teacher_id}")
+        return False
+    except Exception as e:
+        logger.error(f"Error setting scheduler for class {class_id}: {e}")
+        raise
+
 async def delete_class(class_id: str, teacher_id: str) -> bool:
     """
     Delete a class after verifying teacher ownership
@@ -172,10 +215,10 @@ async def delete_class(class_id: str, teacher_id: str) -> bool:
         Exception if deletion fails
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         # First verify the class exists and belongs to the teacher
-        class_check = supabase.table("classes").select("id, teacher_id").eq("id", class_id).single().execute()
+        class_check = await supabase.table("classes").select("id, teacher_id").eq("id", class_id).single().execute()
         
         if not class_check.data:
             logger.warning(f"Class {class_id} not found")
@@ -186,7 +229,7 @@ async def delete_class(class_id: str, teacher_id: str) -> bool:
             return False
         
         # Delete the class (cascade will handle class_students and invites)
-        result = supabase.table("classes").delete().eq("id", class_id).execute()
+        result = await supabase.table("classes").delete().eq("id", class_id).execute()
         
         if result.data:
             logger.info(f"Successfully deleted class {class_id}")
@@ -215,10 +258,10 @@ async def remove_student_from_class(class_id: str, student_id: str, teacher_id:
         Exception if removal fails
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         # First verify the class exists and belongs to the teacher
-        class_check = supabase.table("classes").select("id, teacher_id").eq("id", class_id).single().execute()
+        class_check = await supabase.table("classes").select("id, teacher_id").eq("id", class_id).single().execute()
         
         if not class_check.data:
             logger.warning(f"Class {class_id} not found")
@@ -229,14 +272,14 @@ async def remove_student_from_class(class_id: str, student_id: str, teacher_id:
             return False
         
         # Check if student is in the class
-        enrollment_check = supabase.table("class_students").select("id").eq("class_id", class_id).eq("student_id", student_id).execute()
+        enrollment_check = await supabase.table("class_students").select("id").eq("class_id", class_id).eq("student_id", student_id).execute()
         
         if not enrollment_check.data:
             logger.warning(f"Student {student_id} is not enrolled in class {class_id}")
             return False
         
         # Remove student from class
-        result = supabase.table("class_students").delete().eq("class_id", class_id).eq("student_id", student_id).execute()
+        result = await supabase.table("class_students").delete().eq("class_id", class_id).eq("student_id", student_id).execute()
         
         if result.data:
             logger.info(f"Successfully removed student {student_id} from class {class_id}")
@@ -0,0 +1,144 @@
+"""
+Student Dashboard Cache
+Read-through cache of the data behind the student and parent dashboards:
+progress, achievements, submissions and recommendations
+
+Every student has a version that the submission and SRS write paths bump
+(invalidate_student_dashboard). Cached sections belong to the version they
+were read under, so a read that was in flight when the student's data
+changed is served to its callers but never stored. Concurrent misses for
+the same section share one database read, and entries also expire after
+DASHBOARD_CACHE_TTL as a safety net for writes made outside the backend.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import logging
+
+from . import achievements as db_achievements
+from . import student_progress as db_progress
+from . import submissions as db_submissions
+
+logger = logging.getLogger(__name__)
+
+# Cache settings (override via environment)
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "120"))  # Seconds a section is served without a write
+DASHBOARD_CACHE_MAX_STUDENTS = int(os.getenv("DASHBOARD_CACHE_MAX_STUDENTS", "20000"))
+
+SectionKey = Tuple[Hashable, ...]  # (section, *params)
+
+class _StudentEntry:
+    """A student's cached sections and the version they were read under"""
+
+    __slots__ = ('version', 'sections', 'loading')
+
+    def __init__(self):
+        self.version = 0
+        self.sections: Dict[SectionKey, Tuple[float, Any]] = {}  # key -> (stored_at, value)
+        self.loading: Dict[SectionKey, "asyncio.Task"] = {}  # Reads in flight for this version
+
+class DashboardCache:
+    """LRU cache of each student's dashboard sections, invalidated by version"""
+
+    def __init__(self, ttl_seconds: float = DASHBOARD_CACHE_TTL, max_students: int = DASHBOARD_CACHE_MAX_STUDENTS):
+        self.ttl_seconds = ttl_seconds
+        self.max_students = max_students
+        self.hits = 0
+        self.misses = 0
+        self._students: "OrderedDict[str, _StudentEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._students)
+
+    def version(self, student_id: str) -> int:
+        """Current version of a cached student (0 when not cached)"""
+        entry = self._students.get(student_id)
+        return entry.version if entry is not None else 0
+
+    async def get(self, student_id: str, section: str, load: Callable[[], Awaitable[Any]], *params: Hashable) -> Any:
+        """
+        A student's section, read with `load` on a miss (do not modify)
+
+        Empty results are returned but not kept: the db read helpers return
+        [] when a query fails.
+        """
+        key: SectionKey = (section,) + params
+        entry = self._students.get(student_id)
+        if entry is None:
+            entry = self._students[student_id] = _StudentEntry()
+            while len(self._students) > self.max_students:
+                self._students.popitem(last=False)
+        else:
+            self._students.move_to_end(student_id)
+
+        cached = entry.sections.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl_seconds:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        task = entry.loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(student_id, entry, entry.version, key, load))
+            entry.loading[key] = task
+        # A cancelled request must not cancel a read other requests are waiting on
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        student_id: str,
+        entry: _StudentEntry,
+        version: int,
+        key: SectionKey,
+        load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        try:
+            value = await load()
+        finally:
+            if entry.loading.get(key) is asyncio.current_task():
+                del entry.loading[key]
+
+        # Invalidated or evicted while reading: this value may already be stale
+        if value and entry.version == version and self._students.get(student_id) is entry:
+            entry.sections[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self, student_id: str):
+        """Drop a student's sections after their data changed"""
+        entry = self._students.get(student_id)
+        if entry is None:
+            return  # Nothing cached and no reads in flight
+        entry.version += 1
+        entry.sections.clear()
+        entry.loading.clear()
+
+    def clear(self):
+        self._students.clear()
+
+    async def progress(self, student_id: str) -> Dict[str, Any]:
+        return await self.get(student_id, 'progress', lambda: db_progress.get_or_create_progress(student_id))
+
+    async def achievements(self, student_id: str) -> List[Dict[str, Any]]:
+        return await self.get(student_id, 'achievements', lambda: db_achievements.get_student_achievements(student_id))
+
+    async def submissions(self, student_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        return await self.get(
+            student_id, 'submissions', lambda: db_submissions.get_student_submissions(student_id, limit), limit
+        )
+
+# Global instance
+_dashboard_cache: Optional[DashboardCache] = None
+
+def get_dashboard_cache() -> DashboardCache:
+    """Get or create global dashboard cache"""
+    global _dashboard_cache
+    if _dashboard_cache is None:
+        _dashboard_cache = DashboardCache()
+    return _dashboard_cache
+
+def invalidate_student_dashboard(student_id: str):
+    """Invalidate a student's dashboard after submission or SRS writes"""
+    if _dashboard_cache is not None:
+        _dashboard_cache.invalidate(student_id)
@@ -6,7 +6,7 @@ from datetime import datetime
 import logging
 from uuid import UUID, uuid4
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +33,7 @@ async def create_profile(
         Profile ID (UUID as string)
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         profile_data = {
             "id": str(uuid4()),
@@ -51,7 +51,7 @@ async def create_profile(
         if recommended_words is not None:
             profile_data["recommended_words"] = recommended_words
         
-        result = supabase.table("profiles").insert(profile_data).execute()
+        result = await supabase.table("profiles").insert(profile_data).execute()
         
         if result.data:
             profile_id = result.data[0]["id"]
@@ -67,8 +67,8 @@ async def create_profile(
 async def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
     """Get a profile by ID"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("profiles").select("*").eq("id", profile_id).single().execute()
+        supabase = get_async_client()
+        result = await supabase.table("profiles").select("*").eq("id", profile_id).single().execute()
         return result.data if result.data else None
     except Exception as e:
         logger.error(f"Error fetching profile {profile_id}: {e}")
@@ -77,8 +77,8 @@ async def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
 async def get_student_profiles(student_id: str) -> list[Dict[str, Any]]:
     """Get all profiles for a student"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("profiles").select("*").eq("student_id", student_id).order("created_at", desc=True).execute()
+        supabase = get_async_client()
+        result = await supabase.table("profiles").select("*").eq("student_id", student_id).order("created_at", desc=True).execute()
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"Error fetching profiles for student {student_id}: {e}")
@@ -91,7 +91,7 @@ async def update_profile(
 ) -> bool:
     """Update an existing profile"""
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         update_data = {
             "updated_at": datetime.utcnow().isoformat()
@@ -102,7 +102,7 @@ async def update_profile(
         if word_scores is not None:
             update_data["word_scores"] = word_scores
         
-        result = supabase.table("profiles").update(update_data).eq("id", profile_id).execute()
+        result = await supabase.table("profiles").update(update_data).eq("id", profile_id).execute()
         
         if result.data:
             logger.info(f"Updated profile {profile_id}")
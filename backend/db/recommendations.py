@@ -6,7 +6,7 @@ from datetime import datetime
 import logging
 from uuid import UUID, uuid4
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +39,7 @@ async def create_recommendation(
         Recommendation ID (UUID as string)
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         recommendation_data = {
             "id": str(uuid4()),
@@ -65,7 +65,7 @@ async def create_recommendation(
         if relic_type is not None:
             recommendation_data["relic_type"] = relic_type
         
-        result = supabase.table("recommendations").insert(recommendation_data).execute()
+        result = await supabase.table("recommendations").insert(recommendation_data).execute()
         
         if result.data:
             rec_id = result.data[0]["id"]
@@ -95,7 +95,7 @@ async def create_recommendations_batch(
         List of recommendation IDs
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         recommendation_data_list = []
         for rec in recommendations:
@@ -125,7 +125,7 @@ async def create_recommendations_batch(
             
             recommendation_data_list.append(rec_data)
         
-        result = supabase.table("recommendations").insert(recommendation_data_list).execute()
+        result = await supabase.table("recommendations").insert(recommendation_data_list).execute()
         
         if result.data:
             rec_ids = [r["id"] for r in result.data]
@@ -155,7 +155,7 @@ async def get_student_recommendations(
         List of recommendation dictionaries
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         query = supabase.table("recommendations").select("*").eq("student_id", student_id)
         
@@ -167,7 +167,7 @@ async def get_student_recommendations(
         if limit:
             query = query.limit(limit)
         
-        result = query.execute()
+        result = await query.execute()
         return result.data if result.data else []
         
     except Exception as e:
@@ -185,8 +185,8 @@ async def get_profile_recommendations(profile_id: str) -> List[Dict[str, Any]]:
         List of recommendation dictionaries
     """
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("recommendations").select("*").eq("profile_id", profile_id).order("recommended_at", desc=True).execute()
+        supabase = get_async_client()
+        result = await supabase.table("recommendations").select("*").eq("profile_id", profile_id).order("recommended_at", desc=True).execute()
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"Error fetching recommendations for profile {profile_id}: {e}")
@@ -207,8 +207,8 @@ async def update_recommendation_status(
         True if successful, False otherwise
     """
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("recommendations").update({
+        supabase = get_async_client()
+        result = await supabase.table("recommendations").update({
             "status": status,
             "updated_at": datetime.utcnow().isoformat()
         }).eq("id", recommendation_id).execute()
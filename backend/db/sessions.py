@@ -6,7 +6,7 @@ from datetime import datetime
 import logging
 from uuid import uuid4
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +21,7 @@ async def create_session(
         Session ID
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         session_data = {
             "id": str(uuid4()),
@@ -33,7 +33,7 @@ async def create_session(
             "created_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("sessions").insert(session_data).execute()
+        result = await supabase.table("sessions").insert(session_data).execute()
         
         if result.data:
             session_id = result.data[0]["id"]
@@ -54,7 +54,7 @@ async def update_session(
 ) -> bool:
     """Update a session"""
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         update_data = {}
         
@@ -65,7 +65,7 @@ async def update_session(
         if words_practiced is not None:
             update_data["words_practiced"] = words_practiced
         
-        result = supabase.table("sessions").update(update_data).eq("id", session_id).execute()
+        result = await supabase.table("sessions").update(update_data).eq("id", session_id).execute()
         
         if result.data:
             logger.info(f"Updated session {session_id}")
@@ -82,8 +82,8 @@ async def get_student_sessions(
 ) -> List[Dict[str, Any]]:
     """Get sessions for a student"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("sessions").select("*").eq("student_id", student_id).order("created_at", desc=True).limit(limit).execute()
+        supabase = get_async_client()
+        result = await supabase.table("sessions").select("*").eq("student_id", student_id).order("created_at", desc=True).limit(limit).execute()
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"Error fetching sessions: {e}")
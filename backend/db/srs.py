@@ -1,12 +1,12 @@
 """
 Database operations for Spaced Repetition System (SRS)
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Union
 from datetime import date, datetime
 import logging
 from uuid import uuid4
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -25,16 +25,16 @@ async def get_srs_progress(
         SRS progress record(s)
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         query = supabase.table("srs_progress").select("*").eq("student_id", student_id)
         
         if word_id:
             query = query.eq("word_id", word_id).maybe_single()
-            result = query.execute()
-            return result.data if result.data else None
+            result = await query.execute()
+            return result.data if result and result.data else None
         else:
-            result = query.execute()
+            result = await query.execute()
             return result.data if result.data else []
             
     except Exception as e:
@@ -56,7 +56,7 @@ async def create_srs_progress(
         SRS progress ID
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         if due_date is None:
             due_date = date.today()
@@ -74,7 +74,7 @@ async def create_srs_progress(
             "updated_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("srs_progress").insert(srs_data).execute()
+        result = await supabase.table("srs_progress").insert(srs_data).execute()
         
         if result.data:
             srs_id = result.data[0]["id"]
@@ -100,7 +100,7 @@ async def update_srs_progress(
     Update existing SRS progress record
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         if last_reviewed is None:
             last_reviewed = datetime.utcnow()
@@ -114,7 +114,7 @@ async def update_srs_progress(
             "updated_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("srs_progress").update(update_data).eq("student_id", student_id).eq("word_id", word_id).execute()
+        result = await supabase.table("srs_progress").update(update_data).eq("student_id", student_id).eq("word_id", word_id).execute()
         
         if result.data:
             logger.info(f"Updated SRS progress for student {student_id}, word {word_id}")
@@ -125,44 +125,117 @@ async def update_srs_progress(
         logger.error(f"Error updating SRS progress: {e}")
         return False
 
-async def get_due_words_for_student(
+async def get_due_reviews(
     student_id: str,
-    today: Optional[date] = None
+    today: Optional[date] = None,
+    limit: int = 8
 ) -> List[Dict[str, Any]]:
     """
-    Get all SRS records for a student, including word data
-    Returns records with word information joined
+    Get SRS records due for review (due_date <= today), most overdue first
+    
+    Filtering, ordering and the limit run in the database (served by the
+    (student_id, due_date) index), so the cost scales with the number of
+    reviews requested rather than every word the student has seen.
+    Records never reviewed yet are left to get_unreviewed_words.
+    
+    Returns:
+        SRS records with word information joined
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         if today is None:
             today = date.today()
         
-        # Get SRS progress with word data
-        result = supabase.table("srs_progress").select(
+        result = await supabase.table("srs_progress").select(
             "*, words(*)"
-        ).eq("student_id", student_id).execute()
+        ).eq("student_id", student_id).lte(
+            "due_date", today.isoformat()
+        ).or_(
+            "repetitions.neq.0,last_reviewed.not.is.null"
+        ).order("due_date").order("word_id").limit(limit).execute()
         
-        if not result.data:
-            return []
+        return result.data if result.data else []
+        
+    except Exception as e:
+        logger.error(f"Error fetching due reviews: {e}")
+        return []
+
+async def get_unreviewed_words(
+    student_id: str,
+    limit: int = 4
+) -> List[Dict[str, Any]]:
+    """
+    Get SRS records that have never been reviewed, oldest first
+    
+    Returns:
+        SRS records with word information joined
+    """
+    try:
+        supabase = get_async_client()
         
-        # Filter and format results
-        records = []
-        for record in result.data:
-            # Convert due_date string to date for comparison
-            due_date_str = record.get("due_date")
-            if due_date_str:
-                due_date = date.fromisoformat(due_date_str)
-                record["due_date_obj"] = due_date
-                records.append(record)
+        result = await supabase.table("srs_progress").select(
+            "*, words(*)"
+        ).eq("student_id", student_id).eq("repetitions", 0).is_(
+            "last_reviewed", "null"
+        ).order("created_at").order("word_id").limit(limit).execute()
         
-        return records
+        return result.data if result.data else []
         
     except Exception as e:
-        logger.error(f"Error fetching due words: {e}")
+        logger.error(f"Error fetching unreviewed words: {e}")
         return []
 
+async def get_practiced_word_ids(
+    student_id: str,
+    word_ids: List[str]
+) -> Set[str]:
+    """
+    Get which of the given words already have SRS progress for a student
+    Only the candidate words are looked up, not the student's whole history
+    """
+    if not word_ids:
+        return set()
+    try:
+        supabase = get_async_client()
+        
+        result = await supabase.table("srs_progress").select(
+            "word_id"
+        ).eq("student_id", student_id).in_("word_id", word_ids).execute()
+        
+        return {record["word_id"] for record in result.data or []}
+        
+    except Exception as e:
+        logger.error(f"Error fetching practiced words: {e}")
+        return set()
+
+def _srs_row(
+    student_id: str,
+    word_id: str,
+    ease_factor: float,
+    interval: int,
+    repetitions: int,
+    due_date: date,
+    last_reviewed: Optional[Union[date, datetime]] = None,
+    stability: Optional[float] = None,
+    difficulty: Optional[float] = None
+) -> Dict[str, Any]:
+    """srs_progress columns written by an upsert (id and created_at keep their defaults)"""
+    if last_reviewed is None:
+        last_reviewed = datetime.utcnow()
+    return {
+        "student_id": student_id,
+        "word_id": word_id,
+        "ease_factor": ease_factor,
+        "interval": interval,
+        "repetitions": repetitions,
+        "due_date": due_date.isoformat(),
+        "last_reviewed": last_reviewed.isoformat(),
+        "stability": stability,
+        "difficulty": difficulty,
+        "updated_at": datetime.utcnow().isoformat()
+    }
+
 async def upsert_srs_progress(
     student_id: str,
     word_id: str,
@@ -170,39 +243,184 @@ async def upsert_srs_progress(
     interval: int,
     repetitions: int,
     due_date: date,
-    last_reviewed: Optional[datetime] = None
+    last_reviewed: Optional[Union[date, datetime]] = None,
+    stability: Optional[float] = None,
+    difficulty: Optional[float] = None
 ) -> bool:
     """
     Upsert (insert or update) SRS progress
     """
     try:
-        # Check if record exists
-        existing = await get_srs_progress(student_id, word_id)
-        
-        if existing:
-            # Update existing
-            return await update_srs_progress(
-                student_id=student_id,
-                word_id=word_id,
-                ease_factor=ease_factor,
-                interval=interval,
-                repetitions=repetitions,
-                due_date=due_date,
-                last_reviewed=last_reviewed
-            )
-        else:
-            # Create new
-            await create_srs_progress(
-                student_id=student_id,
-                word_id=word_id,
-                ease_factor=ease_factor,
-                interval=interval,
-                repetitions=repetitions,
-                due_date=due_date
-            )
+        supabase = get_async_client()
+        
+        row = _srs_row(
+            student_id, word_id, ease_factor, interval, repetitions, due_date, last_reviewed,
+            stability=stability, difficulty=difficulty
+        )
+        result = await supabase.table("srs_progress").upsert(
+            row, on_conflict="student_id,word_id"
+        ).execute()
+        
+        if result.data:
+            logger.info(f"Upserted SRS progress for student {student_id}, word {word_id}")
             return True
+        return False
             
     except Exception as e:
         logger.error(f"Error upserting SRS progress: {e}")
         return False
 
+async def get_srs_progress_many(
+    student_id: str,
+    word_ids: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get SRS progress for several words in one query
+    
+    Returns:
+        Dictionary of word_id -> SRS progress record (words without progress are omitted)
+    """
+    if not word_ids:
+        return {}
+    try:
+        supabase = get_async_client()
+        
+        result = await supabase.table("srs_progress").select("*").eq(
+            "student_id", student_id
+        ).in_("word_id", list(dict.fromkeys(word_ids))).execute()
+        
+        return {record["word_id"]: record for record in result.data or []}
+        
+    except Exception as e:
+        logger.error(f"Error fetching SRS progress: {e}")
+        raise
+
+async def upsert_srs_progress_many(
+    student_id: str,
+    schedules: List[Dict[str, Any]]
+) -> int:
+    """
+    Upsert SRS progress for several words in one request
+    
+    Args:
+        student_id: UUID of the student
+        schedules: Dicts with word_id, ease_factor, interval, repetitions,
+                   due_date and (optionally) last_reviewed, stability and
+                   difficulty; one per word
+        
+    Returns:
+        Number of rows written
+    """
+    if not schedules:
+        return 0
+    try:
+        supabase = get_async_client()
+        
+        rows = [
+            _srs_row(
+                student_id,
+                schedule["word_id"],
+                schedule["ease_factor"],
+                schedule["interval"],
+                schedule["repetitions"],
+                schedule["due_date"],
+                schedule.get("last_reviewed"),
+                stability=schedule.get("stability"),
+                difficulty=schedule.get("difficulty")
+            )
+            for schedule in schedules
+        ]
+        result = await supabase.table("srs_progress").upsert(
+            rows, on_conflict="student_id,word_id"
+        ).execute()
+        
+        written = len(result.data or [])
+        logger.info(f"Upserted {written} SRS progress records for student {student_id}")
+        return written
+        
+    except Exception as e:
+        logger.error(f"Error upserting SRS progress batch: {e}")
+        raise
+
+SCHEDULE_PAGE_SIZE = 1000  # PostgREST returns at most 1000 rows per request by default
+
+async def get_schedules_for_students(student_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Get the SM-2 scheduling columns of every SRS record for a set of students
+    (e.g. a whole class), paging through the results
+    """
+    if not student_ids:
+        return []
+    try:
+        supabase = get_async_client()
+        schedules: List[Dict[str, Any]] = []
+        
+        while True:
+            start = len(schedules)
+            result = await supabase.table("srs_progress").select(
+                "student_id, word_id, ease_factor, interval, repetitions, due_date"
+            ).in_("student_id", student_ids).order("id").range(
+                start, start + SCHEDULE_PAGE_SIZE - 1
+            ).execute()
+            
+            page = result.data or []
+            schedules.extend(page)
+            if len(page) < SCHEDULE_PAGE_SIZE:
+                return schedules
+        
+    except Exception as e:
+        logger.error(f"Error fetching SRS schedules: {e}")
+        raise
+
+async def get_reviewed_schedules(student_id: str) -> List[Dict[str, Any]]:
+    """
+    Get the scheduling columns of every card a student has reviewed
+    successfully at least once (repetitions > 0), paging through the results
+    """
+    try:
+        supabase = get_async_client()
+        schedules: List[Dict[str, Any]] = []
+        
+        while True:
+            start = len(schedules)
+            result = await supabase.table("srs_progress").select(
+                "word_id, ease_factor, interval, repetitions, due_date, last_reviewed, stability, difficulty"
+            ).eq("student_id", student_id).gt("repetitions", 0).order("word_id").range(
+                start, start + SCHEDULE_PAGE_SIZE - 1
+            ).execute()
+            
+            page = result.data or []
+            schedules.extend(page)
+            if len(page) < SCHEDULE_PAGE_SIZE:
+                return schedules
+        
+    except Exception as e:
+        logger.error(f"Error fetching reviewed schedules for student {student_id}: {e}")
+        raise
+
+async def get_active_student_ids(since: date) -> List[str]:
+    """
+    Get students who reviewed any word on or after `since`, paging through
+    the reviewed rows
+    """
+    try:
+        supabase = get_async_client()
+        student_ids: Dict[str, None] = {}  # Ordered set
+        start = 0
+        
+        while True:
+            result = await supabase.table("srs_progress").select(
+                "student_id"
+            ).gte("last_reviewed", since.isoformat()).order("id").range(
+                start, start + SCHEDULE_PAGE_SIZE - 1
+            ).execute()
+            
+            page = result.data or []
+            student_ids.update((record["student_id"], None) for record in page)
+            start += len(page)
+            if len(page) < SCHEDULE_PAGE_SIZE:
+                return list(student_ids)
+        
+    except Exception as e:
+        logger.error(f"Error fetching active students: {e}")
+        raise
@@ -3,20 +3,29 @@ Database operations for Student Progress
 """
 from typing import Dict, Any, Optional
 from datetime import datetime, date
+import asyncio
 import logging
+import weakref
 from uuid import uuid4
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
+# PostgREST / Postgres codes for a function that doesn't exist (migration 013 not applied)
+_MISSING_FUNCTION_CODES = ('PGRST202', '42883')
+_delta_rpc_available = True  # Cleared after the first missing-function error
+
+# Per-student locks for the read-modify-write fallback (dropped when unused)
+_progress_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
 async def get_or_create_progress(student_id: str) -> Dict[str, Any]:
     """Get student progress or create if doesn't exist"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("student_progress").select("*").eq("student_id", student_id).maybe_single().execute()
+        supabase = get_async_client()
+        result = await supabase.table("student_progress").select("*").eq("student_id", student_id).maybe_single().execute()
         
-        if result.data:
+        if result and result.data:
             return result.data
         else:
             # Create new progress record
@@ -32,7 +41,7 @@ async def get_or_create_progress(student_id: str) -> Dict[str, Any]:
                 "updated_at": datetime.utcnow().isoformat()
             }
             
-            result = supabase.table("student_progress").insert(progress_data).execute()
+            result = await supabase.table("student_progress").insert(progress_data).execute()
             return result.data[0] if result.data else progress_data
             
     except Exception as e:
@@ -42,8 +51,8 @@ async def get_or_create_progress(student_id: str) -> Dict[str, Any]:
 async def get_progress(student_id: str) -> Optional[Dict[str, Any]]:
     """Get student progress"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("student_progress").select("*").eq("student_id", student_id).single().execute()
+        supabase = get_async_client()
+        result = await supabase.table("student_progress").select("*").eq("student_id", student_id).single().execute()
         return result.data if result.data else None
     except Exception as e:
         logger.debug(f"Progress not found for student {student_id}: {e}")
@@ -60,7 +69,7 @@ async def update_progress(
 ) -> bool:
     """Update student progress"""
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         update_data = {
             "updated_at": datetime.utcnow().isoformat()
@@ -79,7 +88,7 @@ async def update_progress(
         if total_points is not None:
             update_data["total_points"] = total_points
         
-        result = supabase.table("student_progress").update(update_data).eq("student_id", student_id).execute()
+        result = await supabase.table("student_progress").update(update_data).eq("student_id", student_id).execute()
         
         if result.data:
             logger.info(f"Updated progress for student {student_id}")
@@ -90,6 +99,103 @@ async def update_progress(
         logger.error(f"Error updating progress for student {student_id}: {e}")
         return False
 
+def next_streak(progress: Dict[str, Any], today: date) -> int:
+    """
+    Streak after a submission today: the day after the last submission
+    extends it, the same day keeps it, anything else starts again at 1
+    """
+    last_date = progress.get("last_submission_date")
+    if not last_date:
+        # First submission
+        return 1
+    
+    if isinstance(last_date, str):
+        try:
+            last_date = datetime.fromisoformat(last_date.replace('Z', '+00:00')).date()
+        except ValueError:
+            last_date = datetime.strptime(last_date, '%Y-%m-%d').date()
+    
+    days_diff = (today - last_date).days
+    if days_diff == 1:
+        # Consecutive day
+        return (progress.get("current_streak") or 0) + 1
+    if days_diff == 0:
+        # Same day, don't increment streak
+        return progress.get("current_streak") or 0
+    # Streak broken
+    return 1
+
+async def apply_progress_delta(
+    student_id: str,
+    words: int = 0,
+    submissions: int = 0,
+    points: int = 0,
+    vocabulary_level: Optional[str] = None,
+    today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Add to a student's totals in one atomic update
+    
+    Runs the apply_progress_delta database function (migration 013): one
+    round trip that creates the progress row if needed, adds the deltas,
+    advances the streak when submissions > 0 and sets the vocabulary level
+    if given. Without the function, falls back to a read-modify-write under
+    a per-student lock, which is safe within this process.
+    
+    Args:
+        student_id: UUID of the student
+        words: Words to add to total_words_written
+        submissions: Submissions to add to submission_count
+        points: Points to add to total_points
+        vocabulary_level: New vocabulary level (unchanged if None)
+        today: Submission date (UTC today by default)
+        
+    Returns:
+        The updated progress row
+    """
+    global _delta_rpc_available
+    if today is None:
+        today = datetime.utcnow().date()
+    
+    if _delta_rpc_available:
+        try:
+            supabase = get_async_client()
+            result = await supabase.rpc("apply_progress_delta", {
+                "p_student_id": student_id,
+                "p_words": words,
+                "p_submissions": submissions,
+                "p_points": points,
+                "p_vocabulary_level": vocabulary_level,
+                "p_today": today.isoformat()
+            }).execute()
+            return result.data[0] if isinstance(result.data, list) else result.data
+        except Exception as e:
+            if getattr(e, "code", None) not in _MISSING_FUNCTION_CODES:
+                logger.error(f"Error applying progress delta for student {student_id}: {e}")
+                raise
+            logger.warning("apply_progress_delta function not found (run migration 013), updating progress in two round trips")
+            _delta_rpc_available = False
+    
+    lock = _progress_locks.get(student_id)
+    if lock is None:
+        lock = _progress_locks[student_id] = asyncio.Lock()
+    async with lock:
+        progress = await get_or_create_progress(student_id)
+        updates: Dict[str, Any] = {
+            "total_words_written": (progress.get("total_words_written") or 0) + words,
+            "submission_count": (progress.get("submission_count") or 0) + submissions,
+            "total_points": (progress.get("total_points") or 0) + points
+        }
+        if submissions > 0:
+            updates["current_streak"] = next_streak(progress, today)
+            updates["last_submission_date"] = today.isoformat()
+        if vocabulary_level is not None:
+            updates["vocabulary_level"] = vocabulary_level
+        
+        if not await update_progress(student_id, **updates):
+            raise Exception(f"Failed to update progress for student {student_id}")
+        return {**progress, **updates}
+
 async def update_vocabulary_level(student_id: str, level: str) -> bool:
     """Update student's vocabulary level based on profile analysis"""
     return await update_progress(student_id, vocabulary_level=level)
@@ -97,10 +203,8 @@ async def update_vocabulary_level(student_id: str, level: str) -> bool:
 async def add_points(student_id: str, points: int) -> bool:
     """Add points to student's total"""
     try:
-        progress = await get_or_create_progress(student_id)
-        current_points = progress.get("total_points", 0)
-        return await update_progress(student_id, total_points=current_points + points)
+        await apply_progress_delta(student_id, points=points)
+        return True
     except Exception as e:
         logger.error(f"Error adding points: {e}")
         return False
-
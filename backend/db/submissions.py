@@ -6,7 +6,7 @@ from datetime import datetime
 import logging
 from uuid import UUID, uuid4
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +33,7 @@ async def create_submission(
         Submission ID (UUID as string)
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         submission_data = {
             "id": str(uuid4()),
@@ -46,7 +46,7 @@ async def create_submission(
             "created_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("submissions").insert(submission_data).execute()
+        result = await supabase.table("submissions").insert(submission_data).execute()
         
         if result.data:
             submission_id = result.data[0]["id"]
@@ -66,8 +66,8 @@ async def create_submission(
 async def get_submission(submission_id: str) -> Optional[Dict[str, Any]]:
     """Get a submission by ID"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("submissions").select("*").eq("id", submission_id).single().execute()
+        supabase = get_async_client()
+        result = await supabase.table("submissions").select("*").eq("id", submission_id).single().execute()
         return result.data if result.data else None
     except Exception as e:
         logger.error(f"Error fetching submission {submission_id}: {e}")
@@ -76,8 +76,8 @@ async def get_submission(submission_id: str) -> Optional[Dict[str, Any]]:
 async def get_student_submissions(student_id: str, limit: int = 50) -> List[Dict[str, Any]]:
     """Get all submissions for a student"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("submissions").select("*").eq("student_id", student_id).order("created_at", desc=True).limit(limit).execute()
+        supabase = get_async_client()
+        result = await supabase.table("submissions").select("*").eq("student_id", student_id).order("created_at", desc=True).limit(limit).execute()
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"Error fetching submissions for student {student_id}: {e}")
@@ -86,8 +86,8 @@ async def get_student_submissions(student_id: str, limit: int = 50) -> List[Dict
 async def update_submission_profile(submission_id: str, profile_id: str) -> bool:
     """Link a submission to a profile after analysis"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("submissions").update({"profile_id": profile_id}).eq("id", submission_id).execute()
+        supabase = get_async_client()
+        result = await supabase.table("submissions").update({"profile_id": profile_id}).eq("id", submission_id).execute()
         return bool(result.data)
     except Exception as e:
         logger.error(f"Error updating submission profile: {e}")
@@ -99,50 +99,8 @@ async def update_student_progress_from_submission(student_id: str, word_count: i
         # Import here to avoid circular dependency
         from . import student_progress
         
-        progress = await student_progress.get_or_create_progress(student_id)
-        
-        # Calculate new values
-        new_word_count = progress.get("total_words_written", 0) + word_count
-        new_submission_count = progress.get("submission_count", 0) + 1
-        
-        # Calculate streak
-        last_date = progress.get("last_submission_date")
-        today = datetime.utcnow().date()
-        current_streak = progress.get("current_streak", 0)
-        
-        if last_date:
-            from datetime import date
-            if isinstance(last_date, str):
-                try:
-                    last_date_obj = datetime.fromisoformat(last_date.replace('Z', '+00:00')).date()
-                except:
-                    last_date_obj = datetime.strptime(last_date, '%Y-%m-%d').date()
-            else:
-                last_date_obj = last_date
-            
-            days_diff = (today - last_date_obj).days
-            
-            if days_diff == 1:
-                # Consecutive day
-                new_streak = current_streak + 1
-            elif days_diff == 0:
-                # Same day, don't increment streak
-                new_streak = current_streak
-            else:
-                # Streak broken
-                new_streak = 1
-        else:
-            # First submission
-            new_streak = 1
-        
-        await student_progress.update_progress(
-            student_id,
-            total_words_written=new_word_count,
-            submission_count=new_submission_count,
-            current_streak=new_streak,
-            last_submission_date=today.isoformat()
-        )
+        # Words, submission count and streak in one atomic update
+        await student_progress.apply_progress_delta(student_id, words=word_count, submissions=1)
         
     except Exception as e:
         logger.error(f"Error updating student progress: {e}")
-
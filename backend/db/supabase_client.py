@@ -1,9 +1,13 @@
 """
 Supabase Client Setup
-Creates and manages the Supabase client instance
+Creates and manages the Supabase client instances
 """
+import asyncio
 import os
-from typing import Optional
+from typing import Optional, Tuple
+import httpx
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
@@ -13,9 +17,35 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Async connection pool settings (override via environment)
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "50"))  # Max in-flight requests per worker
+DB_MAX_KEEPALIVE = int(os.getenv("DB_MAX_KEEPALIVE", "20"))  # Idle connections kept open for reuse
+DB_KEEPALIVE_EXPIRY = float(os.getenv("DB_KEEPALIVE_EXPIRY", "30"))  # Seconds before idle connections close
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", "10"))  # Read/write/pool timeout in seconds
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+DB_RETRIES = int(os.getenv("DB_RETRIES", "2"))  # Connection attempts retried (safe for writes too)
+
 # Global Supabase client instance
 _supabase_client: Optional[Client] = None
 
+# Global async REST client, bound to the event loop that created it
+_async_client: Optional[AsyncPostgrestClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_credentials() -> Tuple[str, str]:
+    """Read Supabase URL and key from the environment"""
+    supabase_url = os.getenv("SUPABASE_URL")
+    # Prioritize SUPABASE_SERVICE_ROLE_KEY, then SUPABASE_KEY
+    supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
+    
+    if not supabase_url or not supabase_key:
+        raise ValueError(
+            "Supabase credentials not found. "
+            "Please set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_KEY) "
+            "in your .env file"
+        )
+    return supabase_url, supabase_key
+
 def get_supabase_client() -> Client:
     """
     Get or create Supabase client instance
@@ -24,16 +54,7 @@ def get_supabase_client() -> Client:
     global _supabase_client
     
     if _supabase_client is None:
-        supabase_url = os.getenv("SUPABASE_URL")
-        # Prioritize SUPABASE_SERVICE_ROLE_KEY, then SUPABASE_KEY
-        supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
-        
-        if not supabase_url or not supabase_key:
-            raise ValueError(
-                "Supabase credentials not found. "
-                "Please set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_KEY) "
-                "in your .env file"
-            )
+        supabase_url, supabase_key = _get_credentials()
         
         # Verify it's a service role key (should be long JWT, 200+ chars)
         if len(supabase_key) < 200 or not supabase_key.startswith("eyJ"):
@@ -48,8 +69,73 @@ def get_supabase_client() -> Client:
     
     return _supabase_client
 
+class _PooledPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client with a bounded keep-alive pool and connection retries"""
+    
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        limits = httpx.Limits(
+            max_connections=DB_MAX_CONNECTIONS,
+            max_keepalive_connections=DB_MAX_KEEPALIVE,
+            keepalive_expiry=DB_KEEPALIVE_EXPIRY
+        )
+        # httpx only retries failed connection attempts, so writes are never sent twice
+        transport = httpx.AsyncHTTPTransport(
+            retries=DB_RETRIES,
+            limits=limits,
+            http2=True,
+            verify=verify,
+            proxy=proxy
+        )
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            transport=transport,
+            follow_redirects=True
+        )
+
+def get_async_client() -> AsyncPostgrestClient:
+    """
+    Get or create the async REST client used by the db modules
+    Must be called from inside a running event loop; queries are awaited:
+        result = await get_async_client().table("words").select("*").execute()
+    """
+    global _async_client, _async_client_loop
+    
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        # httpx pools cannot be shared across event loops, so each loop gets its own
+        supabase_url, supabase_key = _get_credentials()
+        headers = {
+            **DEFAULT_POSTGREST_CLIENT_HEADERS,
+            "apiKey": supabase_key,
+            "Authorization": f"Bearer {supabase_key}"
+        }
+        _async_client = _PooledPostgrestClient(
+            f"{supabase_url}/rest/v1",
+            headers=headers,
+            timeout=httpx.Timeout(DB_TIMEOUT, connect=DB_CONNECT_TIMEOUT)
+        )
+        _async_client_loop = loop
+        logger.info(
+            f"Async Supabase client initialized (pool: {DB_MAX_CONNECTIONS} connections, "
+            f"{DB_MAX_KEEPALIVE} keep-alive)"
+        )
+    
+    return _async_client
+
+async def close_async_client():
+    """Close the async client's pooled connections (called on app shutdown)"""
+    global _async_client, _async_client_loop
+    if _async_client is not None and _async_client_loop is asyncio.get_running_loop():
+        await _async_client.aclose()
+    _async_client = None
+    _async_client_loop = None
+
 def reset_client():
-    """Reset the client (useful for testing)"""
-    global _supabase_client
+    """Reset the clients (useful for testing)"""
+    global _supabase_client, _async_client, _async_client_loop
     _supabase_client = None
+    _async_client = None
+    _async_client_loop = None
 
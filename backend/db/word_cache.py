@@ -0,0 +1,177 @@
+"""
+Word Pool Cache
+Process-wide copy of the words table, sorted by difficulty_score, so ZPD
+range queries are a bisect slice instead of a Supabase round trip
+"""
+import asyncio
+import os
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from .supabase_client import get_async_client
+
+logger = logging.getLogger(__name__)
+
+# Cache settings (override via environment)
+WORD_CACHE_TTL = float(os.getenv("WORD_CACHE_TTL", "300"))  # Seconds before checking the table for changes
+WORD_CACHE_MAX_WORDS = int(os.getenv("WORD_CACHE_MAX_WORDS", "50000"))  # Upper bound on rows held in memory
+WORD_CACHE_PAGE_SIZE = 1000  # PostgREST's default max rows per response
+
+
+class WordPoolCache:
+    """Sorted in-memory index of the words table with TTL refresh and explicit invalidation"""
+
+    def __init__(self, ttl_seconds: float = WORD_CACHE_TTL, max_words: int = WORD_CACHE_MAX_WORDS):
+        self.ttl_seconds = ttl_seconds
+        self.max_words = max_words
+        self.version = 0  # Bumped on every load and invalidation
+        self._words: List[Dict[str, Any]] = []
+        self._difficulties: List[int] = []
+        self._table_version: Optional[Tuple[int, Optional[str]]] = None
+        self._checked_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def invalidate(self):
+        """Drop cached rows; the next read reloads from the database"""
+        self.version += 1
+        self._checked_at = None
+        self._table_version = None
+
+    def load(self, words: List[Dict[str, Any]]):
+        """Replace the cache contents with the given rows"""
+        ordered = sorted(words, key=lambda w: w.get('difficulty_score') or 0)
+        self._words = ordered
+        self._difficulties = [w.get('difficulty_score') or 0 for w in ordered]
+        self._checked_at = time.monotonic()
+        self.version += 1
+
+    def is_fresh(self) -> bool:
+        """True while the cached rows are within their TTL"""
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self.ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def _get_lock(self) -> asyncio.Lock:
+        """Lock for the current event loop so only one refresh runs at a time"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def get_range(
+        self,
+        min_difficulty: float,
+        max_difficulty: float,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get words with min_difficulty <= difficulty_score <= max_difficulty
+
+        When more than `limit` words match, an evenly spaced sample across the
+        range is returned so candidates still cover the whole difficulty span.
+        Rows are shallow copies and safe for callers to modify.
+        """
+        await self.refresh()
+        start = bisect_left(self._difficulties, min_difficulty)
+        end = bisect_right(self._difficulties, max_difficulty)
+        matches = self._words[start:end]
+
+        if limit is not None and len(matches) > limit:
+            step = len(matches) / limit
+            matches = [matches[int(i * step)] for i in range(limit)]
+
+        return [dict(word) for word in matches]
+
+    async def refresh(self, force: bool = False):
+        """Reload the cache if it is empty, expired, or the words table changed"""
+        if not force and self.is_fresh():
+            return
+
+        async with self._get_lock():
+            # Another request may have refreshed while we waited
+            if not force and self.is_fresh():
+                return
+
+            version = self.version
+            try:
+                table_version = await self._fetch_table_version()
+                if not force and self._words and table_version == self._table_version:
+                    # Nothing changed since the last load, just extend the TTL
+                    self._checked_at = time.monotonic()
+                    return
+
+                words = await self._fetch_words()
+            except Exception as e:
+                if self._words:
+                    logger.warning(f"Word pool refresh failed, serving cached words: {e}")
+                    return
+                raise
+
+            if self.version != version:
+                # Invalidated mid-load; these rows may already be stale
+                logger.info("Word pool invalidated during refresh, discarding result")
+                return
+
+            self.load(words)
+            self._table_version = table_version
+            logger.info(f"Word pool cache loaded {len(words)} words")
+
+    async def _fetch_table_version(self) -> Tuple[int, Optional[str]]:
+        """Row count plus latest updated_at - changes on any insert, update or delete"""
+        supabase = get_async_client()
+        result = await (
+            supabase.table("words")
+            .select("updated_at", count="exact")
+            .order("updated_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        latest = result.data[0].get("updated_at") if result.data else None
+        return (result.count or 0, latest)
+
+    async def _fetch_words(self) -> List[Dict[str, Any]]:
+        """Page through the words table in difficulty order"""
+        supabase = get_async_client()
+        words: List[Dict[str, Any]] = []
+
+        while len(words) < self.max_words:
+            start = len(words)
+            end = min(start + WORD_CACHE_PAGE_SIZE, self.max_words) - 1
+            result = await (
+                supabase.table("words")
+                .select("*")
+                .order("difficulty_score")
+                .order("id")
+                .range(start, end)
+                .execute()
+            )
+            page = result.data or []
+            words.extend(page)
+            if len(page) < end - start + 1:
+                break
+
+        if len(words) >= self.max_words:
+            logger.warning(f"Word pool cache truncated at {self.max_words} words")
+
+        return words
+
+
+# Global instance
+_word_pool_cache: Optional[WordPoolCache] = None
+
+def get_word_pool_cache() -> WordPoolCache:
+    """Get or create global word pool cache"""
+    global _word_pool_cache
+    if _word_pool_cache is None:
+        _word_pool_cache = WordPoolCache()
+    return _word_pool_cache
+
+def invalidate_word_pool_cache():
+    """Invalidate the word pool after writes to the words table"""
+    if _word_pool_cache is not None:
+        _word_pool_cache.invalidate()
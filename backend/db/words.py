@@ -4,15 +4,16 @@ Database operations for Vocabulary Words
 from typing import Dict, Any, Optional, List
 import logging
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_client
+from .word_cache import invalidate_word_pool_cache
 
 logger = logging.getLogger(__name__)
 
 async def get_word(word: str) -> Optional[Dict[str, Any]]:
     """Get a word by its text"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("words").select("*").eq("word", word.lower()).single().execute()
+        supabase = get_async_client()
+        result = await supabase.table("words").select("*").eq("word", word.lower()).single().execute()
         return result.data if result.data else None
     except Exception as e:
         logger.debug(f"Word '{word}' not found in database: {e}")
@@ -34,7 +35,7 @@ async def create_word(
         Word ID (UUID as string)
     """
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         
         # Check if word already exists
         existing = await get_word(word)
@@ -54,10 +55,11 @@ async def create_word(
             "lexile_score": lexile_score
         }
         
-        result = supabase.table("words").insert(word_data).execute()
+        result = await supabase.table("words").insert(word_data).execute()
         
         if result.data:
             word_id = result.data[0]["id"]
+            invalidate_word_pool_cache()
             logger.info(f"Created word '{word}' with ID {word_id}")
             return word_id
         else:
@@ -70,8 +72,8 @@ async def create_word(
 async def get_words_by_ids(word_ids: List[str]) -> List[Dict[str, Any]]:
     """Get multiple words by their IDs"""
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("words").select("*").in_("id", word_ids).execute()
+        supabase = get_async_client()
+        result = await supabase.table("words").select("*").in_("id", word_ids).execute()
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"Error fetching words: {e}")
@@ -86,7 +88,7 @@ async def search_words(
 ) -> List[Dict[str, Any]]:
     """Search for words with filters"""
     try:
-        supabase = get_supabase_client()
+        supabase = get_async_client()
         query = supabase.table("words").select("*")
         
         if search_term:
@@ -98,7 +100,7 @@ async def search_words(
         if max_difficulty is not None:
             query = query.lte("difficulty_score", max_difficulty)
         
-        result = query.limit(limit).execute()
+        result = await query.limit(limit).execute()
         return result.data if result.data else []
         
     except Exception as e:
@@ -55,9 +55,16 @@ def load_routers():
     # Import routers with error handling
     try:
         logger.info("Loading NLP routers...")
-        from nlp import profiler, recommender
+        from nlp import profiler, recommender, srs
         app.include_router(profiler.router, prefix="/api/profile", tags=["profiling"])
         app.include_router(recommender.router, prefix="/api/recommend", tags=["recommendations"])
+        app.include_router(srs.router, prefix="/api/srs", tags=["srs"])
+        
+        from nlp.executor import shutdown_profiling_executor
+        app.add_event_handler("shutdown", shutdown_profiling_executor)
+        from nlp.srs_sessions import start_session_precompute, stop_session_precompute
+        app.add_event_handler("startup", start_session_precompute)
+        app.add_event_handler("shutdown", stop_session_precompute)
         logger.info("✓ NLP routers loaded successfully")
     except Exception as e:
         logger.error(f"✗ Failed to load NLP routers: {e}", exc_info=True)
@@ -74,6 +81,11 @@ def load_routers():
         app.include_router(users.router, prefix="/api/users", tags=["users"])
         app.include_router(test_setup.router, prefix="/api/test", tags=["testing"])
         app.include_router(chatbot.router, prefix="/api/chatbot", tags=["chatbot"])
+        
+        from utils.jobs import shutdown_job_queue
+        app.add_event_handler("shutdown", shutdown_job_queue)
+        from db.supabase_client import close_async_client
+        app.add_event_handler("shutdown", close_async_client)
         logger.info("✓ API routers loaded successfully")
     except Exception as e:
         logger.error(f"✗ Failed to load API routers: {e}", exc_info=True)
@@ -0,0 +1,237 @@
+"""
+Profile Accumulator
+Builds a relic resonance profile in a single sweep over the tokens.
+
+Tokens from one or more spaCy docs are folded into per-word columns and running
+totals (difficulty histogram, relic/POS counts, theme keywords), so every
+resonance metric comes from one pass instead of one scan per metric. Feeding a
+long transcript in several docs gives the same result as one doc.
+"""
+import heapq
+from collections import Counter
+from typing import Dict, List, Any
+
+from .difficulty import RELIC_TYPES_BY_DIFFICULTY
+from .grade_levels import (
+    difficulty_to_grade_level,
+    grade_level_to_difficulty_range,
+    get_next_grade_levels
+)
+
+MIN_WORD_LENGTH = 3  # Shorter tokens are skipped for vocabulary analysis
+COMMON_WORD_DIFFICULTY = 20  # Words below this are too common to indicate vocabulary level
+ADVANCED_DIFFICULTY = 60  # Words at or above this count toward sophistication
+THEME_POS = ('NOUN', 'PROPN')
+MAX_THEMES = 3
+
+# Category sizes returned in word_categories
+USES_WELL_LIMIT = 20
+NEEDS_PRACTICE_LIMIT = 15
+TO_MASTER_LIMIT = 10
+
+
+class ProfileAccumulator:
+    """Single-pass builder for StoryProfiler results"""
+
+    def __init__(self, dataset_loader):
+        self.dataset_loader = dataset_loader
+
+        # Per-word columns, in order of first appearance
+        self.words: List[str] = []
+        self.pos: List[str] = []
+        self.difficulties: List[int] = []
+        self.frequencies: List[int] = []
+        self.counts: List[int] = []
+        self._word_index: Dict[str, int] = {}
+
+        # Running totals
+        self.difficulty_histogram = [0] * 101
+        self.relic_counts = {'whisper': 0, 'echo': 0, 'resonance': 0, 'thunder': 0}
+        self.pos_counts: Dict[str, int] = {}
+        self.keyword_counts: Counter = Counter()
+        self.difficulty_sum = 0
+        self.advanced_count = 0
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def add_doc(self, doc):
+        """Fold a spaCy doc (or any iterable of tokens) into the profile"""
+        word_index = self._word_index
+        keyword_counts = self.keyword_counts
+        new_words = []
+        new_pos = []
+
+        for token in doc:
+            if token.is_stop:
+                continue
+            lemma = None
+
+            # Theme keywords: nouns and proper nouns, including short or non-alpha tokens
+            if token.pos_ in THEME_POS:
+                lemma = token.lemma_.lower()
+                keyword_counts[lemma] += 1
+
+            # Vocabulary words: alphabetic, longer than two letters, first occurrence wins
+            if token.is_alpha and len(token.text) >= MIN_WORD_LENGTH:
+                if lemma is None:
+                    lemma = token.lemma_.lower()
+                if lemma not in word_index:
+                    word_index[lemma] = -1  # Scored below, in one batch
+                    new_words.append(lemma)
+                    new_pos.append(token.pos_)
+
+        if new_words:
+            self._add_words(new_words, new_pos)
+
+    def _add_words(self, new_words: List[str], new_pos: List[str]):
+        """Score first-seen words in one batch and update the totals"""
+        dataset_loader = self.dataset_loader
+        scores = dataset_loader.score_many(new_words)
+        histogram = self.difficulty_histogram
+        relic_counts = self.relic_counts
+        pos_counts = self.pos_counts
+
+        for word, pos, (difficulty, relic_type) in zip(new_words, new_pos, scores):
+            self._word_index[word] = len(self.words)
+            self.words.append(word)
+            self.pos.append(pos)
+            self.difficulties.append(difficulty)
+            self.frequencies.append(dataset_loader.get_word_frequency(word))
+            self.counts.append(1)  # Words are recorded on first occurrence
+
+            histogram[difficulty] += 1
+            relic_counts[relic_type] = relic_counts.get(relic_type, 0) + 1
+            pos_counts[pos] = pos_counts.get(pos, 0) + 1
+            self.difficulty_sum += difficulty
+            if difficulty >= ADVANCED_DIFFICULTY:
+                self.advanced_count += 1
+
+    def vocabulary_level(self) -> str:
+        """
+        Overall vocabulary level as grade level (K-12)
+        Averages the top quartile of difficulties, ignoring very common words
+        unless they make up more than 90% of the vocabulary
+        """
+        total = len(self.words)
+        if not total:
+            return 'K-1'
+
+        histogram = self.difficulty_histogram
+        lowest = COMMON_WORD_DIFFICULTY
+        filtered = total - sum(histogram[:COMMON_WORD_DIFFICULTY])
+        if filtered < total * 0.1:
+            lowest = 0
+            filtered = total
+
+        # Top quartile = everything from the 75th percentile index up
+        percentile_75_index = min(int(filtered * 0.75), filtered - 1)
+        remaining = filtered - percentile_75_index
+        top_count = remaining
+        top_sum = 0
+        for difficulty in range(100, lowest - 1, -1):
+            taken = min(histogram[difficulty], remaining)
+            top_sum += taken * difficulty
+            remaining -= taken
+            if not remaining:
+                break
+
+        return difficulty_to_grade_level(top_sum / top_count)
+
+    def word_scores(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            word: {
+                'difficulty_score': difficulty,
+                'relic_type': RELIC_TYPES_BY_DIFFICULTY[difficulty],
+                'frequency': frequency,
+                'pos': pos,
+                'count': count
+            }
+            for word, pos, difficulty, frequency, count in zip(
+                self.words, self.pos, self.difficulties, self.frequencies, self.counts
+            )
+        }
+
+    def themes(self) -> List[str]:
+        return [word for word, _ in self.keyword_counts.most_common(MAX_THEMES)]
+
+    def word_categories(self, vocabulary_level: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Categorize words into:
+        - uses_well: Words at or above student's grade level
+        - needs_practice: Common words below level (gaps)
+        - to_master: Words below level that fall in the next grade range
+        """
+        student_min, _ = grade_level_to_difficulty_range(vocabulary_level)
+        next_grades = get_next_grade_levels(vocabulary_level)
+        if next_grades:
+            next_min, next_max = grade_level_to_difficulty_range(next_grades[0])
+        else:
+            # If at 12+, use a higher range
+            next_min, next_max = (65, 75)
+
+        uses_well = []
+        needs_practice = []
+        to_master = []
+        for index, (difficulty, frequency) in enumerate(zip(self.difficulties, self.frequencies)):
+            if difficulty >= student_min:
+                # At or above the student's level - they use it well
+                uses_well.append(index)
+            else:
+                # Common words well below level, or slightly below level, are gaps
+                threshold = 1000 if difficulty < student_min - 10 else 500
+                if frequency > threshold:
+                    needs_practice.append(index)
+
+                # Words already used well are never repeated in to_master
+                if next_min <= difficulty <= next_max:
+                    to_master.append(index)
+
+        by_difficulty = self.difficulties.__getitem__
+        return {
+            'uses_well': self._word_infos(heapq.nlargest(USES_WELL_LIMIT, uses_well, key=by_difficulty)),
+            'needs_practice': self._word_infos(heapq.nsmallest(NEEDS_PRACTICE_LIMIT, needs_practice, key=by_difficulty)),
+            'to_master': self._word_infos(heapq.nsmallest(TO_MASTER_LIMIT, to_master, key=by_difficulty))
+        }
+
+    def _word_infos(self, indexes: List[int]) -> List[Dict[str, Any]]:
+        infos = []
+        for index in indexes:
+            difficulty = self.difficulties[index]
+            infos.append({
+                'word': self.words[index],
+                'difficulty_score': difficulty,
+                'grade_level': difficulty_to_grade_level(difficulty),
+                'relic_type': RELIC_TYPES_BY_DIFFICULTY[difficulty],
+                'frequency': self.frequencies[index],
+                'pos': self.pos[index],
+                'count': self.counts[index]
+            })
+        return infos
+
+    def result(self) -> Dict[str, Any]:
+        """Profile dictionary in the StoryProfiler.analyze_transcript format"""
+        total = len(self.words)
+        vocabulary_level = self.vocabulary_level()
+        word_categories = self.word_categories(vocabulary_level)
+        count_sum = sum(self.counts)
+
+        resonance_data = {
+            'vocabulary_level': vocabulary_level,
+            'total_words': total,
+            'unique_words': total,
+            'relic_distribution': dict(self.relic_counts),
+            'themes': self.themes(),
+            'complexity_score': min(1.0, self.difficulty_sum / total / 100.0) if total else 0.0,
+            'lexical_diversity': total / count_sum if count_sum else 0.0,
+            'sophistication_score': self.advanced_count / total if total else 0.0,
+            'pos_distribution': dict(self.pos_counts),
+            'word_categories': word_categories
+        }
+
+        return {
+            'word_scores': self.word_scores(),
+            'resonance_data': resonance_data,
+            'vocabulary_level': vocabulary_level,
+            'word_categories': word_categories
+        }
@@ -0,0 +1,190 @@
+"""
+Analysis Cache
+Reuses StoryProfiler results for identical (or resubmitted) transcripts.
+
+Entries are keyed by a hash of the cleaned transcript plus the spaCy model and
+lexicon versions, so upgrading either one never serves stale analyses. Values
+are stored as JSON bytes: byte accounting is exact and callers always get a
+fresh copy they can modify.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cache settings (override via environment)
+ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 0 disables caching
+ANALYSIS_CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR")  # Optional on-disk tier shared by all workers
+ANALYSIS_CACHE_DISK_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Bump when the shape of StoryProfiler output changes
+ANALYSIS_FORMAT_VERSION = 1
+
+
+class AnalysisCache:
+    """LRU of analysis results bounded by total size, with an optional disk tier"""
+
+    def __init__(
+        self,
+        max_bytes: int = ANALYSIS_CACHE_MAX_BYTES,
+        disk_dir: Optional[str] = ANALYSIS_CACHE_DIR,
+        disk_max_bytes: int = ANALYSIS_CACHE_DISK_MAX_BYTES
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(cleaned_text: str, model_version: str, lexicon_version: str) -> str:
+        """Cache key for an already-cleaned transcript"""
+        digest = hashlib.sha256()
+        for part in (str(ANALYSIS_FORMAT_VERSION), model_version, lexicon_version, cleaned_text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an analysis in memory, then on disk"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+
+        if data is None and self.disk_dir is not None:
+            data = self._read_disk(key)
+            if data is not None:
+                self._store_memory(key, data)
+
+        if data is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(data)
+
+    def put(self, key: str, analysis: Dict[str, Any]):
+        """Store an analysis"""
+        if self.max_bytes <= 0 and self.disk_dir is None:
+            return
+        data = json.dumps(analysis, separators=(",", ":")).encode("utf-8")
+        self._store_memory(key, data)
+        if self.disk_dir is not None:
+            self._write_disk(key, data)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """get() that keeps disk reads off the event loop"""
+        if self.disk_dir is None:
+            return self.get(key)
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, key)
+
+    async def aput(self, key: str, analysis: Dict[str, Any]):
+        """put() that keeps disk writes off the event loop"""
+        if self.disk_dir is None:
+            self.put(key, analysis)
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.put, key, analysis)
+
+    def clear(self):
+        """Drop all in-memory entries (the disk tier is left alone)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _store_memory(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # Recently used files are pruned last
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Failed to read cached analysis {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, data: bytes):
+        path = self._disk_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cached analysis {path}: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.disk_dir))
+            else:
+                self._disk_bytes += len(data)
+            over_budget = self._disk_bytes > self.disk_max_bytes
+        if over_budget:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete least recently used files until the disk tier is 10% under budget"""
+        entries = sorted(os.scandir(self.disk_dir), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        target = self.disk_max_bytes * 0.9
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                continue
+        with self._lock:
+            self._disk_bytes = total
+        logger.info(f"Pruned analysis disk cache to {total} bytes")
+
+
+# Global instance
+_analysis_cache: Optional[AnalysisCache] = None
+
+def get_analysis_cache() -> AnalysisCache:
+    """Get or create global analysis cache"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache()
+    return _analysis_cache
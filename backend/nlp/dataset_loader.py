@@ -2,26 +2,44 @@
 Dataset Loader for COCA/Lexile Corpora
 Handles loading and querying word frequency/difficulty data
 """
+import hashlib
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 import logging
 
+from .difficulty import (
+    RELIC_TYPES_BY_DIFFICULTY,
+    difficulty_from_stats,
+    estimate_difficulty_from_word
+)
+from .lexicon import Lexicon, LEXICON_FILENAME, open_lexicon
+
 logger = logging.getLogger(__name__)
 
+# Distinct words whose scores are cached per process (override via environment)
+WORD_SCORE_CACHE_SIZE = int(os.getenv("WORD_SCORE_CACHE_SIZE", "65536"))
+
 class DatasetLoader:
     """Base class for loading word difficulty datasets"""
     
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
-        self.coca_data: Dict[str, int] = {}
-        self.lexile_data: Dict[str, int] = {}
+        self.coca_data: Mapping[str, int] = {}
+        self.lexile_data: Mapping[str, int] = {}
+        self.lexicon: Optional[Lexicon] = None
+        self.version = "placeholder"  # Identifies the loaded data (used in analysis cache keys)
         self._load_datasets()
+        self._reset_score_cache()
     
     def _load_datasets(self):
-        """Load COCA and Lexile datasets from files"""
+        """Load COCA and Lexile datasets, preferring the compiled lexicon"""
+        if self._load_lexicon():
+            return
+        
         # COCA dataset (word frequency)
         coca_path = self.data_dir / "coca_frequency.json"
         if coca_path.exists():
@@ -46,6 +64,47 @@ class DatasetLoader:
         if not self.coca_data and not self.lexile_data:
             logger.warning("No COCA/Lexile datasets found. Using placeholder system.")
             self._create_placeholder_data()
+        else:
+            self.version = "json-" + self._fingerprint_files([coca_path, lexile_path])
+    
+    @staticmethod
+    def _fingerprint_files(paths, previous: str = "") -> str:
+        """Short hash of file names, sizes and modification times"""
+        digest = hashlib.sha1(previous.encode('utf-8'))
+        for path in paths:
+            path = Path(path)
+            if path.exists():
+                stat = path.stat()
+                digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+        return digest.hexdigest()[:12]
+    
+    def _load_lexicon(self) -> bool:
+        """
+        Memory-map the compiled lexicon (data/lexicon.bin) if it is present and
+        up to date. Build it with: python scripts/process_coca_data.py --build-lexicon
+        """
+        lexicon_path = self.data_dir / LEXICON_FILENAME
+        if not lexicon_path.exists():
+            return False
+        
+        # Don't serve stale data if the JSON sources were edited after the last build
+        lexicon_mtime = lexicon_path.stat().st_mtime
+        for source in ("coca_frequency.json", "lexile_scores.json"):
+            source_path = self.data_dir / source
+            if source_path.exists() and source_path.stat().st_mtime > lexicon_mtime:
+                logger.warning(f"{LEXICON_FILENAME} is older than {source}, loading JSON instead. Rebuild the lexicon.")
+                return False
+        
+        lexicon = open_lexicon(lexicon_path)
+        if lexicon is None or lexicon.count == 0:
+            return False
+        
+        self.lexicon = lexicon
+        self.version = lexicon.version
+        self.coca_data = lexicon.frequencies
+        self.lexile_data = lexicon.lexile_scores
+        logger.info(f"Mapped lexicon with {len(self.coca_data)} COCA frequencies and {len(self.lexile_data)} Lexile scores")
+        return True
     
     def _create_placeholder_data(self):
         """Create placeholder data structure for development"""
@@ -74,66 +133,45 @@ class DatasetLoader:
         Calculate difficulty score and relic type for a word
         Returns: (difficulty_score, relic_type)
         """
-        word_lower = word.lower()
-        
-        # Get frequency and Lexile data
-        frequency = self.get_word_frequency(word_lower)
-        lexile = self.get_lexile_score(word_lower)
-        
-        # Calculate base difficulty (0-100 scale)
-        # Higher frequency = easier (lower score)
-        # Higher Lexile = harder (higher score)
-        
-        if lexile is not None:
-            # Use Lexile score directly (typically 0-1600, we'll normalize)
-            difficulty = min(100, max(0, int((lexile / 1600) * 100)))
-        elif frequency > 0:
-            # Use frequency as inverse difficulty
-            # Log scale: log10(frequency) -> lower for common words
-            import math
-            if frequency >= 10000:
-                difficulty = 10  # Very common
-            elif frequency >= 1000:
-                difficulty = 30
-            elif frequency >= 100:
-                difficulty = 50
-            elif frequency >= 10:
-                difficulty = 70
-            else:
-                difficulty = 90  # Rare words
-        else:
-            # Fallback: use word length and complexity
-            difficulty = self._estimate_difficulty_from_word(word)
-        
-        # Map to relic type
-        if difficulty < 25:
-            relic_type = 'whisper'
-        elif difficulty < 50:
-            relic_type = 'echo'
-        elif difficulty < 75:
-            relic_type = 'resonance'
+        difficulty = self._cached_difficulty(word.lower())
+        return difficulty, RELIC_TYPES_BY_DIFFICULTY[difficulty]
+    
+    def score_many(self, words: Iterable[str]) -> List[Tuple[int, str]]:
+        """
+        Batch form of calculate_difficulty_score
+        Returns (difficulty_score, relic_type) for each word, in order
+        """
+        cached_difficulty = self._cached_difficulty
+        relic_types = RELIC_TYPES_BY_DIFFICULTY
+        scores = []
+        for word in words:
+            difficulty = cached_difficulty(word.lower())
+            scores.append((difficulty, relic_types[difficulty]))
+        return scores
+    
+    def _reset_score_cache(self):
+        """(Re)create the word score LRU; called whenever the datasets change"""
+        self._cached_difficulty = lru_cache(maxsize=WORD_SCORE_CACHE_SIZE)(self._lookup_difficulty)
+    
+    def _lookup_difficulty(self, word_lower: str) -> int:
+        """Difficulty for a lowercase word, before caching"""
+        if self.lexicon is not None:
+            # Precomputed when the lexicon was compiled
+            difficulty = self.lexicon.difficulties.get(word_lower)
         else:
-            relic_type = 'thunder'
+            difficulty = difficulty_from_stats(
+                self.coca_data.get(word_lower, 0),
+                self.lexile_data.get(word_lower)
+            )
         
-        return difficulty, relic_type
+        if difficulty is None:
+            # Not in the datasets: use word length and complexity
+            difficulty = estimate_difficulty_from_word(word_lower)
+        return difficulty
     
     def _estimate_difficulty_from_word(self, word: str) -> int:
         """Estimate difficulty from word characteristics when no dataset data"""
-        score = 50  # Base score
-        
-        # Longer words tend to be harder
-        if len(word) > 10:
-            score += 20
-        elif len(word) > 7:
-            score += 10
-        
-        # Words with uncommon letter combinations
-        uncommon_patterns = ['x', 'z', 'q', 'ph', 'th', 'ch', 'sh']
-        for pattern in uncommon_patterns:
-            if pattern in word.lower():
-                score += 5
-        
-        return min(100, score)
+        return estimate_difficulty_from_word(word.lower())
     
     def load_dataset_file(self, file_path: str, dataset_type: str = 'coca'):
         """
@@ -144,12 +182,21 @@ class DatasetLoader:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
+            # Lexicon views are read-only; copy them into dicts before merging
+            if self.lexicon is not None:
+                self.coca_data = dict(self.coca_data)
+                self.lexile_data = dict(self.lexile_data)
+                self.lexicon = None
+            
             if dataset_type == 'coca':
                 self.coca_data.update(data)
                 logger.info(f"Loaded {len(data)} COCA entries from {file_path}")
             elif dataset_type == 'lexile':
                 self.lexile_data.update(data)
                 logger.info(f"Loaded {len(data)} Lexile entries from {file_path}")
+            
+            self.version = "custom-" + self._fingerprint_files([file_path], previous=self.version)
+            self._reset_score_cache()
         except Exception as e:
             logger.error(f"Failed to load dataset from {file_path}: {e}")
             raise
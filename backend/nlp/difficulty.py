@@ -0,0 +1,66 @@
+"""
+Difficulty Scoring
+Pure functions mapping dataset statistics to difficulty scores (0-100) and relic types
+"""
+from typing import Optional, Tuple
+
+_UNCOMMON_PATTERNS = ('x', 'z', 'q', 'ph', 'th', 'ch', 'sh')
+
+
+def relic_type_for_difficulty(difficulty: int) -> str:
+    """Map a difficulty score to its relic type"""
+    if difficulty < 25:
+        return 'whisper'
+    elif difficulty < 50:
+        return 'echo'
+    elif difficulty < 75:
+        return 'resonance'
+    else:
+        return 'thunder'
+
+
+# Every difficulty score is an int in 0-100, so relic types are a tuple index
+RELIC_TYPES_BY_DIFFICULTY: Tuple[str, ...] = tuple(relic_type_for_difficulty(d) for d in range(101))
+
+
+def difficulty_from_stats(frequency: int, lexile: Optional[int]) -> Optional[int]:
+    """
+    Difficulty from COCA frequency / Lexile score
+    Returns None when neither is usable and the word needs a heuristic estimate
+    """
+    # Higher frequency = easier (lower score)
+    # Higher Lexile = harder (higher score)
+    if lexile is not None:
+        # Use Lexile score directly (typically 0-1600, we'll normalize)
+        return min(100, max(0, int((lexile / 1600) * 100)))
+    if frequency > 0:
+        # Use frequency as inverse difficulty
+        if frequency >= 10000:
+            return 10  # Very common
+        elif frequency >= 1000:
+            return 30
+        elif frequency >= 100:
+            return 50
+        elif frequency >= 10:
+            return 70
+        else:
+            return 90  # Rare words
+    return None
+
+
+def estimate_difficulty_from_word(word: str) -> int:
+    """Estimate difficulty from word characteristics when no dataset data (expects lowercase)"""
+    score = 50  # Base score
+
+    # Longer words tend to be harder
+    if len(word) > 10:
+        score += 20
+    elif len(word) > 7:
+        score += 10
+
+    # Words with uncommon letter combinations
+    for pattern in _UNCOMMON_PATTERNS:
+        if pattern in word:
+            score += 5
+
+    return min(100, score)
@@ -0,0 +1,243 @@
+"""
+Profiling Executor
+Runs CPU-bound transcript profiling in a process pool so spaCy parses never block the event loop.
+Results are cached by transcript content, so resubmitted text skips the pool entirely.
+"""
+import asyncio
+import contextlib
+import copy
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Any, Optional, Callable
+import logging
+
+from .analysis_cache import AnalysisCache, get_analysis_cache
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration (override via environment)
+PROFILER_WORKERS = int(os.getenv("PROFILER_WORKERS", "2"))  # 0 = run in a thread instead of a process pool
+PROFILER_MAX_PENDING = int(os.getenv("PROFILER_MAX_PENDING", "16"))  # Running + queued jobs before we shed load
+PROFILER_RETRY_AFTER = int(os.getenv("PROFILER_RETRY_AFTER", "5"))  # Seconds clients should wait when saturated
+
+FILE_READ_CHARS = 64 * 1024  # Read size when profiling a transcript file
+
+
+class ProfilerBusyError(Exception):
+    """Raised when the profiling queue is full and the request should be retried later"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Profiler is busy, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+# Executor whose slot the current request holds (see ProfilingExecutor.reserve)
+_reserved_by: ContextVar[Optional["ProfilingExecutor"]] = ContextVar("profiler_reserved_by", default=None)
+
+# Per-process profiler, created once by the pool initializer
+_worker_profiler: Optional[Any] = None
+
+def _init_worker():
+    """Pool initializer: load the spaCy model and datasets once per worker process"""
+    global _worker_profiler
+    from .profiler import StoryProfiler
+    _worker_profiler = StoryProfiler()
+    logger.info(f"Profiling worker {os.getpid()} ready")
+
+def _get_worker_profiler():
+    """Get the profiler for the current process (also used when running in-thread)"""
+    if _worker_profiler is None:
+        _init_worker()
+    return _worker_profiler
+
+def _run_analyze_transcript(transcript: str) -> Dict[str, Any]:
+    return _get_worker_profiler().analyze_transcript(transcript)
+
+def _run_analyze_file(path: str) -> Dict[str, Any]:
+    def read_chunks():
+        with open(path, encoding="utf-8") as f:
+            while True:
+                chunk = f.read(FILE_READ_CHARS)
+                if not chunk:
+                    return
+                yield chunk
+    return _get_worker_profiler().analyze_stream(read_chunks())
+
+def _run_analyze_many(transcripts: List[str], batch_size: int) -> List[Dict[str, Any]]:
+    return _get_worker_profiler().analyze_many(transcripts, batch_size=batch_size)
+
+
+class ProfilingExecutor:
+    """Bounded process pool for StoryProfiler work"""
+
+    def __init__(
+        self,
+        max_workers: int = PROFILER_WORKERS,
+        max_pending: int = PROFILER_MAX_PENDING,
+        retry_after: int = PROFILER_RETRY_AFTER,
+        cache: Optional[AnalysisCache] = None
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.cache = cache if cache is not None else get_analysis_cache()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._model_version: Optional[str] = None
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Lazily start the process pool (None when running in-thread)"""
+        if self.max_workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawn (not fork) so workers never inherit the server's threads or locks
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+                logger.info(f"Started profiling pool with {self.max_workers} workers")
+            return self._pool
+
+    @contextlib.contextmanager
+    def reserve(self) -> Iterator[None]:
+        """
+        Hold a queue slot for the analysis done inside the block
+        
+        Raises ProfilerBusyError straight away when the queue is full, so a
+        handler can refuse a request before storing anything. Analyses in the
+        block use the reserved slot (run them one at a time).
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ProfilerBusyError(self.retry_after)
+        token = _reserved_by.set(self)
+        try:
+            yield
+        finally:
+            _reserved_by.reset(token)
+            self._slots.release()
+
+    async def _submit(self, fn: Callable, *args) -> Any:
+        """Run fn in the pool, rejecting work when the queue is already full"""
+        if _reserved_by.get() is self:
+            return await self._run(fn, *args)
+        if not self._slots.acquire(blocking=False):
+            raise ProfilerBusyError(self.retry_after)
+        try:
+            return await self._run(fn, *args)
+        finally:
+            self._slots.release()
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); drop the pool so the next call starts a fresh one
+            logger.error("Profiling pool is broken, restarting on next request")
+            self.shutdown(wait=False)
+            raise
+
+    def _cache_key(self, cleaned_text: str) -> str:
+        """Analysis cache key for the current model and lexicon"""
+        from .dataset_loader import get_dataset_loader
+        from .profiler import get_model_version
+        if self._model_version is None:
+            self._model_version = get_model_version()
+        return AnalysisCache.make_key(cleaned_text, self._model_version, get_dataset_loader().version)
+
+    async def analyze_transcript(self, transcript: str) -> Dict[str, Any]:
+        """Async equivalent of StoryProfiler.analyze_transcript"""
+        from .profiler import clean_text
+        key = self._cache_key(clean_text(transcript))
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return cached
+
+        analysis = await self._submit(_run_analyze_transcript, transcript)
+        await self.cache.aput(key, analysis)
+        return analysis
+
+    async def analyze_file(self, path: str) -> Dict[str, Any]:
+        """
+        Async equivalent of StoryProfiler.analyze_stream for a UTF-8 text file
+        The worker reads the file itself, so the transcript never passes through
+        this process. Results are not cached (files are one-off uploads).
+        """
+        return await self._submit(_run_analyze_file, path)
+
+    async def analyze_many(self, transcripts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """Async equivalent of StoryProfiler.analyze_many"""
+        from .profiler import clean_text, MIN_TRANSCRIPT_CHARS
+
+        keys = []
+        for index, transcript in enumerate(transcripts):
+            cleaned = clean_text(transcript)
+            if len(cleaned) < MIN_TRANSCRIPT_CHARS:
+                raise ValueError(f"Transcript {index} too short for analysis")
+            keys.append(self._cache_key(cleaned))
+
+        results: Dict[str, Dict[str, Any]] = {}
+        to_analyze: Dict[str, str] = {}  # Distinct uncached transcripts by key
+        for key, transcript in zip(keys, transcripts):
+            if key in results or key in to_analyze:
+                continue
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                to_analyze[key] = transcript
+
+        if to_analyze:
+            analyses = await self._submit(_run_analyze_many, list(to_analyze.values()), batch_size)
+            for key, analysis in zip(to_analyze, analyses):
+                await self.cache.aput(key, analysis)
+                results[key] = analysis
+
+        # Duplicates in the batch get their own copy
+        output = []
+        seen = set()
+        for key in keys:
+            output.append(copy.deepcopy(results[key]) if key in seen else results[key])
+            seen.add(key)
+        return output
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global instance
+_profiling_executor: Optional[ProfilingExecutor] = None
+
+def get_profiling_executor() -> ProfilingExecutor:
+    """Get or create global profiling executor"""
+    global _profiling_executor
+    if _profiling_executor is None:
+        _profiling_executor = ProfilingExecutor()
+    return _profiling_executor
+
+def shutdown_profiling_executor():
+    """Shut down the global profiling executor (called on app shutdown)"""
+    global _profiling_executor
+    if _profiling_executor is not None:
+        _profiling_executor.shutdown()
+        _profiling_executor = None
+
+def busy_exception(error: ProfilerBusyError):
+    """HTTP 503 telling the client when to retry"""
+    from fastapi import HTTPException
+    return HTTPException(
+        status_code=503,
+        detail="Vocabulary analysis is busy right now. Please try again shortly.",
+        headers={"Retry-After": str(error.retry_after)}
+    )
@@ -0,0 +1,71 @@
+"""
+Grade Level Mapping
+Stateless lookups between difficulty scores (0-100) and K-12 grade bands
+"""
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+# Grade bands in ascending order
+GRADE_SEQUENCE: Tuple[str, ...] = ('K-1', '2-3', '4-5', '6-7', '8-9', '10-11', '12+')
+
+# Difficulty score range covered by each grade band
+GRADE_RANGES: Dict[str, Tuple[int, int]] = {
+    'K-1': (5, 15),
+    '2-3': (15, 25),
+    '4-5': (25, 35),
+    '6-7': (35, 45),
+    '8-9': (45, 55),
+    '10-11': (55, 65),
+    '12+': (65, 75)
+}
+
+DEFAULT_GRADE = '4-5'
+DEFAULT_DIFFICULTY_RANGE = GRADE_RANGES[DEFAULT_GRADE]
+DEFAULT_NEXT_GRADES = ['4-5', '6-7']
+
+# student_progress.vocabulary_level for each grade band (the column only
+# accepts these four values, see migration 004)
+PROGRESS_LEVELS: Dict[str, str] = {
+    'K-1': 'beginner',
+    '2-3': 'beginner',
+    '4-5': 'intermediate',
+    '6-7': 'intermediate',
+    '8-9': 'advanced',
+    '10-11': 'advanced',
+    '12+': 'expert'
+}
+
+# Upper bound of every band except the last: difficulty < 15 is K-1, < 25 is 2-3, ...
+_GRADE_BOUNDARIES: Tuple[int, ...] = tuple(GRADE_RANGES[grade][1] for grade in GRADE_SEQUENCE[:-1])
+
+# Next 1-2 grade bands for ZPD recommendations (12+ stays at 12+)
+_NEXT_GRADES: Dict[str, Tuple[str, ...]] = {
+    grade: tuple(GRADE_SEQUENCE[index + 1:index + 3]) or (grade,)
+    for index, grade in enumerate(GRADE_SEQUENCE)
+}
+
+
+def difficulty_to_grade_level(difficulty: float) -> str:
+    """Convert difficulty score to grade level"""
+    return GRADE_SEQUENCE[bisect_right(_GRADE_BOUNDARIES, difficulty)]
+
+
+def grade_level_to_difficulty_range(grade_level: str) -> Tuple[int, int]:
+    """Convert grade level to difficulty score range (defaults to 4-5 grade)"""
+    return GRADE_RANGES.get(grade_level, DEFAULT_DIFFICULTY_RANGE)
+
+
+def get_next_grade_levels(current_grade: str) -> List[str]:
+    """Get the next 1-2 grade levels for ZPD recommendations"""
+    next_grades = _NEXT_GRADES.get(current_grade)
+    if next_grades is None:
+        # If grade not found, default to recommending 4-5 and 6-7
+        return list(DEFAULT_NEXT_GRADES)
+    return list(next_grades)
+
+
+def grade_level_to_progress_level(grade_level: str) -> Optional[str]:
+    """Progress level for a grade band (progress levels pass through, None if unknown)"""
+    if grade_level in PROGRESS_LEVELS.values():
+        return grade_level
+    return PROGRESS_LEVELS.get(grade_level)
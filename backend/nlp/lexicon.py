@@ -0,0 +1,259 @@
+"""
+Compiled Lexicon
+Memory-mapped binary form of the COCA frequency and Lexile datasets.
+
+Every worker process maps the same read-only file, so the OS page cache holds a
+single copy instead of each process parsing the JSON into its own dicts.
+
+File layout (little-endian, sections 8-byte aligned):
+    header      magic, format version, counts, checksum, section offsets
+    offsets     uint32[count + 1]  byte offset of each word in the string table
+    frequency   int64[count]       COCA frequency (-1 = not in COCA)
+    lexile      int32[count]       Lexile score (INT32_MIN = no score)
+    difficulty  uint8[count]       precomputed difficulty score (255 = estimate at runtime)
+    table       uint32[table_size] open-addressing hash index -> word index
+    strings     UTF-8 words, sorted, concatenated
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+import logging
+
+from .difficulty import difficulty_from_stats
+
+logger = logging.getLogger(__name__)
+
+LEXICON_FILENAME = "lexicon.bin"
+MAGIC = b"PALABLEX"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<8s7I7Q")
+_EMPTY_SLOT = 0xFFFFFFFF
+_NO_FREQUENCY = -1
+_NO_LEXILE = -2 ** 31
+_NO_DIFFICULTY = 255
+
+
+class LexiconFormatError(Exception):
+    """Raised when a lexicon file is missing, corrupt, or built for another format version"""
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _table_size(count: int) -> int:
+    """Power of two at least twice the entry count (load factor <= 0.5)"""
+    size = 8
+    while size < count * 2:
+        size <<= 1
+    return size
+
+
+class LexiconColumn(Mapping):
+    """Read-only dict-like view of one lexicon column (word -> value)"""
+
+    def __init__(self, lexicon: "Lexicon", values: memoryview, missing: int, count: int):
+        self._lexicon = lexicon
+        self._values = values
+        self._missing = missing
+        self._count = count
+
+    def get(self, word, default=None):
+        index = self._lexicon.index_of(word)
+        if index < 0:
+            return default
+        value = self._values[index]
+        return default if value == self._missing else value
+
+    def __getitem__(self, word):
+        value = self.get(word, self._missing)
+        if value == self._missing:
+            raise KeyError(word)
+        return value
+
+    def __contains__(self, word) -> bool:
+        return self.get(word, self._missing) != self._missing
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._lexicon.count):
+            if self._values[index] != self._missing:
+                yield self._lexicon.word_at(index)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class Lexicon:
+    """Memory-mapped word -> (COCA frequency, Lexile score) lookup"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        if sys.byteorder != "little":
+            raise LexiconFormatError("Compiled lexicons are only supported on little-endian hosts")
+
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._parse()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _parse(self):
+        if len(self._mm) < _HEADER.size:
+            raise LexiconFormatError(f"{self.path} is too small to be a lexicon")
+
+        (magic, version, count, coca_count, lexile_count, difficulty_count, table_size, checksum,
+         offsets_at, frequency_at, lexile_at, difficulty_at, table_at, strings_at,
+         strings_size) = _HEADER.unpack_from(self._mm, 0)
+
+        if magic != MAGIC:
+            raise LexiconFormatError(f"{self.path} is not a lexicon file")
+        if version != FORMAT_VERSION:
+            raise LexiconFormatError(f"{self.path} has format version {version}, expected {FORMAT_VERSION}")
+        if strings_at + strings_size > len(self._mm):
+            raise LexiconFormatError(f"{self.path} is truncated")
+
+        view = memoryview(self._mm)
+        self.count = count
+        self.checksum = checksum
+        self._offsets = view[offsets_at:offsets_at + 4 * (count + 1)].cast("I")
+        self._frequency = view[frequency_at:frequency_at + 8 * count].cast("q")
+        self._lexile = view[lexile_at:lexile_at + 4 * count].cast("i")
+        self._difficulty = view[difficulty_at:difficulty_at + count]
+        self._table = view[table_at:table_at + 4 * table_size].cast("I")
+        self._mask = table_size - 1
+        self._strings_at = strings_at
+
+        self.frequencies = LexiconColumn(self, self._frequency, _NO_FREQUENCY, coca_count)
+        self.lexile_scores = LexiconColumn(self, self._lexile, _NO_LEXILE, lexile_count)
+        self.difficulties = LexiconColumn(self, self._difficulty, _NO_DIFFICULTY, difficulty_count)
+
+    @property
+    def version(self) -> str:
+        """Content fingerprint, changes whenever the lexicon is rebuilt with different data"""
+        return f"lexicon-{FORMAT_VERSION}-{self.checksum:08x}"
+
+    def word_at(self, index: int) -> str:
+        start = self._strings_at + self._offsets[index]
+        end = self._strings_at + self._offsets[index + 1]
+        return self._mm[start:end].decode("utf-8")
+
+    def index_of(self, word) -> int:
+        """Index of word in the string table, or -1 if absent"""
+        if not isinstance(word, str):
+            return -1
+        key = word.encode("utf-8")
+        strings_at = self._strings_at
+        slot = zlib.crc32(key) & self._mask
+        while True:
+            index = self._table[slot]
+            if index == _EMPTY_SLOT:
+                return -1
+            start = strings_at + self._offsets[index]
+            end = strings_at + self._offsets[index + 1]
+            if end - start == len(key) and self._mm[start:end] == key:
+                return index
+            slot = (slot + 1) & self._mask
+
+    def close(self):
+        """Release the mapping"""
+        for attr in ("_offsets", "_frequency", "_lexile", "_difficulty", "_table"):
+            getattr(self, attr).release()
+        self._mm.close()
+
+    @staticmethod
+    def build(
+        coca_data: Dict[str, int],
+        lexile_data: Dict[str, int],
+        output_path: Union[str, Path]
+    ) -> int:
+        """
+        Compile COCA/Lexile dicts into a lexicon file
+
+        The file is written to a temporary path and renamed into place so
+        running workers never map a half-written lexicon.
+
+        Returns:
+            Number of words in the lexicon
+        """
+        words = sorted(set(coca_data) | set(lexile_data), key=lambda w: w.encode("utf-8"))
+        count = len(words)
+        table_size = _table_size(count)
+
+        offsets = array("I", [0])
+        frequency = array("q")
+        lexile = array("i")
+        difficulty = array("B")
+        strings = bytearray()
+        table = array("I", [_EMPTY_SLOT]) * table_size
+        mask = table_size - 1
+
+        for index, word in enumerate(words):
+            encoded = word.encode("utf-8")
+            strings += encoded
+            offsets.append(len(strings))
+            word_frequency = coca_data.get(word, 0)
+            word_lexile = lexile_data.get(word)
+            frequency.append(int(word_frequency) if word in coca_data else _NO_FREQUENCY)
+            lexile.append(int(word_lexile) if word_lexile is not None else _NO_LEXILE)
+            word_difficulty = difficulty_from_stats(word_frequency, word_lexile)
+            difficulty.append(_NO_DIFFICULTY if word_difficulty is None else word_difficulty)
+
+            slot = zlib.crc32(encoded) & mask
+            while table[slot] != _EMPTY_SLOT:
+                slot = (slot + 1) & mask
+            table[slot] = index
+
+        sections = [
+            offsets.tobytes(), frequency.tobytes(), lexile.tobytes(),
+            difficulty.tobytes(), table.tobytes(), bytes(strings)
+        ]
+        positions = []
+        position = _HEADER.size
+        for section in sections:
+            position = _align(position)
+            positions.append(position)
+            position += len(section)
+
+        checksum = 0
+        for section in sections:
+            checksum = zlib.crc32(section, checksum)
+
+        header = _HEADER.pack(
+            MAGIC, FORMAT_VERSION, count,
+            sum(1 for w in words if w in coca_data),
+            sum(1 for w in words if w in lexile_data),
+            sum(1 for d in difficulty if d != _NO_DIFFICULTY),
+            table_size, checksum,
+            *positions, len(strings)
+        )
+
+        output_path = Path(output_path)
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            for section, section_at in zip(sections, positions):
+                f.write(b"\0" * (section_at - f.tell()))
+                f.write(section)
+        os.replace(tmp_path, output_path)
+
+        logger.info(f"Compiled lexicon with {count} words to {output_path}")
+        return count
+
+
+def open_lexicon(path: Union[str, Path]) -> Optional[Lexicon]:
+    """Open a lexicon file, returning None (and logging why) if it cannot be used"""
+    try:
+        return Lexicon(path)
+    except (OSError, ValueError, struct.error, LexiconFormatError) as e:
+        logger.warning(f"Failed to open lexicon {path}: {e}")
+        return None
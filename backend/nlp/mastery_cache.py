@@ -0,0 +1,121 @@
+"""
+Word Mastery Cache
+Per-student set of mastered word ids, derived from SRS state
+
+The recommender skips these words before scoring candidates. A student's set
+is loaded once from their reviewed srs_progress rows (only the scheduling
+columns), then kept current by the SRS review endpoints, which report every
+card they write. A word counts as mastered when the scheduler that scheduled
+it rates its mastery level at MASTERY_THRESHOLD or above.
+"""
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cache settings (override via environment)
+MASTERY_THRESHOLD = float(os.getenv("MASTERY_THRESHOLD", "0.8"))  # SM-2: about 5 successful reviews at default ease
+MASTERY_CACHE_MAX_STUDENTS = int(os.getenv("MASTERY_CACHE_MAX_STUDENTS", "20000"))
+
+def mastered_word_ids(records: Iterable[Dict[str, Any]], scheduler) -> Set[str]:
+    """Word ids of srs_progress records the scheduler rates as mastered"""
+    from .srs import srs_data_from_record
+
+    return {
+        record['word_id'] for record in records
+        if scheduler.mastery_level(srs_data_from_record(record)) >= MASTERY_THRESHOLD
+    }
+
+class MasteryCache:
+    """LRU cache of each student's mastered word ids, updated incrementally on review writes"""
+
+    def __init__(self, max_students: int = MASTERY_CACHE_MAX_STUDENTS):
+        self.max_students = max_students
+        self._mastered: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self._loading: Dict[str, int] = {}  # student_id -> loads in progress
+        self._pending: Dict[str, List[Tuple[str, bool]]] = {}  # Updates that arrived during a load
+
+    def __len__(self) -> int:
+        return len(self._mastered)
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._mastered
+
+    async def get(self, student_id: str) -> Set[str]:
+        """Mastered word ids for a student, loading them on first use (do not modify)"""
+        mastered = self._mastered.get(student_id)
+        if mastered is not None:
+            self._mastered.move_to_end(student_id)
+            return mastered
+        return await self.load(student_id)
+
+    async def load(self, student_id: str) -> Set[str]:
+        """Load a student's mastered words from the database"""
+        from db import srs as db_srs, classes as db_classes
+        from .schedulers import get_scheduler
+
+        self._loading[student_id] = self._loading.get(student_id, 0) + 1
+        try:
+            records, scheduler_name = await asyncio.gather(
+                db_srs.get_reviewed_schedules(student_id),
+                db_classes.get_student_scheduler(student_id)
+            )
+            mastered = mastered_word_ids(records, get_scheduler(scheduler_name))
+        finally:
+            remaining = self._loading.pop(student_id) - 1
+            if remaining:
+                self._loading[student_id] = remaining
+            pending = self._pending.get(student_id, []) if remaining else self._pending.pop(student_id, [])
+
+        # Reviews written while the rows were being read may not be in them
+        for word_id, is_mastered in pending:
+            if is_mastered:
+                mastered.add(word_id)
+            else:
+                mastered.discard(word_id)
+
+        self._mastered[student_id] = mastered
+        self._mastered.move_to_end(student_id)
+        while len(self._mastered) > self.max_students:
+            self._mastered.popitem(last=False)
+        return mastered
+
+    def record(self, student_id: str, word_id: str, mastery_level: float):
+        """Update a cached student after one of their cards was rescheduled"""
+        is_mastered = mastery_level >= MASTERY_THRESHOLD
+        if student_id in self._loading:
+            self._pending.setdefault(student_id, []).append((word_id, is_mastered))
+
+        mastered = self._mastered.get(student_id)
+        if mastered is None:
+            return  # Loaded (with this review) on next use
+        if is_mastered:
+            mastered.add(word_id)
+        else:
+            mastered.discard(word_id)
+
+    def invalidate(self, student_id: str):
+        self._mastered.pop(student_id, None)
+
+    def clear(self):
+        self._mastered.clear()
+
+# Global instance
+_mastery_cache: Optional[MasteryCache] = None
+
+def get_mastery_cache() -> MasteryCache:
+    """Get or create global mastery cache"""
+    global _mastery_cache
+    if _mastery_cache is None:
+        _mastery_cache = MasteryCache()
+    return _mastery_cache
+
+def record_mastery(student_id: str, mastery_levels: Dict[str, float]):
+    """Apply SRS review results (word_id -> new mastery level) to the cache"""
+    if _mastery_cache is None:
+        return
+    for word_id, mastery_level in mastery_levels.items():
+        _mastery_cache.record(student_id, word_id, mastery_level)
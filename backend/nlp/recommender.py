@@ -2,9 +2,14 @@
 Relic Resonance Recommender
 Suggests ZPD-balanced words (70-80% learnability) based on student profiles
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 import logging
 from .dataset_loader import get_dataset_loader
+from .grade_levels import (
+    difficulty_to_grade_level,
+    grade_level_to_difficulty_range,
+    get_next_grade_levels
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +23,8 @@ class WordRecommender:
         self,
         profile: Dict[str, Any],
         count: int = 7,
-        zpd_range: tuple = (0.70, 0.80)
+        zpd_range: tuple = (0.70, 0.80),
+        student_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Recommend words in the Zone of Proximal Development (ZPD)
@@ -28,6 +34,7 @@ class WordRecommender:
             profile: Student's relic resonance profile
             count: Number of words to recommend (default 5-7)
             zpd_range: Target learnability range (default 70-80%)
+            student_id: Student to recommend for; words they have mastered in SRS are skipped
             
         Returns:
             List of recommended words with metadata and rationale
@@ -51,8 +58,13 @@ class WordRecommender:
                    f"themes: {student_analysis.get('themes', [])}, "
                    f"pos_distribution: {student_analysis.get('pos_distribution', {})}")
         
+        # Words already mastered in SRS are dropped before scoring
+        mastered_word_ids = await self._get_mastered_word_ids(student_id) if student_id else set()
+        
         # Get larger word pool for better diversity using grade-based ZPD
-        all_zpd_words = await self._find_zpd_words(current_level, zpd_range, count * 10, current_grade_level)
+        all_zpd_words = await self._find_zpd_words(
+            current_level, zpd_range, count * 10, current_grade_level, exclude_ids=mastered_word_ids
+        )
         
         logger.info(f"Found {len(all_zpd_words)} words in ZPD range")
         
@@ -128,24 +140,24 @@ class WordRecommender:
         current_level: float,
         zpd_range: tuple,
         count: int,
-        current_grade_level: Optional[str] = None
+        current_grade_level: Optional[str] = None,
+        exclude_ids: Optional[Set[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find words in the ZPD range using grade-based approach
         ZPD = words 1-2 grade levels above student's current grade
+        Words whose id is in exclude_ids are skipped
         """
+        exclude_ids = exclude_ids or set()
         # Use grade-based ZPD if grade level is provided
         if current_grade_level:
-            from .profiler import StoryProfiler
-            profiler = StoryProfiler()
-            
             # Get next 1-2 grade levels
-            target_grades = profiler.get_next_grade_levels(current_grade_level)
+            target_grades = get_next_grade_levels(current_grade_level)
             
             # Convert grade levels to difficulty ranges
             target_ranges = []
             for grade in target_grades:
-                grade_range = profiler.grade_level_to_difficulty_range(grade)
+                grade_range = grade_level_to_difficulty_range(grade)
                 target_ranges.append(grade_range)
             
             # Combine ranges into min/max
@@ -164,8 +176,12 @@ class WordRecommender:
         
         logger.info(f"ZPD target range: {target_min:.1f} - {target_max:.1f} (for grade {current_grade_level or 'unknown'})")
         
-        # Get larger word pool from database for better selection
-        sample_words = await self._get_word_pool(limit=count * 10)  # Get more candidates
+        # Get candidates in the target range from the cached word pool
+        sample_words = await self._get_word_pool(
+            limit=count * 10 + len(exclude_ids),  # Room for the excluded words
+            min_difficulty=target_min,
+            max_difficulty=target_max
+        )
         
         recommendations = []
         
@@ -174,8 +190,8 @@ class WordRecommender:
             difficulty = word_data.get('difficulty_score', 50)
             word = word_data.get('word', '').lower()  # Normalize to lowercase
             
-            # Skip if we've already seen this word
-            if word in seen_words:
+            # Skip if we've already seen this word or the student has mastered it
+            if word in seen_words or word_data.get('id') in exclude_ids:
                 continue
             
             # Check if word is in ZPD range
@@ -195,9 +211,7 @@ class WordRecommender:
                     pos = self._infer_pos(word)
                 
                 # Add grade level metadata
-                from .profiler import StoryProfiler
-                profiler = StoryProfiler()
-                grade_level = profiler.difficulty_to_grade_level(difficulty)
+                grade_level = difficulty_to_grade_level(difficulty)
                 
                 recommendations.append({
                     'word': word_data.get('word', ''),  # Keep original casing
@@ -213,6 +227,15 @@ class WordRecommender:
         
         return recommendations
     
+    async def _get_mastered_word_ids(self, student_id: str) -> Set[str]:
+        """Word ids the student has mastered in SRS (empty if unavailable)"""
+        try:
+            from .mastery_cache import get_mastery_cache
+            return await get_mastery_cache().get(student_id)
+        except Exception as e:
+            logger.warning(f"Could not load mastered words for student {student_id}: {e}")
+            return set()
+    
     def _infer_pos(self, word: str) -> str:
         """Simple POS inference (basic heuristic, in production use NLP)"""
         # Common suffixes for POS
@@ -244,21 +267,27 @@ class WordRecommender:
         relevance = 1.0 - (distance_from_center / (zpd_width / 2))
         return max(0.0, min(1.0, relevance))
     
-    async def _get_word_pool(self, limit: int = 500) -> List[Dict[str, Any]]:
+    async def _get_word_pool(
+        self,
+        limit: int = 500,
+        min_difficulty: float = 20,
+        max_difficulty: float = 90
+    ) -> List[Dict[str, Any]]:
         """
-        Get pool of words to recommend from database
+        Get pool of words to recommend from the cached words table
         """
         try:
-            from db import words as db_words
+            from db.word_cache import get_word_pool_cache
             
-            # Search for words in broader range (20-90 difficulty) for better selection
-            word_pool = await db_words.search_words(
-                min_difficulty=20,
-                max_difficulty=90,
+            word_cache = get_word_pool_cache()
+            word_pool = await word_cache.get_range(
+                min_difficulty,
+                max_difficulty,
                 limit=limit
             )
             
-            if word_pool:
+            # An empty slice of a populated table just means nothing is in range
+            if word_pool or len(word_cache):
                 return word_pool
             
             # Fallback to sample words if database is empty
@@ -271,9 +300,6 @@ class WordRecommender:
     
     def _get_fallback_word_pool(self) -> List[Dict[str, Any]]:
         """Fallback word pool if database is unavailable - expanded for diversity (80+ words)"""
-        from .profiler import StoryProfiler
-        profiler = StoryProfiler()
-        
         words = [
             # K-1 Grade words (5-15 difficulty)
             {'word': 'happy', 'difficulty_score': 10, 'relic_type': 'whisper', 'definition': 'feeling joy', 'example': 'I am happy today.', 'pos': 'ADJ', 'frequency': 12000},
@@ -379,7 +405,7 @@ class WordRecommender:
         # Add grade_level metadata to all words
         for word_data in words:
             difficulty = word_data.get('difficulty_score', 50)
-            word_data['grade_level'] = profiler.difficulty_to_grade_level(difficulty)
+            word_data['grade_level'] = difficulty_to_grade_level(difficulty)
         
         # Deduplicate by word (case-insensitive)
         seen_words = set()
@@ -525,19 +551,17 @@ class WordRecommender:
         frequency = word_data.get('frequency', 0) or self.dataset_loader.get_word_frequency(word)
         
         # Get student's current grade level
-        from .profiler import StoryProfiler
-        profiler = StoryProfiler()
         current_grade = student_analysis.get('vocabulary_level', '4-5')
-        current_min, current_max = profiler.grade_level_to_difficulty_range(current_grade)
+        current_min, current_max = grade_level_to_difficulty_range(current_grade)
         current_avg = (current_min + current_max) / 2
         
         # Primary rationale based on ZPD positioning
         primary_rationale = None
         
         # Check if word is in ZPD (next 1-2 grade levels)
-        next_grades = profiler.get_next_grade_levels(current_grade)
+        next_grades = get_next_grade_levels(current_grade)
         if next_grades:
-            next_min, next_max = profiler.grade_level_to_difficulty_range(next_grades[0])
+            next_min, next_max = grade_level_to_difficulty_range(next_grades[0])
             if next_min <= difficulty <= next_max:
                 # Word is in the perfect ZPD range
                 if grade_level:
@@ -767,7 +791,8 @@ async def get_student_recommendations(student_id: str):
                         'word_scores': latest_profile.get('word_scores', {}),
                         'resonance_data': latest_profile.get('resonance_data', {})
                     },
-                    count=7
+                    count=7,
+                    student_id=student_id
                 )
                 
                 # Store the regenerated recommendations
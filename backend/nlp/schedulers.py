@@ -0,0 +1,208 @@
+"""
+SRS Schedulers
+Interchangeable scheduling algorithms for the /api/srs routes
+
+Every scheduler turns a card's SRSData and a 0-5 review quality into the
+card's next SRSData, and rates how well the word is mastered. Classes pick
+their scheduler (classes.scheduler); students outside a class use
+SRS_SCHEDULER.
+"""
+import math
+import os
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Dict, Optional, Sequence, Tuple
+import logging
+
+from .srs import SM2Algorithm, SRSData
+
+logger = logging.getLogger(__name__)
+
+# Scheduler settings (override via environment)
+SRS_SCHEDULER = os.getenv("SRS_SCHEDULER", "sm2")  # Used when a student's class doesn't choose one
+FSRS_WEIGHTS = os.getenv("FSRS_WEIGHTS")  # 17 comma-separated fitted parameters (defaults below if unset)
+FSRS_DESIRED_RETENTION = float(os.getenv("FSRS_DESIRED_RETENTION", "0.9"))  # Recall probability reviews are scheduled at
+
+# FSRS-4.5 default parameters (fitted by the FSRS project on a large public review dataset)
+FSRS_DEFAULT_WEIGHTS: Tuple[float, ...] = (
+    0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+    0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755
+)
+FSRS_DECAY = -0.5
+FSRS_FACTOR = 0.9 ** (1 / FSRS_DECAY) - 1  # So that retrievability is 90% after `stability` days
+FSRS_MAX_INTERVAL = 36500
+MASTERY_HORIZON_DAYS = 30  # FSRS mastery = predicted recall this many days after the last review
+
+class Scheduler(ABC):
+    """Interface of an SRS scheduling algorithm"""
+    name = ""
+
+    @abstractmethod
+    def next_review(self, current_data: SRSData, quality: int, review_date: Optional[date] = None) -> SRSData:
+        """Schedule a card after a review with quality 0-5 (review_date defaults to today)"""
+
+    @abstractmethod
+    def mastery_level(self, srs_data: SRSData) -> float:
+        """Mastery level (0-1) of a card"""
+
+class SM2Scheduler(Scheduler):
+    """SuperMemo 2 (see SM2Algorithm)"""
+    name = "sm2"
+
+    def next_review(self, current_data: SRSData, quality: int, review_date: Optional[date] = None) -> SRSData:
+        return SM2Algorithm.calculate_next_review(current_data, quality, review_date=review_date)
+
+    def mastery_level(self, srs_data: SRSData) -> float:
+        return SM2Algorithm.calculate_mastery_level(srs_data)
+
+def _day(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+def _clamp_difficulty(difficulty: float) -> float:
+    return min(10.0, max(1.0, difficulty))
+
+class FSRSScheduler(Scheduler):
+    """
+    FSRS-style memory model (Free Spaced Repetition Scheduler, v4.5 formulas)
+
+    Each card has a stability (days until recall drops to 90%) and a
+    difficulty (1-10). Reviews update both from the grade and from how much
+    the card had been forgotten, and the next review is set for when
+    predicted recall falls to the desired retention.
+
+    Qualities map to FSRS grades: 0-2 again, 3 hard, 4 good, 5 easy.
+    Cards last scheduled by SM-2 start from their SM-2 interval and ease.
+    ease_factor is carried over unchanged, so a class can switch back.
+    """
+    name = "fsrs"
+
+    def __init__(
+        self,
+        weights: Optional[Sequence[float]] = None,
+        desired_retention: float = 0.9,
+        max_interval: int = FSRS_MAX_INTERVAL
+    ):
+        self.weights = tuple(weights) if weights is not None else FSRS_DEFAULT_WEIGHTS
+        if len(self.weights) != len(FSRS_DEFAULT_WEIGHTS):
+            raise ValueError(f"FSRS needs {len(FSRS_DEFAULT_WEIGHTS)} weights, got {len(self.weights)}")
+        self.desired_retention = desired_retention
+        self.max_interval = max_interval
+
+    @staticmethod
+    def grade(quality: int) -> int:
+        """0-5 quality -> FSRS grade (1 again, 2 hard, 3 good, 4 easy)"""
+        quality = max(0, min(5, quality))
+        return 1 if quality < 3 else quality - 1
+
+    @staticmethod
+    def retrievability(elapsed_days: float, stability: float) -> float:
+        """Probability of recall `elapsed_days` after the last review"""
+        return (1 + FSRS_FACTOR * elapsed_days / stability) ** FSRS_DECAY
+
+    def initial_difficulty(self, grade: int) -> float:
+        return _clamp_difficulty(self.weights[4] - (grade - 3) * self.weights[5])
+
+    def next_memory_state(
+        self,
+        stability: Optional[float],
+        difficulty: Optional[float],
+        elapsed_days: float,
+        grade: int
+    ) -> Tuple[float, float]:
+        """(stability, difficulty) after a review (stability None = first review)"""
+        w = self.weights
+        if stability is None:
+            return w[grade - 1], self.initial_difficulty(grade)
+
+        recall = self.retrievability(elapsed_days, stability)
+        if grade == 1:
+            new_stability = min(
+                stability,
+                w[11] * difficulty ** -w[12] * ((stability + 1) ** w[13] - 1) * math.exp(w[14] * (1 - recall))
+            )
+        else:
+            hard_penalty = w[15] if grade == 2 else 1.0
+            easy_bonus = w[16] if grade == 4 else 1.0
+            new_stability = stability * (
+                math.exp(w[8]) * (11 - difficulty) * stability ** -w[9]
+                * (math.exp(w[10] * (1 - recall)) - 1) * hard_penalty * easy_bonus + 1
+            )
+
+        # Difficulty moves with the grade and reverts slightly toward its default
+        new_difficulty = difficulty - w[6] * (grade - 3)
+        new_difficulty = w[7] * self.initial_difficulty(3) + (1 - w[7]) * new_difficulty
+        return new_stability, _clamp_difficulty(new_difficulty)
+
+    def next_interval(self, stability: float) -> int:
+        """Days until predicted recall falls to the desired retention"""
+        interval = stability / FSRS_FACTOR * (self.desired_retention ** (1 / FSRS_DECAY) - 1)
+        return min(self.max_interval, max(1, round(interval)))
+
+    def memory_state(self, srs_data: SRSData) -> Tuple[Optional[float], Optional[float]]:
+        """A card's (stability, difficulty), derived from its SM-2 state if it has none"""
+        if srs_data.stability is not None:
+            return srs_data.stability, srs_data.difficulty if srs_data.difficulty is not None else self.initial_difficulty(3)
+        if srs_data.repetitions == 0 and srs_data.last_reviewed is None:
+            return None, None
+        # An SM-2 interval is roughly where recall was expected to still be high;
+        # lower ease means a harder card (2.5 = default difficulty, 1.3 = hardest)
+        stability = float(max(1, srs_data.interval))
+        difficulty = _clamp_difficulty(self.initial_difficulty(3) + (2.5 - srs_data.ease_factor) * 4)
+        return stability, difficulty
+
+    def next_review(self, current_data: SRSData, quality: int, review_date: Optional[date] = None) -> SRSData:
+        if review_date is None:
+            review_date = date.today()
+
+        grade = self.grade(quality)
+        stability, difficulty = self.memory_state(current_data)
+        elapsed_days = 0
+        if current_data.last_reviewed is not None:
+            elapsed_days = max(0, (review_date - _day(current_data.last_reviewed)).days)
+
+        stability, difficulty = self.next_memory_state(stability, difficulty, elapsed_days, grade)
+        interval = self.next_interval(stability)
+
+        return SRSData(
+            ease_factor=current_data.ease_factor,
+            interval=interval,
+            repetitions=current_data.repetitions + 1 if grade > 1 else 0,
+            due_date=date.fromordinal(review_date.toordinal() + interval),
+            last_reviewed=review_date,
+            stability=stability,
+            difficulty=difficulty
+        )
+
+    def mastery_level(self, srs_data: SRSData) -> float:
+        if srs_data.repetitions == 0:
+            return 0.0
+        stability, _ = self.memory_state(srs_data)
+        return self.retrievability(MASTERY_HORIZON_DAYS, stability)
+
+SCHEDULERS = {
+    SM2Scheduler.name: SM2Scheduler,
+    FSRSScheduler.name: FSRSScheduler
+}
+
+def _configured_fsrs() -> FSRSScheduler:
+    """FSRS scheduler with the fitted weights from FSRS_WEIGHTS, if set"""
+    if FSRS_WEIGHTS:
+        try:
+            weights = [float(weight) for weight in FSRS_WEIGHTS.split(",")]
+            return FSRSScheduler(weights, desired_retention=FSRS_DESIRED_RETENTION)
+        except ValueError as e:
+            logger.warning(f"Ignoring FSRS_WEIGHTS ({e}), using default weights")
+    return FSRSScheduler(desired_retention=FSRS_DESIRED_RETENTION)
+
+# Scheduler instances (created on first use)
+_schedulers: Dict[str, Scheduler] = {}
+
+def get_scheduler(name: Optional[str] = None) -> Scheduler:
+    """Get the named scheduler, falling back to SRS_SCHEDULER (then SM-2) if unset or unknown"""
+    if name not in SCHEDULERS:
+        if name:
+            logger.warning(f"Unknown SRS scheduler '{name}'. Options: {', '.join(SCHEDULERS)}")
+        name = SRS_SCHEDULER if SRS_SCHEDULER in SCHEDULERS else SM2Scheduler.name
+    if name not in _schedulers:
+        _schedulers[name] = _configured_fsrs() if name == FSRSScheduler.name else SCHEDULERS[name]()
+    return _schedulers[name]
@@ -2,25 +2,63 @@
 Spaced Repetition System (SRS)
 Implements SM-2 algorithm for vocabulary retention
 """
+import asyncio
+import time
 from datetime import date, timedelta, datetime
 from typing import Dict, Any, Optional, List
 import logging
-from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
-@dataclass
 class SRSData:
     """SRS data structure for a word"""
-    ease_factor: float = 2.5
-    interval: int = 1  # days
-    repetitions: int = 0
-    due_date: date = None
-    last_reviewed: Optional[date] = None
+    __slots__ = ('ease_factor', 'interval', 'repetitions', '_due_date', 'last_reviewed', 'stability', 'difficulty')
     
-    def __post_init__(self):
-        if self.due_date is None:
-            self.due_date = date.today()
+    def __init__(
+        self,
+        ease_factor: float = 2.5,
+        interval: int = 1,  # days
+        repetitions: int = 0,
+        due_date: Optional[date] = None,
+        last_reviewed: Optional[date] = None,
+        stability: Optional[float] = None,  # Memory model state (FSRS scheduler only)
+        difficulty: Optional[float] = None
+    ):
+        self.ease_factor = ease_factor
+        self.interval = interval
+        self.repetitions = repetitions
+        self._due_date = due_date  # Defaults to today, resolved on first access
+        self.last_reviewed = last_reviewed
+        self.stability = stability
+        self.difficulty = difficulty
+    
+    @property
+    def due_date(self) -> date:
+        if self._due_date is None:
+            self._due_date = date.today()
+        return self._due_date
+    
+    @due_date.setter
+    def due_date(self, value: Optional[date]):
+        self._due_date = value
+    
+    def _fields(self) -> tuple:
+        return (
+            self.ease_factor, self.interval, self.repetitions, self.due_date, self.last_reviewed,
+            self.stability, self.difficulty
+        )
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    def __repr__(self) -> str:
+        return (
+            f"SRSData(ease_factor={self.ease_factor!r}, interval={self.interval!r}, repetitions={self.repetitions!r}, "
+            f"due_date={self.due_date!r}, last_reviewed={self.last_reviewed!r}, "
+            f"stability={self.stability!r}, difficulty={self.difficulty!r})"
+        )
 
 class SM2Algorithm:
     """
@@ -31,7 +69,8 @@ class SM2Algorithm:
     @staticmethod
     def calculate_next_review(
         current_data: SRSData,
-        quality: int  # 0-5 scale (0=complete blackout, 5=perfect response)
+        quality: int,  # 0-5 scale (0=complete blackout, 5=perfect response)
+        review_date: Optional[date] = None
     ) -> SRSData:
         """
         Calculate next review date and update SRS parameters
@@ -47,10 +86,14 @@ class SM2Algorithm:
         Args:
             current_data: Current SRS data for the word
             quality: Quality of recall (0-5)
+            review_date: Day of the review (defaults to today)
             
         Returns:
             Updated SRS data
         """
+        if review_date is None:
+            review_date = date.today()
+        
         # Clamp quality to valid range
         quality = max(0, min(5, quality))
         
@@ -75,14 +118,14 @@ class SM2Algorithm:
             new_repetitions = current_data.repetitions + 1
         
         # Calculate due date
-        new_due_date = date.today() + timedelta(days=new_interval)
+        new_due_date = review_date + timedelta(days=new_interval)
         
         return SRSData(
             ease_factor=new_ease_factor,
             interval=new_interval,
             repetitions=new_repetitions,
             due_date=new_due_date,
-            last_reviewed=date.today()
+            last_reviewed=review_date
         )
     
     @staticmethod
@@ -114,22 +157,18 @@ class SM2Algorithm:
             else:
                 words_with_srs.append(record)
         
-        # Get words due for review
-        due_reviews = [
-            record for record in words_with_srs
-            if record.get('due_date') and 
-            date.fromisoformat(str(record['due_date'])) <= today
-        ]
-        
-        # Sort by due date (most overdue first)
-        due_reviews.sort(key=lambda x: x.get('due_date', date.max))
+        # Get words due for review, parsing each due date once
+        due_reviews = []
+        for record in words_with_srs:
+            if record.get('due_date'):
+                due_date = date.fromisoformat(str(record['due_date']))
+                if due_date <= today:
+                    due_reviews.append((due_date, record))
         
-        # Get overdue words first, then upcoming
-        overdue = [r for r in due_reviews if date.fromisoformat(str(r['due_date'])) < today]
-        upcoming = [r for r in due_reviews if date.fromisoformat(str(r['due_date'])) == today]
+        # Sort by due date (most overdue first, then due today)
+        due_reviews.sort(key=lambda item: item[0])
         
-        # Combine: overdue first, then upcoming
-        review_words = (overdue + upcoming)[:review_count]
+        review_words = [record for _, record in due_reviews[:review_count]]
         
         # Get new words
         new_words_selected = new_words[:new_word_count]
@@ -157,9 +196,12 @@ class SM2Algorithm:
         return min(1.0, repetition_score + ease_boost)
 
 # FastAPI router
+import numpy as np
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from .srs_batch import forecast_due_counts, to_ordinal_days
+
 router = APIRouter()
 
 class SRSUpdateRequest(BaseModel):
@@ -173,6 +215,39 @@ class SRSUpdateResponse(BaseModel):
     repetitions: int
     due_date: str
     mastery_level: float
+    scheduler: str = "sm2"
+
+class ReviewResult(BaseModel):
+    word_id: str
+    quality: int  # 0-5
+
+class SRSBatchReviewRequest(BaseModel):
+    student_id: str
+    reviews: List[ReviewResult]  # In the order the cards were reviewed
+
+class CardSchedule(SRSUpdateResponse):
+    word_id: str
+
+class SRSBatchReviewResponse(BaseModel):
+    cards: List[CardSchedule]
+
+class DueForecastDay(BaseModel):
+    date: str
+    due: int
+
+class ClassForecastResponse(BaseModel):
+    class_id: str
+    students: int
+    cards: int
+    days: List[DueForecastDay]
+
+class ClassSchedulerRequest(BaseModel):
+    teacher_id: str
+    scheduler: str  # See nlp/schedulers.py SCHEDULERS
+
+class ClassSchedulerResponse(BaseModel):
+    class_id: str
+    scheduler: str
 
 class DueWordsRequest(BaseModel):
     student_id: str
@@ -183,33 +258,52 @@ class DueWordsResponse(BaseModel):
     new_words: List[Dict[str, Any]]
     review_words: List[Dict[str, Any]]
 
+class PrecomputeRequest(BaseModel):
+    student_ids: Optional[List[str]] = None  # Default: students who reviewed recently
+
+class PrecomputeResponse(BaseModel):
+    students: int
+    built: int
+    seconds: float
+
+def srs_data_from_record(record: Optional[Dict[str, Any]]) -> SRSData:
+    """Convert an srs_progress record to SRSData (fresh data if there is no record)"""
+    if not record:
+        return SRSData()
+    return SRSData(
+        ease_factor=record.get('ease_factor', 2.5),
+        interval=record.get('interval', 1),
+        repetitions=record.get('repetitions', 0),
+        due_date=date.fromisoformat(record.get('due_date', date.today().isoformat())),
+        last_reviewed=datetime.fromisoformat(record['last_reviewed']) if record.get('last_reviewed') else None,
+        stability=record.get('stability'),
+        difficulty=record.get('difficulty')
+    )
+
 @router.post("/update", response_model=SRSUpdateResponse)
 async def update_srs(request: SRSUpdateRequest):
     """Update SRS data after a word review"""
     try:
-        from db import srs as db_srs
-        
-        # Fetch current SRS data from database
-        existing = await db_srs.get_srs_progress(request.student_id, request.word_id)
-        
-        if existing:
-            # Convert database record to SRSData
-            current_data = SRSData(
-                ease_factor=existing.get('ease_factor', 2.5),
-                interval=existing.get('interval', 1),
-                repetitions=existing.get('repetitions', 0),
-                due_date=date.fromisoformat(existing.get('due_date', date.today().isoformat())),
-                last_reviewed=datetime.fromisoformat(existing['last_reviewed']) if existing.get('last_reviewed') else None
-            )
-        else:
-            # Create new SRS data
-            current_data = SRSData()
+        from db import srs as db_srs, classes as db_classes
+        from .schedulers import get_scheduler
+        from .srs_sessions import invalidate_student_session
+        from .mastery_cache import record_mastery
+        from db.dashboard_cache import invalidate_student_dashboard
+        
+        # Fetch current SRS data and the scheduler the student's class uses
+        existing, scheduler_name = await asyncio.gather(
+            db_srs.get_srs_progress(request.student_id, request.word_id),
+            db_classes.get_student_scheduler(request.student_id)
+        )
+        scheduler = get_scheduler(scheduler_name)
+        
+        current_data = srs_data_from_record(existing)
         
         # Calculate next review
-        updated_data = SM2Algorithm.calculate_next_review(current_data, request.quality)
+        updated_data = scheduler.next_review(current_data, request.quality)
         
         # Calculate mastery
-        mastery = SM2Algorithm.calculate_mastery_level(updated_data)
+        mastery = scheduler.mastery_level(updated_data)
         
         # Save to database
         await db_srs.upsert_srs_progress(
@@ -219,85 +313,199 @@ async def update_srs(request: SRSUpdateRequest):
             interval=updated_data.interval,
             repetitions=updated_data.repetitions,
             due_date=updated_data.due_date,
-            last_reviewed=updated_data.last_reviewed
+            last_reviewed=updated_data.last_reviewed,
+            stability=updated_data.stability,
+            difficulty=updated_data.difficulty
         )
+        invalidate_student_session(request.student_id)
+        invalidate_student_dashboard(request.student_id)
+        record_mastery(request.student_id, {request.word_id: mastery})
         
         return SRSUpdateResponse(
             ease_factor=updated_data.ease_factor,
             interval=updated_data.interval,
             repetitions=updated_data.repetitions,
             due_date=updated_data.due_date.isoformat(),
-            mastery_level=mastery
+            mastery_level=mastery,
+            scheduler=scheduler.name
         )
     except Exception as e:
         logger.error(f"Error updating SRS: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/review-batch", response_model=SRSBatchReviewResponse)
+async def review_batch(request: SRSBatchReviewRequest):
+    """
+    Update SRS data for a whole session of reviews
+    Reads all current progress in one query and writes every new schedule
+    in one upsert; a word reviewed twice is scheduled from its latest review
+    """
+    try:
+        from db import srs as db_srs, classes as db_classes
+        from .schedulers import get_scheduler
+        from .srs_sessions import invalidate_student_session
+        from .mastery_cache import record_mastery
+        from db.dashboard_cache import invalidate_student_dashboard
+        
+        word_ids = [review.word_id for review in request.reviews]
+        existing, scheduler_name = await asyncio.gather(
+            db_srs.get_srs_progress_many(request.student_id, word_ids),
+            db_classes.get_student_scheduler(request.student_id)
+        )
+        scheduler = get_scheduler(scheduler_name)
+        
+        # Schedule in review order so repeated cards build on their previous result
+        schedules: Dict[str, SRSData] = {}
+        for review in request.reviews:
+            current_data = schedules.get(review.word_id) or srs_data_from_record(existing.get(review.word_id))
+            schedules[review.word_id] = scheduler.next_review(current_data, review.quality)
+        
+        await db_srs.upsert_srs_progress_many(request.student_id, [
+            {
+                'word_id': word_id,
+                'ease_factor': data.ease_factor,
+                'interval': data.interval,
+                'repetitions': data.repetitions,
+                'due_date': data.due_date,
+                'last_reviewed': data.last_reviewed,
+                'stability': data.stability,
+                'difficulty': data.difficulty
+            }
+            for word_id, data in schedules.items()
+        ])
+        mastery = {word_id: scheduler.mastery_level(data) for word_id, data in schedules.items()}
+        invalidate_student_session(request.student_id)
+        invalidate_student_dashboard(request.student_id)
+        record_mastery(request.student_id, mastery)
+        
+        return SRSBatchReviewResponse(cards=[
+            CardSchedule(
+                word_id=word_id,
+                ease_factor=data.ease_factor,
+                interval=data.interval,
+                repetitions=data.repetitions,
+                due_date=data.due_date.isoformat(),
+                mastery_level=mastery[word_id],
+                scheduler=scheduler.name
+            )
+            for word_id, data in schedules.items()
+        ])
+    except Exception as e:
+        logger.error(f"Error updating SRS batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/due-words", response_model=DueWordsResponse)
 async def get_due_words(request: DueWordsRequest):
-    """Get words due for review and new words for session"""
+    """
+    Get words due for review and new words for session
+    Served from the precomputed session when there is one for today
+    """
     try:
-        from db import srs as db_srs, words as db_words
+        from .srs_sessions import get_session_store
         
-        # Fetch SRS records from database with word data
-        srs_records = await db_srs.get_due_words_for_student(request.student_id)
-        
-        # Format records for SM2 algorithm
-        formatted_records = []
-        for record in srs_records:
-            word_data = record.get('words', {})
-            if word_data:
-                formatted_records.append({
-                    'id': record['word_id'],
-                    'word': word_data.get('word', ''),
-                    'definition': word_data.get('definition', ''),
-                    'example': word_data.get('example'),
-                    'relic_type': word_data.get('relic_type', 'echo'),
-                    'difficulty_score': word_data.get('difficulty_score', 50),
-                    'repetitions': record.get('repetitions', 0),
-                    'due_date': record.get('due_date'),
-                    'last_reviewed': record.get('last_reviewed')
-                })
-        
-        # Get due words using SM2 algorithm
-        due_words = SM2Algorithm.get_due_words(
-            formatted_records,
-            new_word_count=request.new_count,
+        session = await get_session_store().get(
+            request.student_id,
+            new_count=request.new_count,
             review_count=request.review_count
         )
         
-        # If we don't have enough words, get some from the words table
-        if len(due_words['new']) < request.new_count:
-            # Get words that student hasn't practiced yet
-            practiced_word_ids = [r['word_id'] for r in srs_records]
-            available_words = await db_words.search_words(
-                min_difficulty=30,
-                max_difficulty=70,
-                limit=request.new_count * 2
-            )
-            
-            # Filter out already practiced words
-            new_words = [
-                w for w in available_words 
-                if w['id'] not in practiced_word_ids
-            ][:request.new_count - len(due_words['new'])]
-            
-            # Add to new words list
-            for word in new_words:
-                due_words['new'].append({
-                    'id': word['id'],
-                    'word': word['word'],
-                    'definition': word['definition'],
-                    'example': word.get('example'),
-                    'relic_type': word.get('relic_type', 'echo'),
-                    'difficulty_score': word.get('difficulty_score', 50)
-                })
-        
         return DueWordsResponse(
-            new_words=due_words['new'],
-            review_words=due_words['review']
+            new_words=session['new'],
+            review_words=session['review']
         )
     except Exception as e:
         logger.error(f"Error getting due words: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+MAX_FORECAST_DAYS = 365
+
+@router.get("/class/{class_id}/forecast", response_model=ClassForecastResponse)
+async def forecast_class_reviews(class_id: str, days: int = 30):
+    """
+    Forecast how many reviews a class will have due on each of the next `days` days
+    Assumes every card is reviewed on its due day with a good (4) recall
+    """
+    try:
+        if not 1 <= days <= MAX_FORECAST_DAYS:
+            raise HTTPException(status_code=400, detail=f"days must be between 1 and {MAX_FORECAST_DAYS}")
+        
+        from db import srs as db_srs, classes as db_classes
+        
+        enrollments = await db_classes.get_class_students(class_id)
+        student_ids = [enrollment['student_id'] for enrollment in enrollments]
+        schedules = await db_srs.get_schedules_for_students(student_ids)
+        
+        today = date.today()
+        counts = forecast_due_counts(
+            ease_factor=np.array([s.get('ease_factor', 2.5) for s in schedules], dtype=np.float64),
+            interval=np.array([s.get('interval', 1) for s in schedules], dtype=np.int64),
+            repetitions=np.array([s.get('repetitions', 0) for s in schedules], dtype=np.int64),
+            due_day=to_ordinal_days(s.get('due_date') or today for s in schedules),
+            start_day=today.toordinal(),
+            days=days
+        )
+        
+        return ClassForecastResponse(
+            class_id=class_id,
+            students=len(student_ids),
+            cards=len(schedules),
+            days=[
+                DueForecastDay(date=(today + timedelta(days=offset)).isoformat(), due=int(count))
+                for offset, count in enumerate(counts)
+            ]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error forecasting reviews for class {class_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/class/{class_id}/scheduler", response_model=ClassSchedulerResponse)
+async def set_class_scheduler(class_id: str, request: ClassSchedulerRequest):
+    """
+    Choose the SRS scheduler for a class (e.g. 'sm2' or 'fsrs')
+    Cards switch on their next review; FSRS starts SM-2 cards from their current interval
+    """
+    try:
+        from db import classes as db_classes
+        from .schedulers import SCHEDULERS
+        
+        if request.scheduler not in SCHEDULERS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown scheduler '{request.scheduler}'. Options: {', '.join(SCHEDULERS)}"
+            )
+        
+        updated = await db_classes.set_class_scheduler(class_id, request.teacher_id, request.scheduler)
+        if not updated:
+            raise HTTPException(status_code=404, detail="Class not found or not owned by teacher")
+        
+        return ClassSchedulerResponse(class_id=class_id, scheduler=request.scheduler)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error setting scheduler for class {class_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/precompute", response_model=PrecomputeResponse)
+async def precompute_sessions(request: PrecomputeRequest):
+    """
+    Build today's sessions ahead of time (also runs daily at SRS_PRECOMPUTE_AT)
+    Useful from a scheduler/cron when the app runs several instances
+    """
+    try:
+        from .srs_sessions import get_session_store, precompute_active_sessions
+        
+        if request.student_ids is None:
+            return PrecomputeResponse(**await precompute_active_sessions())
+        
+        started = time.perf_counter()
+        built = await get_session_store().precompute(request.student_ids)
+        return PrecomputeResponse(
+            students=len(set(request.student_ids)),
+            built=built,
+            seconds=time.perf_counter() - started
+        )
+    except Exception as e:
+        logger.error(f"Error precomputing sessions: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,203 @@
+"""
+Batched SM-2 Scheduler
+Columnar (numpy) version of SM2Algorithm.calculate_next_review for whole-class
+and whole-history recomputation.
+
+Days are integer ordinals (date.toordinal()) so due dates are plain int64
+arithmetic. Every step performs the same float64 operations in the same order
+as the scalar implementation, so results match it exactly.
+"""
+from datetime import date
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+MIN_EASE_FACTOR = 1.3
+DEFAULT_EASE_FACTOR = 2.5
+
+SRSColumns = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def to_ordinal_days(dates: Iterable) -> np.ndarray:
+    """date objects or ISO strings -> int64 day ordinals"""
+    return np.fromiter(
+        (d.toordinal() if isinstance(d, date) else date.fromisoformat(str(d)[:10]).toordinal() for d in dates),
+        dtype=np.int64
+    )
+
+
+def from_ordinal_day(day: int) -> date:
+    return date.fromordinal(int(day))
+
+
+def next_review_batch(
+    ease_factor: np.ndarray,
+    interval: np.ndarray,
+    repetitions: np.ndarray,
+    quality: np.ndarray,
+    review_day
+) -> SRSColumns:
+    """
+    Apply one SM-2 review to every card
+
+    Args:
+        ease_factor: Current ease factors (float64)
+        interval: Current intervals in days
+        repetitions: Current repetition counts
+        quality: Review qualities (0-5, clamped like the scalar version)
+        review_day: Day ordinal of each review (array, or one int for all)
+
+    Returns:
+        (ease_factor, interval, repetitions, due_day) arrays
+    """
+    ease_factor = np.asarray(ease_factor, dtype=np.float64)
+    interval = np.asarray(interval, dtype=np.int64)
+    repetitions = np.asarray(repetitions, dtype=np.int64)
+    quality = np.clip(np.asarray(quality, dtype=np.int64), 0, 5)
+
+    passed = quality >= 3
+    lapse = 5 - quality
+    updated_ease = np.maximum(MIN_EASE_FACTOR, ease_factor + (0.1 - lapse * (0.08 + lapse * 0.02)))
+    # Failed recall keeps the ease factor
+    new_ease = np.where(passed, updated_ease, ease_factor)
+
+    grown = (interval * updated_ease).astype(np.int64)  # Truncates like int()
+    new_interval = np.where(repetitions == 0, 1, np.where(repetitions == 1, 6, grown))
+    new_interval = np.where(passed, new_interval, 1)
+
+    new_repetitions = np.where(passed, repetitions + 1, 0)
+    due_day = np.asarray(review_day, dtype=np.int64) + new_interval
+
+    return new_ease, new_interval, new_repetitions, due_day
+
+
+def replay_review_log(
+    card_ids: np.ndarray,
+    quality: np.ndarray,
+    review_day: np.ndarray,
+    initial: Optional[Dict[str, np.ndarray]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Recompute final SM-2 state of every card from its review history
+
+    Reviews of one card depend on each other, but reviews of different cards
+    do not: events are grouped by how many earlier reviews their card has, and
+    each group is applied to all of its cards in one vectorized step. The
+    number of steps is the longest history of any single card.
+
+    Args:
+        card_ids: Integer card index per event (0..n_cards-1)
+        quality: Quality per event
+        review_day: Day ordinal per event
+        initial: Optional starting columns (ease_factor, interval, repetitions,
+                 due_day) indexed by card; new cards start from SRSData defaults
+
+    Returns:
+        Dict of per-card columns: ease_factor, interval, repetitions, due_day,
+        last_reviewed_day (-1 for cards without events) and reviews
+    """
+    card_ids = np.asarray(card_ids, dtype=np.int64)
+    quality = np.asarray(quality, dtype=np.int64)
+    review_day = np.asarray(review_day, dtype=np.int64)
+    n_cards = int(card_ids.max()) + 1 if len(card_ids) else 0
+    if initial is not None:
+        n_cards = max(n_cards, len(initial['ease_factor']))
+
+    if initial is None:
+        state = {
+            'ease_factor': np.full(n_cards, DEFAULT_EASE_FACTOR),
+            'interval': np.ones(n_cards, dtype=np.int64),
+            'repetitions': np.zeros(n_cards, dtype=np.int64),
+            'due_day': np.full(n_cards, -1, dtype=np.int64)
+        }
+    else:
+        state = {name: np.array(initial[name], copy=True) for name in ('ease_factor', 'interval', 'repetitions', 'due_day')}
+    state['last_reviewed_day'] = np.full(n_cards, -1, dtype=np.int64)
+
+    # Order events by card, then chronologically (stable, so same-day reviews keep log order)
+    order = np.lexsort((review_day, card_ids))
+    card_ids, quality, review_day = card_ids[order], quality[order], review_day[order]
+
+    # Rank of each event within its card's history, then events grouped by rank
+    counts = np.bincount(card_ids, minlength=n_cards)
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(len(card_ids)) - starts[card_ids]
+    by_rank = np.argsort(rank, kind='stable')
+    card_ids, quality, review_day = card_ids[by_rank], quality[by_rank], review_day[by_rank]
+    group_ends = np.cumsum(np.bincount(rank))
+
+    group_start = 0
+    for group_end in group_ends:
+        cards = card_ids[group_start:group_end]
+        days = review_day[group_start:group_end]
+        ease, interval, repetitions, due = next_review_batch(
+            state['ease_factor'][cards],
+            state['interval'][cards],
+            state['repetitions'][cards],
+            quality[group_start:group_end],
+            days
+        )
+        state['ease_factor'][cards] = ease
+        state['interval'][cards] = interval
+        state['repetitions'][cards] = repetitions
+        state['due_day'][cards] = due
+        state['last_reviewed_day'][cards] = days
+        group_start = group_end
+
+    state['reviews'] = counts
+    return state
+
+
+def forecast_due_counts(
+    ease_factor: np.ndarray,
+    interval: np.ndarray,
+    repetitions: np.ndarray,
+    due_day: np.ndarray,
+    start_day: int,
+    days: int = 30,
+    assumed_quality: int = 4
+) -> np.ndarray:
+    """
+    Number of reviews due on each of the next `days` days
+
+    Overdue cards count toward the first day. Each card is assumed to be
+    reviewed on the day it comes due with `assumed_quality`, so cards with
+    short intervals come back (and are counted again) within the window.
+
+    Returns:
+        int64 array of length `days`
+    """
+    ease_factor = np.array(ease_factor, dtype=np.float64)
+    interval = np.array(interval, dtype=np.int64)
+    repetitions = np.array(repetitions, dtype=np.int64)
+    due_day = np.maximum(np.asarray(due_day, dtype=np.int64), start_day)
+
+    counts = np.zeros(days, dtype=np.int64)
+    for offset in range(days):
+        day = start_day + offset
+        due = np.flatnonzero(due_day == day)
+        counts[offset] = len(due)
+        if not len(due):
+            continue
+        ease_factor[due], interval[due], repetitions[due], due_day[due] = next_review_batch(
+            ease_factor[due], interval[due], repetitions[due], assumed_quality, day
+        )
+    return counts
+
+
+def replay_review_log_scalar(
+    card_ids: Sequence[int],
+    quality: Sequence[int],
+    review_day: Sequence[int]
+) -> Dict[int, "SRSData"]:
+    """Reference replay using SM2Algorithm one event at a time (for verification)"""
+    from .srs import SM2Algorithm, SRSData
+
+    # Same order as the batched replay: by card, then day, then log position
+    events = sorted(zip(card_ids, review_day, range(len(card_ids)), quality))
+    states = {}
+    for card, day, _, event_quality in events:
+        review_date = from_ordinal_day(day)
+        current = states.get(card) or SRSData(due_date=review_date)
+        states[card] = SM2Algorithm.calculate_next_review(current, int(event_quality), review_date=review_date)
+    return states
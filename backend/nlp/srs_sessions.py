@@ -0,0 +1,298 @@
+"""
+SRS Session Store
+Precomputed practice sessions (due reviews + new words) per student
+
+Building a session takes several queries (due reviews, unreviewed words and
+a top-up from the words table). Sessions are built ahead of time by a daily
+job for recently active students, so session start is a dictionary lookup.
+A session is only valid on the day it was built, and review writes
+invalidate the student's session.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Store settings (override via environment)
+SRS_SESSION_CACHE_MAX = int(os.getenv("SRS_SESSION_CACHE_MAX", "20000"))  # Sessions kept in memory
+SRS_PRECOMPUTE_AT = os.getenv("SRS_PRECOMPUTE_AT", "05:30")  # Daily precompute time (HH:MM, server time); empty disables
+SRS_PRECOMPUTE_ACTIVE_DAYS = int(os.getenv("SRS_PRECOMPUTE_ACTIVE_DAYS", "14"))  # Students who reviewed within this many days
+SRS_PRECOMPUTE_CONCURRENCY = int(os.getenv("SRS_PRECOMPUTE_CONCURRENCY", "8"))  # Sessions built at once
+
+DEFAULT_NEW_COUNT = 4
+DEFAULT_REVIEW_COUNT = 8
+
+Session = Dict[str, List[Dict[str, Any]]]
+
+def _format_srs_record(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Flatten an SRS record with joined word data into a session word"""
+    word_data = record.get('words', {})
+    if not word_data:
+        return None
+    return {
+        'id': record['word_id'],
+        'word': word_data.get('word', ''),
+        'definition': word_data.get('definition', ''),
+        'example': word_data.get('example'),
+        'relic_type': word_data.get('relic_type', 'echo'),
+        'difficulty_score': word_data.get('difficulty_score', 50),
+        'repetitions': record.get('repetitions', 0),
+        'due_date': record.get('due_date'),
+        'last_reviewed': record.get('last_reviewed')
+    }
+
+async def build_session(
+    student_id: str,
+    new_count: int = DEFAULT_NEW_COUNT,
+    review_count: int = DEFAULT_REVIEW_COUNT,
+    today: Optional[date] = None
+) -> Session:
+    """
+    Build a student's session from the database
+
+    Returns:
+        {'new': [...], 'review': [...]} session words
+    """
+    from db import srs as db_srs, words as db_words
+
+    if today is None:
+        today = date.today()
+
+    # Due reviews (most overdue first) and unreviewed words are separate
+    # limited queries, so only the words shown this session are fetched
+    review_records, new_records = await asyncio.gather(
+        db_srs.get_due_reviews(student_id, today=today, limit=review_count),
+        db_srs.get_unreviewed_words(student_id, limit=new_count)
+    )
+
+    session = {
+        'new': [word for word in map(_format_srs_record, new_records) if word],
+        'review': [word for word in map(_format_srs_record, review_records) if word]
+    }
+
+    # If we don't have enough words, get some from the words table
+    if len(session['new']) < new_count:
+        available_words = await db_words.search_words(
+            min_difficulty=30,
+            max_difficulty=70,
+            limit=new_count * 2
+        )
+
+        # Filter out words the student has already practiced
+        practiced_word_ids = await db_srs.get_practiced_word_ids(
+            student_id,
+            [w['id'] for w in available_words]
+        )
+        new_words = [
+            w for w in available_words
+            if w['id'] not in practiced_word_ids
+        ][:new_count - len(session['new'])]
+
+        for word in new_words:
+            session['new'].append({
+                'id': word['id'],
+                'word': word['word'],
+                'definition': word['definition'],
+                'example': word.get('example'),
+                'relic_type': word.get('relic_type', 'echo'),
+                'difficulty_score': word.get('difficulty_score', 50)
+            })
+
+    return session
+
+class _StoredSession(NamedTuple):
+    day: date
+    new_count: int
+    review_count: int
+    session: Session
+
+class SessionStore:
+    """LRU store of each student's next session, valid for the day it was built"""
+
+    def __init__(self, max_sessions: int = SRS_SESSION_CACHE_MAX):
+        self.max_sessions = max_sessions
+        self.hits = 0
+        self.misses = 0
+        self._sessions: "OrderedDict[str, _StoredSession]" = OrderedDict()
+        self._building: Dict[str, int] = {}  # student_id -> builds in progress
+        self._stale: Set[str] = set()  # Students invalidated while a build was in progress
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def peek(self, student_id: str, new_count: int, review_count: int, today: Optional[date] = None) -> Optional[Session]:
+        """Stored session if it is still valid, without building one"""
+        stored = self._sessions.get(student_id)
+        if stored is None:
+            return None
+        if stored.day != (today or date.today()):
+            del self._sessions[student_id]
+            return None
+        if stored.new_count != new_count or stored.review_count != review_count:
+            return None
+        self._sessions.move_to_end(student_id)
+        return stored.session
+
+    async def get(
+        self,
+        student_id: str,
+        new_count: int = DEFAULT_NEW_COUNT,
+        review_count: int = DEFAULT_REVIEW_COUNT,
+        today: Optional[date] = None
+    ) -> Session:
+        """Student's session for today, built now if it was not precomputed"""
+        if today is None:
+            today = date.today()
+        session = self.peek(student_id, new_count, review_count, today)
+        if session is not None:
+            self.hits += 1
+            return session
+        self.misses += 1
+        return await self.build(student_id, new_count, review_count, today)
+
+    async def build(
+        self,
+        student_id: str,
+        new_count: int = DEFAULT_NEW_COUNT,
+        review_count: int = DEFAULT_REVIEW_COUNT,
+        today: Optional[date] = None
+    ) -> Session:
+        """Build and store a student's session (replacing any stored one)"""
+        if today is None:
+            today = date.today()
+
+        self._building[student_id] = self._building.get(student_id, 0) + 1
+        try:
+            session = await build_session(student_id, new_count, review_count, today)
+        finally:
+            remaining = self._building.pop(student_id) - 1
+            if remaining:
+                self._building[student_id] = remaining
+            stale = student_id in self._stale
+            if not remaining:
+                self._stale.discard(student_id)
+
+        # A review written while building may already have changed the session.
+        # An empty session usually means a query failed (they return [] on
+        # errors), so it is served but not kept.
+        if not stale and (session['new'] or session['review']):
+            self._sessions[student_id] = _StoredSession(today, new_count, review_count, session)
+            self._sessions.move_to_end(student_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def invalidate(self, student_id: str):
+        """Drop a student's session after their SRS progress changed"""
+        self._sessions.pop(student_id, None)
+        if student_id in self._building:
+            self._stale.add(student_id)
+
+    def clear(self):
+        self._sessions.clear()
+
+    async def precompute(
+        self,
+        student_ids: Iterable[str],
+        new_count: int = DEFAULT_NEW_COUNT,
+        review_count: int = DEFAULT_REVIEW_COUNT,
+        concurrency: int = SRS_PRECOMPUTE_CONCURRENCY
+    ) -> int:
+        """
+        Build sessions for many students, a few at a time
+
+        Returns:
+            Number of sessions built
+        """
+        today = date.today()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def build_one(student_id: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.build(student_id, new_count, review_count, today)
+                    return True
+                except Exception as e:
+                    logger.warning(f"Failed to precompute session for student {student_id}: {e}")
+                    return False
+
+        results = await asyncio.gather(*(build_one(student_id) for student_id in dict.fromkeys(student_ids)))
+        return sum(results)
+
+# Global instance
+_session_store: Optional[SessionStore] = None
+
+def get_session_store() -> SessionStore:
+    """Get or create global session store"""
+    global _session_store
+    if _session_store is None:
+        _session_store = SessionStore()
+    return _session_store
+
+def invalidate_student_session(student_id: str):
+    """Invalidate a student's precomputed session after review writes"""
+    if _session_store is not None:
+        _session_store.invalidate(student_id)
+
+async def precompute_active_sessions() -> Dict[str, Any]:
+    """Build today's session for every student who reviewed recently"""
+    from db import srs as db_srs
+
+    started = time.perf_counter()
+    since = date.today() - timedelta(days=SRS_PRECOMPUTE_ACTIVE_DAYS)
+    student_ids = await db_srs.get_active_student_ids(since)
+    built = await get_session_store().precompute(student_ids)
+    seconds = time.perf_counter() - started
+    logger.info(f"Precomputed {built}/{len(student_ids)} SRS sessions in {seconds:.1f}s")
+    return {'students': len(student_ids), 'built': built, 'seconds': seconds}
+
+def seconds_until(time_of_day: str, now: Optional[datetime] = None) -> float:
+    """Seconds from now until the next HH:MM (server local time)"""
+    if now is None:
+        now = datetime.now()
+    hour, minute = (int(part) for part in time_of_day.split(":"))
+    run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    return (run_at - now).total_seconds()
+
+# Daily precompute task (started with the app)
+_precompute_task: Optional[asyncio.Task] = None
+
+async def _precompute_daily():
+    while True:
+        await asyncio.sleep(seconds_until(SRS_PRECOMPUTE_AT))
+        try:
+            await precompute_active_sessions()
+        except Exception as e:
+            logger.error(f"Error precomputing SRS sessions: {e}")
+
+async def start_session_precompute():
+    """Schedule the daily precompute (app startup hook)"""
+    global _precompute_task
+    if not SRS_PRECOMPUTE_AT or _precompute_task is not None:
+        return
+    try:
+        seconds_until(SRS_PRECOMPUTE_AT)
+    except ValueError:
+        logger.warning(f"Invalid SRS_PRECOMPUTE_AT '{SRS_PRECOMPUTE_AT}' (expected HH:MM), sessions will not be precomputed")
+        return
+    _precompute_task = asyncio.get_running_loop().create_task(_precompute_daily())
+    logger.info(f"SRS sessions will be precomputed daily at {SRS_PRECOMPUTE_AT}")
+
+async def stop_session_precompute():
+    """Cancel the daily precompute (app shutdown hook)"""
+    global _precompute_task
+    if _precompute_task is None:
+        return
+    _precompute_task.cancel()
+    try:
+        await _precompute_task
+    except asyncio.CancelledError:
+        pass
+    _precompute_task = None
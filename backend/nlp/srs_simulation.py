@@ -0,0 +1,117 @@
+"""
+SRS Scheduler Simulation
+Compares schedulers offline on simulated students
+
+Each card is introduced on a given day and then reviewed whenever the
+scheduler under test says it is due. Whether the student recalls it is
+drawn from a "true" FSRS memory model whose parameters are perturbed away
+from the defaults (so the FSRS scheduler does not get a perfect model of
+the student for free). Every scheduler sees the same cards, introduction
+days and per-card difficulties.
+"""
+import random
+from datetime import date
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .schedulers import FSRS_DEFAULT_WEIGHTS, FSRSScheduler, Scheduler
+from .srs import SRSData
+
+def true_memory_model(noise: float = 0.2, seed: int = 0) -> FSRSScheduler:
+    """FSRS memory model with each weight scaled by exp(N(0, noise))"""
+    rng = random.Random(seed)
+    return FSRSScheduler([weight * rng.lognormvariate(0, noise) for weight in FSRS_DEFAULT_WEIGHTS])
+
+def recall_quality(recall_probability: float, recalled: bool) -> int:
+    """0-5 quality a student would report: failures are 1, recalls are graded by how hard they were"""
+    if not recalled:
+        return 1
+    if recall_probability < 0.6:
+        return 3
+    return 4 if recall_probability < 0.9 else 5
+
+def simulate(
+    scheduler: Scheduler,
+    introductions: Sequence[int],
+    end_day: int,
+    truth: FSRSScheduler,
+    seed: int = 0,
+    difficulty_spread: float = 1.5
+) -> Dict[str, float]:
+    """
+    Simulate every card from its introduction day to `end_day`
+
+    Args:
+        scheduler: Scheduler deciding when each card is reviewed
+        introductions: Day ordinal on which each card is first studied
+        end_day: Day ordinal the simulation stops at (retention is measured here)
+        truth: Memory model that decides whether a review is recalled
+        seed: Random seed (same seed = same cards and recall draws)
+        difficulty_spread: Standard deviation of per-card true difficulty
+
+    Returns:
+        cards, reviews, reviews_per_card, recall_rate (share of reviews
+        recalled), retention (mean true recall probability at end_day) and
+        reviews_per_retained_card
+    """
+    rng = random.Random(seed)
+    reviews = 0
+    recalled_reviews = 0
+    retention_sum = 0.0
+
+    for intro_day in introductions:
+        card_rng = random.Random(rng.random())
+        difficulty_offset = card_rng.gauss(0, difficulty_spread)
+        data = SRSData(due_date=date.fromordinal(intro_day))
+        stability = None
+        difficulty = None
+        last_day = intro_day
+        day = intro_day
+
+        while day <= end_day:
+            if stability is None:
+                # First study: the student sees the answer
+                quality = 4
+                stability, difficulty = truth.next_memory_state(None, None, 0, truth.grade(quality))
+                difficulty = min(10.0, max(1.0, difficulty + difficulty_offset))
+            else:
+                recall = truth.retrievability(day - last_day, stability)
+                recalled = card_rng.random() < recall
+                quality = recall_quality(recall, recalled)
+                recalled_reviews += recalled
+                stability, difficulty = truth.next_memory_state(stability, difficulty, day - last_day, truth.grade(quality))
+            reviews += 1
+            last_day = day
+            data = scheduler.next_review(data, quality, review_date=date.fromordinal(day))
+            day = data.due_date.toordinal()
+
+        retention_sum += truth.retrievability(end_day - last_day, stability)
+
+    cards = len(introductions)
+    retention = retention_sum / cards if cards else 0.0
+    follow_up_reviews = reviews - cards  # First studies are not recall attempts
+    return {
+        'cards': cards,
+        'reviews': reviews,
+        'reviews_per_card': reviews / cards if cards else 0.0,
+        'recall_rate': recalled_reviews / follow_up_reviews if follow_up_reviews else 0.0,
+        'retention': retention,
+        'reviews_per_retained_card': reviews / retention_sum if retention_sum else 0.0
+    }
+
+def introductions_from_log(events: Iterable[Tuple[str, int]]) -> Tuple[List[int], int]:
+    """
+    First review day of each card in a review log
+
+    Args:
+        events: (card key, review day ordinal) pairs
+
+    Returns:
+        (introduction day per card, last day in the log)
+    """
+    first_day: Dict[str, int] = {}
+    last_day = 0
+    for card, day in events:
+        if card not in first_day or day < first_day[card]:
+            first_day[card] = day
+        last_day = max(last_day, day)
+    return list(first_day.values()), last_day
@@ -0,0 +1,218 @@
+"""
+JSON Transcript Reader
+Reads {"speakers": [...]} / {"transcript": [...]} JSON transcripts incrementally
+
+Exported diarization files can be tens of MB. Instead of decoding the whole
+document, the reader walks the top-level object as text arrives and decodes
+one array item at a time, returning (speaker, text) events. Other top-level
+values are decoded only to validate them and then dropped, so memory is
+bounded by the largest single item or value rather than the document. Any
+input json.loads would reject is rejected too (JSONTranscriptError).
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+TRANSCRIPT_KEYS = ('speakers', 'transcript')  # Top-level arrays of speaker items, in order of precedence
+
+_DECODER = json.JSONDecoder()
+_JSON_SPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURE_TOKENS = re.compile(r'"(?:[^"\\]|\\.)*(")?|[\[\]{}]')  # Strings (group 1 = closing quote) and brackets
+_SCALAR_END = re.compile(r'[,\]} \t\n\r]')
+_COMPACT_CHARS = 64 * 1024  # Consumed text dropped from the buffer once it is this long
+
+# (key, occurrence of the key's array, speaker, text)
+Event = Tuple[str, int, Any, Any]
+
+
+class JSONTranscriptError(ValueError):
+    """The text is not a complete, valid JSON object"""
+
+
+def item_speaker_text(item: Any) -> Tuple[Any, Any]:
+    """Speaker and text of a transcript item (TranscriptParser's field fallbacks)"""
+    if not isinstance(item, dict):
+        return None, None
+    speaker = item.get('speaker') or item.get('name') or item.get('label') or 'Unknown'
+    text = item.get('text') or item.get('content') or item.get('transcript') or ''
+    return speaker, text
+
+
+class JSONTranscriptReader:
+    """Incremental reader: feed text chunks, get an event for each transcript item with text"""
+
+    def __init__(self):
+        self.done = False  # Top-level object closed
+        # Key -> occurrence number of its last value if that was an array, else 0
+        # (with duplicate keys the last value wins, as with json.loads)
+        self.arrays: Dict[str, int] = {}
+        self._buffer = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key: Optional[str] = None
+        self._occurrence = 0
+        self._scan_pos: Optional[int] = None  # Resume point while a value is incomplete
+        self._depth = 0
+
+    def feed(self, chunk: str) -> List[Event]:
+        """Add the next piece of the document"""
+        self._buffer += chunk
+        events: List[Event] = []
+        self._advance(events)
+        if self._pos >= _COMPACT_CHARS:
+            self._buffer = self._buffer[self._pos:]
+            if self._scan_pos is not None:
+                self._scan_pos -= self._pos
+            self._pos = 0
+        return events
+
+    def close(self) -> List[Event]:
+        """Finish the document; raises JSONTranscriptError if it is incomplete or invalid"""
+        events: List[Event] = []
+        self._advance(events)
+        if not self.done:
+            raise JSONTranscriptError("Incomplete JSON document")
+        return events
+
+    def _advance(self, events: List[Event]):
+        """Consume as much of the buffer as is complete"""
+        buffer = self._buffer
+        while True:
+            state = self._state
+            if state == 'done':
+                if buffer[self._pos:].strip():
+                    raise JSONTranscriptError("Extra data after JSON document")
+                self._pos = len(buffer)
+                return
+
+            self._pos = _JSON_SPACE.match(buffer, self._pos).end()
+            if self._pos == len(buffer):
+                return
+            char = buffer[self._pos]
+
+            if state == 'start':
+                if char != '{':
+                    raise JSONTranscriptError("Not a JSON object")
+                self._pos += 1
+                self._state = 'first_key'
+            elif state == 'first_key':
+                if char == '}':
+                    self._finish()
+                else:
+                    self._state = 'key'
+            elif state == 'key':
+                if char != '"':
+                    raise JSONTranscriptError("Expected a key")
+                key = self._decode_value()
+                if key is _INCOMPLETE:
+                    return
+                self._key = key
+                self._state = 'colon'
+            elif state == 'colon':
+                if char != ':':
+                    raise JSONTranscriptError("Expected ':'")
+                self._pos += 1
+                self._state = 'value'
+            elif state == 'value':
+                if self._key in TRANSCRIPT_KEYS and char == '[':
+                    self._occurrence += 1
+                    self.arrays[self._key] = self._occurrence
+                    self._pos += 1
+                    self._state = 'first_item'
+                else:
+                    if self._decode_value() is _INCOMPLETE:
+                        return
+                    if self._key in TRANSCRIPT_KEYS:
+                        self.arrays[self._key] = 0
+                    self._state = 'after_value'
+            elif state == 'first_item':
+                if char == ']':
+                    self._pos += 1
+                    self._state = 'after_value'
+                else:
+                    self._state = 'item'
+            elif state == 'item':
+                item = self._decode_value()
+                if item is _INCOMPLETE:
+                    return
+                speaker, text = item_speaker_text(item)
+                if text:
+                    events.append((self._key, self._occurrence, speaker, text))
+                self._state = 'after_item'
+            elif state == 'after_item':
+                if char == ',':
+                    self._state = 'item'
+                elif char == ']':
+                    self._state = 'after_value'
+                else:
+                    raise JSONTranscriptError("Expected ',' or ']'")
+                self._pos += 1
+            elif state == 'after_value':
+                if char == ',':
+                    self._state = 'key'
+                    self._pos += 1
+                elif char == '}':
+                    self._finish()
+                else:
+                    raise JSONTranscriptError("Expected ',' or '}'")
+
+    def _finish(self):
+        self._pos += 1
+        self._state = 'done'
+        self.done = True
+
+    def _decode_value(self) -> Any:
+        """Decode the value at the current position, or _INCOMPLETE if it has not all arrived"""
+        buffer = self._buffer
+        if buffer[self._pos] in '"[{' and self._scan_pos is None:
+            # A string, array or object that decodes is complete: try that
+            # first and only look for the end of the ones that fail
+            try:
+                value, self._pos = _DECODER.raw_decode(buffer, self._pos)
+                return value
+            except json.JSONDecodeError:
+                pass
+        if self._value_end() is None:
+            return _INCOMPLETE
+        try:
+            value, self._pos = _DECODER.raw_decode(buffer, self._pos)
+        except json.JSONDecodeError as e:
+            raise JSONTranscriptError(str(e)) from e
+        return value
+
+    def _value_end(self) -> Optional[int]:
+        """
+        End of the value at the current position, or None if it continues in
+        the next chunk. Brackets are matched outside strings; the scan resumes
+        where it stopped when more text arrives.
+        """
+        buffer = self._buffer
+        start = self._pos
+        if buffer[start] not in '"[{':
+            scalar_end = _SCALAR_END.search(buffer, start)
+            return scalar_end.start() if scalar_end else None
+
+        depth = self._depth
+        for token in _STRUCTURE_TOKENS.finditer(buffer, self._scan_pos if self._scan_pos is not None else start):
+            text = token.group()
+            if text[0] == '"':
+                if token.group(1) is None:  # String continues in the next chunk
+                    self._scan_pos, self._depth = token.start(), depth
+                    return None
+                if not depth:
+                    break
+            elif text in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if not depth:
+                    break
+        else:
+            self._scan_pos, self._depth = len(buffer), depth
+            return None
+
+        self._scan_pos, self._depth = None, 0
+        return token.end()
+
+
+_INCOMPLETE = object()
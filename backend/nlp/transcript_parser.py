@@ -3,25 +3,81 @@ Transcript Parser
 Detects and parses multiple transcript formats to extract speaker information
 """
 import json
+import os
 import re
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 
+from .transcript_json import JSONTranscriptError, JSONTranscriptReader, TRANSCRIPT_KEYS, item_speaker_text
+
 logger = logging.getLogger(__name__)
 
+# JSON settings (override via environment)
+JSON_INCREMENTAL_CHARS = int(os.getenv("TRANSCRIPT_JSON_INCREMENTAL_CHARS", "1000000"))  # Larger JSON transcripts are read item by item
+JSON_READ_CHARS = 64 * 1024  # Text handed to the incremental reader at a time
+
+
+# Speaker label styles, in the order a transcript's format is chosen
+LABEL_STYLES = ('colon', 'bracket', 'angle', 'dash')  # "Speaker: ", "[Speaker]: ", "<Speaker> ", "Speaker - "
+
+# Labels can appear anywhere in the text, not just at line starts. Every
+# label contains one of these characters, so the scanner only visits them
+# (a regex over every word position is several times slower). Names before
+# a ':' or '-' are matched backwards, on the reversed text.
+_LABEL_DELIMITERS = re.compile(r'[:\-\[<]')
+_BRACKET_LABEL = re.compile(r'\[(\w+)\]:\s*')
+_ANGLE_LABEL = re.compile(r'<(\w+)>\s*')
+_NAME_BEFORE_COLON = re.compile(r'\w+')  # On reversed text
+_NAME_BEFORE_DASH = re.compile(r'\s*(\w+)')  # On reversed text
+_SPACES = re.compile(r'\s*')
+
+
+def find_labels(text: str) -> List[List[Tuple[int, int, str]]]:
+    """
+    Find the speaker labels of every style in one pass
+    
+    The style that comes first in LABEL_STYLES and occurs anywhere in a
+    transcript is its format, and only its labels delimit segments (labels
+    of other styles stay part of the text).
+    
+    Returns:
+        For each style in LABEL_STYLES, (label start, label end, speaker name)
+        of each of its labels, in order
+    """
+    found: List[List[Tuple[int, int, str]]] = [[] for _ in LABEL_STYLES]
+    colon_labels, bracket_labels, angle_labels, dash_labels = found
+    reversed_text = text[::-1]
+    length = len(text)
+    
+    for delimiter in _LABEL_DELIMITERS.finditer(text):
+        pos = delimiter.start()
+        char = text[pos]
+        if char == ':':
+            name = _NAME_BEFORE_COLON.match(reversed_text, length - pos)
+            if name:
+                start = pos - (name.end() - name.start())
+                colon_labels.append((start, _SPACES.match(text, pos + 1).end(), text[start:pos]))
+        elif char == '-':
+            name = _NAME_BEFORE_DASH.match(reversed_text, length - pos)
+            if name:
+                start = pos - (name.end() - name.start())
+                dash_labels.append((
+                    start,
+                    _SPACES.match(text, pos + 1).end(),
+                    text[start:start + name.end(1) - name.start(1)]
+                ))
+        else:
+            label = (_BRACKET_LABEL if char == '[' else _ANGLE_LABEL).match(text, pos)
+            if label:
+                (bracket_labels if char == '[' else angle_labels).append((pos, label.end(), label.group(1)))
+    
+    return found
+
 
 class TranscriptParser:
     """Parses transcripts in multiple formats to extract speaker information"""
     
-    # Common speaker label patterns
-    SPEAKER_PATTERNS = [
-        r'^(\w+):\s*(.+)$',  # "Speaker: text"
-        r'^\[(\w+)\]:\s*(.+)$',  # "[Speaker]: text"
-        r'^<(\w+)>\s*(.+)$',  # "<Speaker> text"
-        r'^(\w+)\s*-\s*(.+)$',  # "Speaker - text"
-    ]
-    
     def __init__(self):
         pass
     
@@ -68,6 +124,9 @@ class TranscriptParser:
     
     def _try_parse_json(self, transcript: str) -> Optional[Dict[str, Any]]:
         """Try to parse as JSON format"""
+        if len(transcript) > JSON_INCREMENTAL_CHARS:
+            return self._try_parse_json_incremental(transcript)
+        
         try:
             # Try parsing as JSON
             data = json.loads(transcript.strip())
@@ -91,45 +150,14 @@ class TranscriptParser:
                         speakers_data = data
                 
                 if speakers_data:
-                    speakers = []
                     speaker_texts = defaultdict(list)
                     
                     for item in speakers_data:
-                        if isinstance(item, dict):
-                            # Extract speaker name
-                            speaker_name = (
-                                item.get('speaker') or 
-                                item.get('name') or 
-                                item.get('label') or 
-                                'Unknown'
-                            )
-                            
-                            # Extract text
-                            text = (
-                                item.get('text') or 
-                                item.get('content') or 
-                                item.get('transcript') or 
-                                ''
-                            )
-                            
-                            if text:
-                                speaker_texts[speaker_name].append(text)
-                    
-                    # Combine all text for each speaker
-                    for speaker_name, texts in speaker_texts.items():
-                        combined_text = ' '.join(texts)
-                        speakers.append({
-                            'name': speaker_name,
-                            'text': combined_text,
-                            'word_count': len(combined_text.split())
-                        })
+                        speaker_name, text = item_speaker_text(item)
+                        if text:
+                            speaker_texts[speaker_name].append(text)
                     
-                    if speakers:
-                        return {
-                            'format_detected': 'json',
-                            'speakers': speakers,
-                            'raw_text': transcript
-                        }
+                    return self._json_result(speaker_texts, transcript)
             
         except (json.JSONDecodeError, ValueError, TypeError):
             # Not valid JSON, continue to other formats
@@ -137,6 +165,71 @@ class TranscriptParser:
         
         return None
     
+    def _try_parse_json_incremental(self, transcript: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a large JSON transcript without decoding the whole document
+        
+        Gives the same result as the json.loads path: texts are collected per
+        top-level array (a repeated key starts over, as the last value wins),
+        and the 'speakers' array is used in preference to 'transcript'.
+        """
+        reader = JSONTranscriptReader()
+        text = transcript.strip()
+        
+        def events():
+            for start in range(0, len(text), JSON_READ_CHARS):
+                yield from reader.feed(text[start:start + JSON_READ_CHARS])
+            yield from reader.close()
+        
+        # Key -> (occurrence, speaker texts); None in place of the texts if an
+        # item can't be combined, which only matters if that array is used
+        arrays: Dict[str, Tuple[int, Optional[Dict[Any, List[Any]]]]] = {}
+        try:
+            for key, occurrence, speaker_name, item_text in events():
+                if key not in arrays or arrays[key][0] != occurrence:
+                    arrays[key] = (occurrence, defaultdict(list))
+                speaker_texts = arrays[key][1]
+                if speaker_texts is not None:
+                    try:
+                        speaker_texts[speaker_name].append(item_text)
+                    except TypeError:  # Unhashable speaker name
+                        arrays[key] = (occurrence, None)
+        except JSONTranscriptError:
+            # Not valid JSON, continue to other formats
+            return None
+        
+        key = next((key for key in TRANSCRIPT_KEYS if reader.arrays.get(key)), None)
+        if key is None:
+            return None
+        occurrence, speaker_texts = arrays.get(key, (None, {}))
+        if occurrence != reader.arrays[key]:
+            speaker_texts = {}
+        if speaker_texts is None:
+            return None
+        try:
+            return self._json_result(speaker_texts, transcript)
+        except TypeError:
+            return None
+    
+    def _json_result(self, speaker_texts: Dict[Any, List[Any]], transcript: str) -> Optional[Dict[str, Any]]:
+        """Combine all text for each speaker into a 'json' parse result"""
+        speakers = []
+        for speaker_name, texts in speaker_texts.items():
+            combined_text = ' '.join(texts)
+            speakers.append({
+                'name': speaker_name,
+                'text': combined_text,
+                'word_count': len(combined_text.split())
+            })
+        
+        if not speakers:
+            return None
+        return {
+            'format_detected': 'json',
+            'speakers': speakers,
+            'raw_text': transcript
+        }
+    
     def _try_parse_labeled(self, transcript: str) -> Optional[Dict[str, Any]]:
         """Try to parse as labeled format (e.g., "Speaker: text")
         
@@ -147,111 +240,36 @@ class TranscriptParser:
         if not transcript:
             return None
         
-        # Patterns that can match anywhere in text (not just line start)
-        # These patterns find speaker labels and capture text until the next speaker or end
-        flexible_patterns = [
-            (r'(\w+):\s*', re.IGNORECASE),  # "Speaker: " - most common format
-            (r'\[(\w+)\]:\s*', re.IGNORECASE),  # "[Speaker]: "
-            (r'<(\w+)>\s*', re.IGNORECASE),  # "<Speaker> "
-            (r'(\w+)\s*-\s*', re.IGNORECASE),  # "Speaker - "
-        ]
+        labels = next((labels for labels in find_labels(transcript) if labels), None)
+        if not labels:
+            return None
         
+        # Extract text segments between speaker labels
         speaker_texts = defaultdict(list)
-        found_pattern = None
-        
-        # Try each pattern to find speaker labels in the entire text
-        for pattern, flags in flexible_patterns:
-            # Find all matches of this pattern
-            matches = list(re.finditer(pattern, transcript, flags))
-            if len(matches) >= 1:  # Found at least one speaker label
-                found_pattern = (pattern, flags)
-                break
+        ends = [start for start, _, _ in labels[1:]]
+        ends.append(len(transcript))
+        for (_, start_pos, speaker_name), end_pos in zip(labels, ends):
+            text = transcript[start_pos:end_pos].strip()
+            if text:
+                speaker_texts[speaker_name].append(text)
         
-        if found_pattern:
-            # Found a pattern with multiple matches - extract speakers
-            pattern, flags = found_pattern
-            matches = list(re.finditer(pattern, transcript, flags))
-            
-            # Extract text segments between speaker labels
-            for i, match in enumerate(matches):
-                speaker_name = match.group(1).strip()
-                start_pos = match.end()  # Position after the speaker label
-                
-                # Find the end position (start of next speaker or end of text)
-                if i + 1 < len(matches):
-                    end_pos = matches[i + 1].start()
-                else:
-                    end_pos = len(transcript)
-                
-                # Extract the text for this speaker
-                text = transcript[start_pos:end_pos].strip()
-                
-                if text:
-                    speaker_texts[speaker_name].append(text)
-        else:
-            # Fall back to line-by-line approach (backward compatibility)
-            lines = transcript.split('\n')
-            if len(lines) < 2:
-                return None
-            
-            current_speaker = None
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                matched = False
-                for pattern in self.SPEAKER_PATTERNS:
-                    match = re.match(pattern, line, re.IGNORECASE)
-                    if match:
-                        speaker_name = match.group(1).strip()
-                        text = match.group(2).strip()
-                        
-                        if text:
-                            speaker_texts[speaker_name].append(text)
-                        current_speaker = speaker_name
-                        matched = True
-                        break
-                
-                # If no pattern matched, check if previous line had a speaker
-                if not matched and current_speaker:
-                    speaker_texts[current_speaker].append(line)
+        if not speaker_texts:
+            return None
         
-        # Check if we found multiple speakers or consistent labeling
-        if len(speaker_texts) >= 2:
-            # Multiple speakers detected
-            speakers = []
-            for speaker_name, texts in speaker_texts.items():
-                combined_text = ' '.join(texts)
-                speakers.append({
-                    'name': speaker_name,
-                    'text': combined_text,
-                    'word_count': len(combined_text.split())
-                })
-            
-            if speakers:
-                return {
-                    'format_detected': 'labeled',
-                    'speakers': speakers,
-                    'raw_text': transcript
-                }
-        elif len(speaker_texts) == 1:
-            # Single speaker with labels - still consider it labeled format
-            speaker_name, texts = list(speaker_texts.items())[0]
+        speakers = []
+        for speaker_name, texts in speaker_texts.items():
             combined_text = ' '.join(texts)
-            speakers = [{
+            speakers.append({
                 'name': speaker_name,
                 'text': combined_text,
                 'word_count': len(combined_text.split())
-            }]
-            
-            return {
-                'format_detected': 'labeled',
-                'speakers': speakers,
-                'raw_text': transcript
-            }
+            })
         
-        return None
+        return {
+            'format_detected': 'labeled',
+            'speakers': speakers,
+            'raw_text': transcript
+        }
     
     def extract_student_text(self, parsed_result: Dict[str, Any], student_speaker_name: Optional[str] = None) -> str:
         """
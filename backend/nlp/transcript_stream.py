@@ -0,0 +1,173 @@
+"""
+Transcript Streaming
+Attributes a transcript's text to speakers while it is still being read
+
+TranscriptStream takes the transcript in chunks of any size and returns
+(speaker, text) fragments as soon as they are known. It only keeps the text
+that could still turn out to be part of a label, so memory does not grow
+with the length of the recording. Labels follow the TranscriptParser rules,
+except that the label style is fixed from the first STREAM_DETECT_CHARS of
+the transcript rather than from the whole text. JSON transcripts are read
+item by item with JSONTranscriptReader; their fragments come from the first
+'speakers' or 'transcript' array in the document, and a document that turns
+out not to be valid JSON raises JSONTranscriptError instead of being read as
+labeled text.
+
+Fragments are split at whitespace, so joining a speaker's fragments with
+spaces gives TranscriptParser's text for them up to whitespace (same words,
+same word count).
+"""
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .transcript_json import Event, JSONTranscriptError, JSONTranscriptReader
+from .transcript_parser import LABEL_STYLES, find_labels
+
+# Stream settings (override via environment)
+STREAM_DETECT_CHARS = int(os.getenv("TRANSCRIPT_STREAM_DETECT_CHARS", "65536"))  # Text read before the label style is fixed
+
+PLAIN_SPEAKER = 'Speaker'  # TranscriptParser's name for unlabeled text
+PREVIEW_CHARS = 100
+
+# Matched on the reversed text: the last word of the pending text may be the
+# start of a label ("Maya" before ':', "[Maya]" before ':'), and for dash
+# labels so may the word before trailing whitespace ("Maya " before '-')
+_LAST_WORD = re.compile(r'\S*')
+_PARTIAL_DASH_LABEL = re.compile(r'\s*\w*')
+
+Fragment = Tuple[str, str]  # (speaker, text)
+
+
+class TranscriptStream:
+    """Incremental speaker attribution: feed text chunks, get (speaker, text) fragments"""
+
+    def __init__(self, detect_chars: int = STREAM_DETECT_CHARS):
+        self.detect_chars = detect_chars
+        self.format_detected: Optional[str] = None  # 'labeled', 'json' or 'plain' once known
+        self.style: Optional[str] = None  # Label style of a labeled transcript
+        self._buffer = ''
+        self._speaker: Optional[str] = None  # Speaker of the text at the start of the buffer
+        self._started = False  # Leading whitespace skipped
+        self._json: Optional[JSONTranscriptReader] = None
+        self._json_key: Optional[str] = None  # Array the fragments of a JSON transcript come from
+
+    def feed(self, chunk: str) -> List[Fragment]:
+        """Add the next piece of the transcript"""
+        if not self._started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return []
+            self._started = True
+        self._buffer += chunk
+
+        if self.format_detected is None:
+            if len(self._buffer) < self.detect_chars:
+                return []
+            self._detect_format()
+        if self.format_detected == 'json':
+            return self._read_json(self._json.feed(self._take_buffer()))
+        return self._attribute(final=False)
+
+    def close(self) -> List[Fragment]:
+        """Attribute the rest of the transcript (call once, after the last chunk)"""
+        if self.format_detected is None:
+            self._detect_format()
+        if self.format_detected == 'json':
+            events = self._json.feed(self._take_buffer()) + self._json.close()
+            return self._read_json(events)
+        return self._attribute(final=True)
+
+    def _detect_format(self):
+        if self._buffer.startswith('{'):
+            self.format_detected = 'json'
+            self._json = JSONTranscriptReader()
+            return
+        for style, labels in zip(LABEL_STYLES, find_labels(self._buffer)):
+            if labels:
+                self.format_detected = 'labeled'
+                self.style = style
+                return
+        self.format_detected = 'plain'
+        self._speaker = PLAIN_SPEAKER
+
+    def _attribute(self, final: bool) -> List[Fragment]:
+        """Split the buffer at labels and emit everything that can no longer change"""
+        fragments: List[Fragment] = []
+        buffer = self._buffer
+        position = 0
+        if self.style is not None:
+            labels = find_labels(buffer)[LABEL_STYLES.index(self.style)]
+            for start, end, name in labels:
+                self._emit(fragments, buffer[position:start])
+                self._speaker = name
+                position = end
+
+        if final:
+            self._emit(fragments, buffer[position:])
+            self._buffer = ''
+            return fragments
+
+        cut = self._safe_end(buffer, position)
+        self._emit(fragments, buffer[position:cut])
+        self._buffer = buffer[cut:]
+        return fragments
+
+    def _safe_end(self, buffer: str, position: int) -> int:
+        """Last whitespace before any text that may still become a label"""
+        reversed_text = buffer[:position - 1:-1] if position else buffer[::-1]
+        held = _PARTIAL_DASH_LABEL.match(reversed_text).end() if self.style == 'dash' else 0
+        return len(buffer) - _LAST_WORD.match(reversed_text, held).end()
+
+    def _emit(self, fragments: List[Fragment], text: str):
+        text = text.strip()
+        if text and self._speaker is not None:  # Text before the first label has no speaker
+            fragments.append((self._speaker, text))
+
+    def _take_buffer(self) -> str:
+        buffer, self._buffer = self._buffer, ''
+        return buffer
+
+    def _read_json(self, events: List[Event]) -> List[Fragment]:
+        fragments: List[Fragment] = []
+        for key, _, speaker, text in events:
+            if self._json_key is None:
+                self._json_key = key
+            if key != self._json_key:
+                continue
+            if not isinstance(speaker, str) or not isinstance(text, str):
+                raise JSONTranscriptError("Transcript items need a text speaker name and text")
+            fragments.append((speaker, text))
+        return fragments
+
+
+class SpeakerSummary:
+    """Word counts and text previews of each speaker in a stream"""
+
+    def __init__(self, preview_chars: int = PREVIEW_CHARS):
+        self.preview_chars = preview_chars
+        self._speakers: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, speaker: str, text: str):
+        summary = self._speakers.get(speaker)
+        if summary is None:
+            summary = self._speakers[speaker] = {'word_count': 0, 'preview': ''}
+        summary['word_count'] += len(text.split())
+        if len(summary['preview']) <= self.preview_chars:
+            # One character past the limit marks a preview that was cut
+            preview = f"{summary['preview']} {text}" if summary['preview'] else text
+            summary['preview'] = preview[:self.preview_chars + 1]
+
+    def find(self, name: str) -> Optional[str]:
+        """Speaker matching a name, case-insensitively (as extract_student_text does)"""
+        return next((speaker for speaker in self._speakers if speaker.lower() == name.lower()), None)
+
+    def speakers(self) -> List[Dict[str, Any]]:
+        """Speakers in order of appearance, with a preview in place of the full text"""
+        speakers = []
+        for name, summary in self._speakers.items():
+            preview = summary['preview']
+            if len(preview) > self.preview_chars:
+                preview = preview[:self.preview_chars] + '...'
+            speakers.append({'name': name, 'word_count': summary['word_count'], 'preview': preview})
+        return speakers
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+spaCy Pipeline Benchmark
+Compares model load time, docs/sec and memory for each profiler pipeline
+profile (PROFILER_PIPELINE), and checks they produce identical profiles.
+
+Each profile runs in its own subprocess so load time and RSS are measured
+from a clean interpreter.
+
+Usage:
+    python scripts/bench_pipeline.py
+    python scripts/bench_pipeline.py --corpus essays.txt --repeat 5
+    python scripts/bench_pipeline.py --profiles full lean
+
+The corpus file holds one essay per paragraph (separated by blank lines).
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+SAMPLE_ESSAYS = [
+    """Last summer my family went camping near a huge lake in the mountains. We set up our tent
+    beside a tall pine tree and my little brother collected sticks for the campfire. At night the
+    stars were so bright that we could see the Milky Way stretching across the sky.""",
+    """My favorite book is about a brave girl who travels through a mysterious forest to rescue her
+    friend. She has to solve riddles and outsmart a clever fox. I admire her because she never
+    gives up, even when the path seems impossible and everyone tells her to turn back.""",
+    """Photosynthesis is the process plants use to transform sunlight into chemical energy. The
+    chlorophyll in their leaves absorbs light, and the plant combines carbon dioxide with water
+    to produce glucose. Oxygen is released as a byproduct, which animals depend on to survive.""",
+    """I think schools should start later in the morning. Teenagers need more sleep than adults,
+    and research suggests that students who are well rested concentrate better and earn higher
+    grades. A later schedule might also reduce the number of students who arrive late.""",
+    """When I moved to a new city I felt nervous and lonely at first. On the second day a classmate
+    invited me to sit with her group at lunch. We discovered that we both love drawing comics, and
+    now we are working together on a story about a robot who wants to become a musician.""",
+]
+
+
+def load_corpus(path: str = None) -> list:
+    """Essays from a file (blank-line separated) or the built-in samples"""
+    if not path:
+        return [" ".join(essay.split()) for essay in SAMPLE_ESSAYS]
+    text = Path(path).read_text(encoding='utf-8')
+    return [" ".join(block.split()) for block in text.split("\n\n") if block.strip()]
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (Linux), or peak RSS elsewhere"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_worker(corpus_path: str, repeat: int, batch_size: int):
+    """Benchmark the pipeline selected by PROFILER_PIPELINE and print JSON results"""
+    essays = load_corpus(corpus_path)
+    rss_before = current_rss_mb()
+
+    start = time.perf_counter()
+    from nlp.profiler import StoryProfiler, get_nlp_model, get_pipeline_profile
+    nlp = get_nlp_model()
+    profiler = StoryProfiler()
+    load_seconds = time.perf_counter() - start
+
+    # Warm up (first doc pays for lazy initialization)
+    analyses = profiler.analyze_many(essays, batch_size=batch_size)
+
+    docs = essays * repeat
+    start = time.perf_counter()
+    profiler.analyze_many(docs, batch_size=batch_size)
+    analyze_seconds = time.perf_counter() - start
+
+    digest = hashlib.sha256(json.dumps(analyses, sort_keys=True).encode('utf-8')).hexdigest()
+    print(json.dumps({
+        'profile': get_pipeline_profile(),
+        'components': nlp.pipe_names,
+        'load_seconds': load_seconds,
+        'docs': len(docs),
+        'docs_per_second': len(docs) / analyze_seconds,
+        'rss_mb': current_rss_mb(),
+        'model_rss_mb': current_rss_mb() - rss_before,
+        'output_digest': digest
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark profiler pipeline profiles")
+    parser.add_argument('--corpus', type=str, default=None, help="Essays file (blank-line separated)")
+    parser.add_argument('--repeat', type=int, default=20, help="Times to repeat the corpus when timing")
+    parser.add_argument('--batch-size', type=int, default=32, help="nlp.pipe batch size")
+    parser.add_argument('--profiles', nargs='+', default=None, help="Profiles to compare (default: all)")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.corpus, args.repeat, args.batch_size)
+        return
+
+    from nlp.profiler import PIPELINE_PROFILES
+    profiles = args.profiles or list(PIPELINE_PROFILES)
+
+    results = []
+    for profile in profiles:
+        command = [sys.executable, __file__, '--worker', '--repeat', str(args.repeat), '--batch-size', str(args.batch_size)]
+        if args.corpus:
+            command += ['--corpus', args.corpus]
+        env = {**os.environ, 'PROFILER_PIPELINE': profile}
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{profile}: failed\n{completed.stderr.strip()}")
+            continue
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    if not results:
+        sys.exit(1)
+
+    print(f"{'profile':<8} {'load (s)':>9} {'docs/sec':>10} {'RSS (MB)':>9} {'model (MB)':>11}  components")
+    for result in results:
+        print(
+            f"{result['profile']:<8} {result['load_seconds']:>9.2f} {result['docs_per_second']:>10.1f} "
+            f"{result['rss_mb']:>9.0f} {result['model_rss_mb']:>11.0f}  {', '.join(result['components'])}"
+        )
+
+    digests = {result['output_digest'] for result in results}
+    if len(digests) == 1:
+        print("\nAll profiles produced identical analyses.")
+    else:
+        print("\nWARNING: profiles produced different analyses:")
+        for result in results:
+            print(f"  {result['profile']}: {result['output_digest'][:16]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Profiler Metrics Benchmark
+Times the resonance metric stage of StoryProfiler (everything after the spaCy
+parse) on long essays: the old per-metric methods (PerMetricProfiler below),
+which each rescan the doc or word_scores, against the single-pass
+ProfileAccumulator used by _analyze_doc.
+
+Docs are built from a blank English tokenizer with synthetic POS tags, so no
+trained spaCy model is needed. Both paths are checked for identical output.
+
+Usage:
+    python scripts/bench_profiler_metrics.py --words 5000 --essays 20
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import spacy
+from spacy.tokens import Doc
+
+from nlp.accumulator import ProfileAccumulator
+from nlp.dataset_loader import DatasetLoader
+from nlp.grade_levels import difficulty_to_grade_level
+from nlp.profiler import StoryProfiler
+
+POS_WEIGHTS = {'NOUN': 30, 'VERB': 20, 'ADJ': 12, 'ADV': 6, 'PROPN': 5, 'DET': 10, 'ADP': 10, 'PRON': 7}
+FILLER_WORDS = ['the', 'and', 'was', 'with', 'they', 'into', 'of', 'a', 'to', 'in', ',', '.']
+
+
+def synthetic_vocabulary(size: int, seed: int = 7) -> list:
+    """Alphabetic placeholder words for when no datasets are installed"""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 12))) for _ in range(size)]
+
+
+def build_essays(vocabulary: list, count: int, words: int, seed: int = 42) -> list:
+    """Synthetic essays of the given length (Zipf-like word choice, ~30% stop words)"""
+    rng = random.Random(seed)
+    vocab = spacy.blank("en").vocab
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    tags = list(POS_WEIGHTS)
+    tag_weights = list(POS_WEIGHTS.values())
+
+    essays = []
+    for _ in range(count):
+        tokens = rng.choices(vocabulary, weights=weights, k=words)
+        tokens = [rng.choice(FILLER_WORDS) if rng.random() < 0.3 else token for token in tokens]
+        pos = rng.choices(tags, weights=tag_weights, k=words)
+        essays.append(Doc(vocab, words=tokens, pos=pos, lemmas=tokens))
+    return essays
+
+
+class PerMetricProfiler(StoryProfiler):
+    """StoryProfiler's metric methods as they were before ProfileAccumulator"""
+
+    def _extract_words(self, doc) -> List[Dict[str, Any]]:
+        """Extract meaningful words from spaCy doc"""
+        words = []
+        word_counts = Counter()
+
+        for token in doc:
+            # Skip punctuation, spaces, and stop words for analysis
+            if token.is_alpha and not token.is_stop and len(token.text) > 2:
+                word_lower = token.lemma_.lower()
+                word_counts[word_lower] += 1
+
+                words.append({
+                    'word': word_lower,
+                    'original': token.text,
+                    'pos': token.pos_,
+                    'lemma': token.lemma_,
+                    'count': word_counts[word_lower]
+                })
+
+        # Deduplicate while preserving count
+        seen = set()
+        unique_words = []
+        for word_info in words:
+            word = word_info['word']
+            if word not in seen:
+                seen.add(word)
+                unique_words.append(word_info)
+
+        return unique_words
+
+    def _calculate_vocabulary_level(self, word_scores: Dict[str, Any]) -> str:
+        """
+        Calculate overall vocabulary level as grade level (K-12)
+        Uses percentile-based scoring to focus on sophisticated words rather than
+        being skewed by common words (the, and, is, etc.)
+        """
+        if not word_scores:
+            return 'K-1'
+
+        # Extract all difficulty scores
+        difficulties = [
+            score['difficulty_score'] 
+            for score in word_scores.values()
+        ]
+
+        if not difficulties:
+            return 'K-1'
+
+        # Filter out very common words (difficulty < 20) to avoid skewing
+        # These are words like "the", "and", "is" that appear in all writing
+        filtered_difficulties = [d for d in difficulties if d >= 20]
+
+        # If we filtered out too many (less than 10% of words), use all words
+        # but use percentile-based approach
+        if len(filtered_difficulties) < len(difficulties) * 0.1:
+            filtered_difficulties = difficulties
+
+        # Sort difficulties to calculate percentiles
+        sorted_difficulties = sorted(filtered_difficulties)
+
+        # Use 75th percentile (top quartile) to focus on sophisticated vocabulary
+        # This represents the level of the most advanced words the student uses
+        percentile_75_index = int(len(sorted_difficulties) * 0.75)
+        if percentile_75_index >= len(sorted_difficulties):
+            percentile_75_index = len(sorted_difficulties) - 1
+
+        # Calculate average of top 25% most difficult words
+        top_quartile = sorted_difficulties[percentile_75_index:]
+        if top_quartile:
+            representative_difficulty = sum(top_quartile) / len(top_quartile)
+        else:
+            # Fallback to median if no top quartile
+            median_index = len(sorted_difficulties) // 2
+            representative_difficulty = sorted_difficulties[median_index] if sorted_difficulties else 30
+
+        # Map difficulty score to grade level
+        return difficulty_to_grade_level(representative_difficulty)
+
+    def _calculate_relic_distribution(self, word_scores: Dict[str, Any]) -> Dict[str, int]:
+        """Calculate distribution of relic types"""
+        distribution = {'whisper': 0, 'echo': 0, 'resonance': 0, 'thunder': 0}
+
+        for score in word_scores.values():
+            relic_type = score.get('relic_type', 'echo')
+            distribution[relic_type] = distribution.get(relic_type, 0) + 1
+
+        return distribution
+
+    def _extract_themes(self, doc) -> List[str]:
+        """Extract themes from the transcript using NLP"""
+        themes = []
+
+        # Extract named entities
+        entities = [ent.text for ent in doc.ents if ent.label_ in ['PERSON', 'ORG', 'EVENT', 'WORK_OF_ART']]
+
+        # Extract common topics from keywords
+        keywords = []
+        for token in doc:
+            if token.pos_ in ['NOUN', 'PROPN'] and not token.is_stop:
+                keywords.append(token.lemma_.lower())
+
+        # Count keyword frequency
+        keyword_counts = Counter(keywords)
+        top_keywords = [word for word, count in keyword_counts.most_common(5)]
+
+        themes.extend(top_keywords[:3])  # Top 3 themes
+
+        return themes
+
+    def _calculate_complexity_score(self, word_scores: Dict[str, Any]) -> float:
+        """Calculate overall complexity score (0-1)"""
+        if not word_scores:
+            return 0.0
+
+        avg_difficulty = sum(
+            score['difficulty_score'] 
+            for score in word_scores.values()
+        ) / len(word_scores)
+
+        # Normalize to 0-1
+        return min(1.0, avg_difficulty / 100.0)
+
+    def _calculate_lexical_diversity(self, word_scores: Dict[str, Any]) -> float:
+        """Calculate lexical diversity (unique words / total words)"""
+        if not word_scores:
+            return 0.0
+
+        total_occurrences = sum(score.get('count', 1) for score in word_scores.values())
+        unique_words = len(word_scores)
+
+        if total_occurrences == 0:
+            return 0.0
+
+        return unique_words / total_occurrences
+
+    def _calculate_sophistication_score(self, word_scores: Dict[str, Any]) -> float:
+        """Calculate vocabulary sophistication (proportion of advanced words)"""
+        if not word_scores:
+            return 0.0
+
+        advanced_count = sum(
+            1 for score in word_scores.values()
+            if score.get('difficulty_score', 50) >= 60
+        )
+
+        return advanced_count / len(word_scores)
+
+    def _calculate_pos_distribution(self, word_scores: Dict[str, Any]) -> Dict[str, int]:
+        """Calculate part of speech distribution"""
+        pos_dist = {}
+        for score in word_scores.values():
+            pos = score.get('pos', 'UNKNOWN')
+            pos_dist[pos] = pos_dist.get(pos, 0) + 1
+        return pos_dist
+
+    def _categorize_words(
+        self, 
+        word_scores: Dict[str, Any], 
+        vocabulary_level: str
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Categorize words into:
+        - uses_well: Words at or above student's grade level used correctly
+        - needs_practice: Words below level or used incorrectly (gaps)
+        - to_master: Words slightly above level for growth
+
+        Args:
+            word_scores: Dictionary of word -> score data
+            vocabulary_level: Student's overall vocabulary level (e.g., '6-7')
+
+        Returns:
+            Dictionary with categorized word lists
+        """
+        if not word_scores:
+            return {
+                'uses_well': [],
+                'needs_practice': [],
+                'to_master': []
+            }
+
+        # Get difficulty range for student's grade level
+        student_min, student_max = self.grade_level_to_difficulty_range(vocabulary_level)
+        student_avg = (student_min + student_max) / 2
+
+        # Get next grade level range for "to_master"
+        next_grades = self.get_next_grade_levels(vocabulary_level)
+        if next_grades:
+            next_min, next_max = self.grade_level_to_difficulty_range(next_grades[0])
+        else:
+            # If at 12+, use a higher range
+            next_min, next_max = (65, 75)
+
+        uses_well = []
+        needs_practice = []
+        to_master = []
+
+        for word, score_data in word_scores.items():
+            difficulty = score_data.get('difficulty_score', 50)
+            frequency = score_data.get('frequency', 0)
+
+            word_info = {
+                'word': word,
+                'difficulty_score': difficulty,
+                'grade_level': self.difficulty_to_grade_level(difficulty),
+                'relic_type': score_data.get('relic_type', 'echo'),
+                'frequency': frequency,
+                'pos': score_data.get('pos', 'UNKNOWN'),
+                'count': score_data.get('count', 1)
+            }
+
+            # Categorize based on difficulty relative to student level
+            if difficulty >= student_min:
+                # Word is at or above student's level - they use it well
+                uses_well.append(word_info)
+            elif difficulty < student_min - 10:
+                # Word is significantly below student's level - gap/needs practice
+                # But only if it's a common word they should know
+                if frequency > 1000:  # Common word they should know
+                    needs_practice.append(word_info)
+                else:
+                    # Rare word below level - might be intentional simple word
+                    pass
+            else:
+                # Word is slightly below level - could be a gap
+                if frequency > 500:  # Common enough they should know it
+                    needs_practice.append(word_info)
+
+            # Words to master: in the next grade level range
+            if next_min <= difficulty <= next_max:
+                # Don't duplicate - if already in uses_well, don't add to to_master
+                if difficulty < student_min or word_info not in uses_well:
+                    to_master.append(word_info)
+
+        # Sort each category by difficulty (descending for uses_well, ascending for others)
+        uses_well.sort(key=lambda x: x['difficulty_score'], reverse=True)
+        needs_practice.sort(key=lambda x: x['difficulty_score'])
+        to_master.sort(key=lambda x: x['difficulty_score'])
+
+        return {
+            'uses_well': uses_well[:20],  # Top 20 words used well
+            'needs_practice': needs_practice[:15],  # Top 15 gaps
+            'to_master': to_master[:10]  # Top 10 growth words
+        }
+
+
+def legacy_analysis(profiler: PerMetricProfiler, doc) -> dict:
+    """The metric stage as it ran before ProfileAccumulator (one scan per metric)"""
+    words_data = profiler._extract_words(doc)
+    word_scores = {}
+    scores = profiler.dataset_loader.score_many([word_info['word'] for word_info in words_data])
+    for word_info, (difficulty, relic_type) in zip(words_data, scores):
+        word_scores[word_info['word']] = {
+            'difficulty_score': difficulty,
+            'relic_type': relic_type,
+            'frequency': profiler.dataset_loader.get_word_frequency(word_info['word']),
+            'pos': word_info.get('pos', 'UNKNOWN'),
+            'count': word_info.get('count', 1)
+        }
+    vocabulary_level = profiler._calculate_vocabulary_level(word_scores)
+    word_categories = profiler._categorize_words(word_scores, vocabulary_level)
+    resonance_data = {
+        'vocabulary_level': vocabulary_level,
+        'total_words': len(words_data),
+        'unique_words': len(word_scores),
+        'relic_distribution': profiler._calculate_relic_distribution(word_scores),
+        'themes': profiler._extract_themes(doc),
+        'complexity_score': profiler._calculate_complexity_score(word_scores),
+        'lexical_diversity': profiler._calculate_lexical_diversity(word_scores),
+        'sophistication_score': profiler._calculate_sophistication_score(word_scores),
+        'pos_distribution': profiler._calculate_pos_distribution(word_scores),
+        'word_categories': word_categories
+    }
+    return {
+        'word_scores': word_scores,
+        'resonance_data': resonance_data,
+        'vocabulary_level': vocabulary_level,
+        'word_categories': word_categories
+    }
+
+
+def single_pass_analysis(profiler: PerMetricProfiler, doc) -> dict:
+    accumulator = ProfileAccumulator(profiler.dataset_loader)
+    accumulator.add_doc(doc)
+    return accumulator.result()
+
+
+def time_per_doc(analyze, profiler, docs, rounds: int) -> list:
+    """Best-of-rounds milliseconds per doc"""
+    timings = []
+    for doc in docs:
+        best = float('inf')
+        for _ in range(rounds):
+            start = time.perf_counter()
+            analyze(profiler, doc)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark profiler metric aggregation")
+    parser.add_argument('--words', type=int, default=5000, help="Tokens per essay")
+    parser.add_argument('--essays', type=int, default=20, help="Number of essays")
+    parser.add_argument('--rounds', type=int, default=5, help="Timing rounds per essay (best is kept)")
+    parser.add_argument('--data-dir', type=str, default="data", help="COCA/Lexile dataset directory")
+    args = parser.parse_args()
+
+    # The metric stage never touches the spaCy model
+    profiler = object.__new__(PerMetricProfiler)
+    profiler.dataset_loader = DatasetLoader(data_dir=args.data_dir)
+
+    coca_data = profiler.dataset_loader.coca_data
+    vocabulary = sorted(coca_data, key=coca_data.get, reverse=True)[:20000]
+    if len(vocabulary) < 100:
+        vocabulary = synthetic_vocabulary(20000)
+    docs = build_essays(vocabulary, args.essays, args.words)
+
+    # Warm the difficulty cache so both paths time aggregation, not first lookups
+    for doc in docs:
+        # Comparing the JSON also checks dict key order
+        if json.dumps(legacy_analysis(profiler, doc)) != json.dumps(single_pass_analysis(profiler, doc)):
+            print("ERROR: single-pass analysis differs from the per-metric methods")
+            sys.exit(1)
+
+    legacy = time_per_doc(legacy_analysis, profiler, docs, args.rounds)
+    single_pass = time_per_doc(single_pass_analysis, profiler, docs, args.rounds)
+
+    unique = statistics.mean(len(profiler._extract_words(doc)) for doc in docs)
+    print(f"{args.essays} essays x {args.words} tokens (~{unique:.0f} unique words each), dataset {profiler.dataset_loader.version}")
+    print(f"{'path':<12} {'mean (ms)':>10} {'p50 (ms)':>10} {'max (ms)':>10}")
+    for name, timings in (('per-metric', legacy), ('single-pass', single_pass)):
+        print(f"{name:<12} {statistics.mean(timings):>10.2f} {statistics.median(timings):>10.2f} {max(timings):>10.2f}")
+    print(f"\nSpeedup: {statistics.mean(legacy) / statistics.mean(single_pass):.2f}x (identical output)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Recommender Benchmark
+Times WordRecommender.recommend_words against a synthetic word pool and
+counts how many StoryProfiler instances each call constructs.
+
+Usage:
+    python scripts/bench_recommender.py --pool-size 500 --iterations 50
+"""
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.word_cache import get_word_pool_cache
+from nlp import profiler as profiler_module
+from nlp.recommender import WordRecommender
+
+RELIC_TYPES = ['whisper', 'echo', 'resonance', 'thunder']
+
+
+def build_word_pool(size: int, seed: int = 42) -> list:
+    """Synthetic words table rows spread across the 20-90 difficulty range"""
+    rng = random.Random(seed)
+    pool = []
+    for i in range(size):
+        difficulty = rng.randint(20, 90)
+        pool.append({
+            'word': f'word{i}',
+            'difficulty_score': difficulty,
+            'relic_type': RELIC_TYPES[min(3, difficulty // 25)],
+            'definition': f'definition of word{i}',
+            'example': f'An example using word{i}.',
+            'coca_frequency': rng.randint(100, 20000)
+        })
+    return pool
+
+
+def build_profile(grade_level: str = '4-5') -> dict:
+    """Minimal student profile (no spaCy parse needed)"""
+    word_scores = {
+        f'known{i}': {'difficulty_score': 20 + i, 'relic_type': 'echo', 'pos': 'NOUN', 'count': 1}
+        for i in range(30)
+    }
+    return {
+        'word_scores': word_scores,
+        'resonance_data': {
+            'vocabulary_level': grade_level,
+            'complexity_score': 0.4,
+            'themes': ['game', 'friend']
+        }
+    }
+
+
+def count_profiler_inits():
+    """Wrap StoryProfiler.__init__ so constructions can be counted"""
+    counter = {'inits': 0}
+    original_init = profiler_module.StoryProfiler.__init__
+
+    def counting_init(self, *args, **kwargs):
+        counter['inits'] += 1
+        original_init(self, *args, **kwargs)
+
+    profiler_module.StoryProfiler.__init__ = counting_init
+    return counter
+
+
+async def run_benchmark(pool_size: int, iterations: int, count: int):
+    recommender = WordRecommender()
+    pool = build_word_pool(pool_size)
+
+    # Serve the synthetic pool through the word cache instead of querying Supabase
+    word_cache = get_word_pool_cache()
+    word_cache.load(pool)
+    word_cache.ttl_seconds = float('inf')
+    profile = build_profile()
+    counter = count_profiler_inits()
+
+    # Warm up dataset loading so it is not included in the timings
+    await recommender.recommend_words(profile, count=count)
+    counter['inits'] = 0
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await recommender.recommend_words(profile, count=count)
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    mean_ms = sum(timings) / len(timings) * 1000
+    p50_ms = timings[len(timings) // 2] * 1000
+    p95_ms = timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000
+
+    print(f"Pool size:              {pool_size}")
+    print(f"Iterations:             {iterations}")
+    print(f"Mean latency:           {mean_ms:.2f} ms")
+    print(f"p50 latency:            {p50_ms:.2f} ms")
+    print(f"p95 latency:            {p95_ms:.2f} ms")
+    print(f"StoryProfiler inits:    {counter['inits'] / iterations:.1f} per call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WordRecommender.recommend_words")
+    parser.add_argument('--pool-size', type=int, default=500, help="Number of words in the synthetic pool")
+    parser.add_argument('--iterations', type=int, default=50, help="Timed recommend_words calls")
+    parser.add_argument('--count', type=int, default=7, help="Words to recommend per call")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run_benchmark(args.pool_size, args.iterations, args.count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Batched SM-2 Benchmark
+Times the batched scheduler (nlp/srs_batch.py) against SM2Algorithm one event
+at a time on a synthetic review log, and checks the results are identical.
+
+Usage:
+    python scripts/bench_srs_batch.py --events 1000000 --cards 150000
+    python scripts/bench_srs_batch.py --scalar-events 200000   # cap the slow scalar run
+"""
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from nlp.srs_batch import forecast_due_counts, next_review_batch, replay_review_log, replay_review_log_scalar
+
+QUALITY_WEIGHTS = [0.05, 0.05, 0.1, 0.2, 0.35, 0.25]
+
+
+def build_log(events: int, cards: int, seed: int = 42):
+    """
+    Synthetic year of reviews, in chronological order
+    Each card is reviewed on its due day (as a student would be prompted to),
+    with qualities skewed toward successful recall
+    """
+    rng = np.random.default_rng(seed)
+    today = date.today().toordinal()
+    ease_factor = np.full(cards, 2.5)
+    interval = np.ones(cards, dtype=np.int64)
+    repetitions = np.zeros(cards, dtype=np.int64)
+    due_day = rng.integers(today - 365, today, cards)  # First review
+
+    card_ids, qualities, review_days = [], [], []
+    active = np.arange(cards)
+    total = 0
+    while total < events and len(active):
+        quality = rng.choice(6, size=len(active), p=QUALITY_WEIGHTS)
+        card_ids.append(active)
+        qualities.append(quality)
+        review_days.append(due_day[active])
+        total += len(active)
+        ease_factor[active], interval[active], repetitions[active], due_day[active] = next_review_batch(
+            ease_factor[active], interval[active], repetitions[active], quality, due_day[active]
+        )
+        active = active[due_day[active] < today]
+
+    card_ids, qualities, review_days = (np.concatenate(column)[:events] for column in (card_ids, qualities, review_days))
+    order = np.argsort(review_days, kind='stable')
+    return card_ids[order], qualities[order], review_days[order]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched vs scalar SM-2 scheduling")
+    parser.add_argument('--events', type=int, default=1_000_000, help="Review events in the log")
+    parser.add_argument('--cards', type=int, default=150_000, help="Distinct (student, word) cards")
+    parser.add_argument('--scalar-events', type=int, default=None, help="Only time the scalar replay on this many events")
+    parser.add_argument('--forecast-days', type=int, default=30, help="Days in the class forecast")
+    args = parser.parse_args()
+
+    card_ids, quality, review_day = build_log(args.events, args.cards)
+
+    start = time.perf_counter()
+    state = replay_review_log(card_ids, quality, review_day)
+    batched_seconds = time.perf_counter() - start
+
+    # The scalar replay is slow, so it can run on a prefix of the cards
+    if args.scalar_events and args.scalar_events < len(card_ids):
+        cutoff = np.sort(card_ids)[args.scalar_events]
+        subset = card_ids < cutoff
+    else:
+        subset = np.ones(len(card_ids), dtype=bool)
+    start = time.perf_counter()
+    expected = replay_review_log_scalar(card_ids[subset].tolist(), quality[subset].tolist(), review_day[subset].tolist())
+    scalar_seconds = time.perf_counter() - start
+    scalar_events = int(subset.sum())
+
+    mismatches = sum(
+        1 for card, data in expected.items()
+        if state['ease_factor'][card] != data.ease_factor
+        or state['interval'][card] != data.interval
+        or state['repetitions'][card] != data.repetitions
+        or state['due_day'][card] != data.due_date.toordinal()
+    )
+
+    start = time.perf_counter()
+    counts = forecast_due_counts(
+        state['ease_factor'], state['interval'], state['repetitions'], state['due_day'],
+        start_day=date.today().toordinal(), days=args.forecast_days
+    )
+    forecast_seconds = time.perf_counter() - start
+
+    batched_rate = len(card_ids) / batched_seconds
+    scalar_rate = scalar_events / scalar_seconds
+    print(f"{len(card_ids)} events, {args.cards} cards (longest history {int(state['reviews'].max())} reviews)")
+    print(f"{'scheduler':<10} {'events':>10} {'seconds':>9} {'events/sec':>12}")
+    print(f"{'scalar':<10} {scalar_events:>10} {scalar_seconds:>9.2f} {scalar_rate:>12,.0f}")
+    print(f"{'batched':<10} {len(card_ids):>10} {batched_seconds:>9.2f} {batched_rate:>12,.0f}")
+    print(f"\nSpeedup: {batched_rate / scalar_rate:.1f}x")
+    print(f"{args.forecast_days}-day forecast for {args.cards} cards: {forecast_seconds * 1000:.1f} ms (day 1: {counts[0]} due)")
+
+    if mismatches:
+        print(f"\nERROR: {mismatches} of {len(expected)} cards differ from the scalar scheduler")
+        sys.exit(1)
+    print(f"\nAll {len(expected)} checked cards identical to the scalar scheduler")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+JSON Transcript Benchmark
+Times parsing of a large synthetic diarization export with json.loads and
+with the incremental reader TranscriptParser switches to above
+TRANSCRIPT_JSON_INCREMENTAL_CHARS, and reports the peak memory each
+allocates. It checks that both give the same result.
+
+Usage:
+    python scripts/bench_transcript_json.py --mb 20
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nlp import transcript_parser
+from nlp.transcript_parser import TranscriptParser
+
+WORDS = (
+    "the a we so then it is was because really think about story why character "
+    "happened next first tell me more what did you notice chapter"
+).split()
+
+
+def build_export(megabytes: float, seed: int = 42) -> str:
+    """Segments with speaker, text and per-word timings, like a recording tool export"""
+    rng = random.Random(seed)
+    segments = []
+    size = 0
+    start = 0.0
+    while size < megabytes * 1_000_000:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(4, 30))]
+        segment = {
+            'speaker': rng.choice(['Teacher', 'Maya', 'Teacher', 'Leo']),
+            'start': round(start, 2),
+            'end': round(start + len(words) * 0.4, 2),
+            'text': ' '.join(words).capitalize() + '.',
+            'words': [{'word': word, 'confidence': round(rng.random(), 3)} for word in words]
+        }
+        start += len(words) * 0.4 + 0.5
+        segments.append(segment)
+        size += len(json.dumps(segment))
+    return json.dumps({'metadata': {'tool': 'recorder', 'language': 'en'}, 'transcript': segments})
+
+
+def measure(fn):
+    """(result, seconds, peak MB allocated)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON transcript parsing")
+    parser.add_argument('--mb', type=float, default=20, help="Export size in megabytes")
+    args = parser.parse_args()
+
+    export = build_export(args.mb)
+    parse_json = lambda: TranscriptParser()._try_parse_json(export)
+
+    transcript_parser.JSON_INCREMENTAL_CHARS = len(export)
+    expected, loads_seconds, loads_mb = measure(parse_json)
+    transcript_parser.JSON_INCREMENTAL_CHARS = 0
+    result, reader_seconds, reader_mb = measure(parse_json)
+    if result != expected:
+        print("ERROR: incremental reader parsed the export differently from json.loads")
+        sys.exit(1)
+
+    print(f"{len(export) / 1e6:.1f} MB export, {len(result['speakers'])} speakers")
+    print(f"{'path':<12} {'seconds':>8} {'peak MB':>8}")
+    print(f"{'json.loads':<12} {loads_seconds:>8.2f} {loads_mb:>8.1f}")
+    print(f"{'incremental':<12} {reader_seconds:>8.2f} {reader_mb:>8.1f}")
+    print("\nResults identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Transcript Parser Benchmark
+Times speaker-label parsing of large synthetic classroom transcripts: the
+previous pattern-by-pattern scan and the current single-pass scanner in
+TranscriptParser. It checks that both give the same result.
+
+Usage:
+    python scripts/bench_transcript_parser.py --mb 4
+    python scripts/bench_transcript_parser.py --mb 16 --rounds 1
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nlp.transcript_parser import TranscriptParser
+
+
+FLEXIBLE_PATTERNS = [r'(\w+):\s*', r'\[(\w+)\]:\s*', r'<(\w+)>\s*', r'(\w+)\s*-\s*']
+
+LABEL_FORMATS = {
+    'colon': '{name}: {text}\n',
+    'bracket': '[{name}]: {text}\n',
+    'angle': '<{name}> {text}\n',
+    'dash': '{name} - {text}\n',
+    'unlabeled': '{text}\n',
+}
+
+WORDS = (
+    "the a we so then it is was because really think about story why character "
+    "happened next first well-known tell me more what did you notice chapter"
+).split()
+
+
+def pattern_scan_labeled(transcript: str):
+    """Previous _try_parse_labeled: one finditer per pattern, the winner run twice"""
+    transcript = transcript.strip()
+    found_pattern = None
+    for pattern in FLEXIBLE_PATTERNS:
+        if list(re.finditer(pattern, transcript, re.IGNORECASE)):
+            found_pattern = pattern
+            break
+    if not found_pattern:
+        return None
+
+    speaker_texts = defaultdict(list)
+    matches = list(re.finditer(found_pattern, transcript, re.IGNORECASE))
+    for i, match in enumerate(matches):
+        end_pos = matches[i + 1].start() if i + 1 < len(matches) else len(transcript)
+        text = transcript[match.end():end_pos].strip()
+        if text:
+            speaker_texts[match.group(1).strip()].append(text)
+    if not speaker_texts:
+        return None
+
+    speakers = []
+    for name, texts in speaker_texts.items():
+        combined_text = ' '.join(texts)
+        speakers.append({'name': name, 'text': combined_text, 'word_count': len(combined_text.split())})
+    return {'format_detected': 'labeled', 'speakers': speakers, 'raw_text': transcript}
+
+
+def build_transcript(label_format: str, megabytes: float, seed: int = 42) -> str:
+    """Alternating teacher/student turns of random words until the size is reached"""
+    rng = random.Random(seed)
+    template = LABEL_FORMATS[label_format]
+    names = ['Teacher', 'Student', 'Teacher', 'Maya']
+    lines = []
+    size = 0
+    while size < megabytes * 1_000_000:
+        text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 30)))
+        if label_format == 'unlabeled':
+            text = text.replace('-', ' ')  # A hyphen would read as a "Speaker - " label
+        line = template.format(name=rng.choice(names), text=text.capitalize() + '.')
+        lines.append(line)
+        size += len(line)
+    return ''.join(lines)
+
+
+def time_ms(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcript speaker-label parsing")
+    parser.add_argument('--mb', type=float, default=4, help="Transcript size in megabytes")
+    parser.add_argument('--rounds', type=int, default=3, help="Timed repetitions")
+    args = parser.parse_args()
+
+    transcript_parser = TranscriptParser()
+    print(f"{args.mb:g} MB transcripts")
+    print(f"{'format':<10} {'speakers':>8} {'previous ms':>12} {'scanner ms':>11} {'speedup':>8}")
+    for label_format in LABEL_FORMATS:
+        transcript = build_transcript(label_format, args.mb)
+        expected = pattern_scan_labeled(transcript)
+        result = transcript_parser._try_parse_labeled(transcript)
+        if result != expected:
+            print(f"ERROR: {label_format} transcript parsed differently from the pattern-by-pattern scan")
+            sys.exit(1)
+
+        previous = time_ms(lambda: pattern_scan_labeled(transcript), args.rounds)
+        current = time_ms(lambda: transcript_parser._try_parse_labeled(transcript), args.rounds)
+        speakers = len(result['speakers']) if result else 0
+        print(f"{label_format:<10} {speakers:>8} {previous:>12.1f} {current:>11.1f} {previous / current:>7.2f}x")
+
+    print("\nAll results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ Supports multiple COCA data formats:
 - CSV files (word, frequency)
 - TXT files (word frequency)
 - TSV files
+
+Optionally compiles the JSON datasets into the memory-mapped lexicon
+(data/lexicon.bin) that DatasetLoader prefers at startup.
 """
 
 import json
@@ -21,6 +24,11 @@ logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / 'data'
 
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nlp.lexicon import Lexicon, LEXICON_FILENAME
+
 def process_coca_csv(csv_path: Path, output_path: Path) -> bool:
     """Process COCA CSV file"""
     if not csv_path.exists():
@@ -128,6 +136,31 @@ def process_coca_txt(txt_path: Path, output_path: Path) -> bool:
         logger.error(f"Failed to process TXT: {e}")
         return False
 
+def build_lexicon(coca_path: Path, lexile_path: Path, output_path: Path) -> bool:
+    """Compile coca_frequency.json and lexile_scores.json into a binary lexicon"""
+    if not coca_path.exists() and not lexile_path.exists():
+        logger.error(f"No datasets found to compile ({coca_path}, {lexile_path})")
+        return False
+    
+    try:
+        coca_data = {}
+        if coca_path.exists():
+            with open(coca_path, 'r', encoding='utf-8') as f:
+                coca_data = json.load(f)
+        
+        lexile_data = {}
+        if lexile_path.exists():
+            with open(lexile_path, 'r', encoding='utf-8') as f:
+                lexile_data = json.load(f)
+        
+        count = Lexicon.build(coca_data, lexile_data, output_path)
+        logger.info(f"Compiled {count} words ({len(coca_data)} COCA, {len(lexile_data)} Lexile) into {output_path}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to build lexicon: {e}")
+        return False
+
 def main():
     """Main function to process COCA data files"""
     import argparse
@@ -138,6 +171,7 @@ def main():
     parser.add_argument(
         'input_file',
         type=str,
+        nargs='?',
         help='Path to COCA data file (CSV, TXT, or TSV)'
     )
     parser.add_argument(
@@ -146,9 +180,24 @@ def main():
         default=str(DATA_DIR / 'coca_frequency.json'),
         help='Output JSON file path'
     )
+    parser.add_argument(
+        '--build-lexicon',
+        action='store_true',
+        help=f'Compile the JSON datasets into data/{LEXICON_FILENAME} for memory-mapped loading'
+    )
     
     args = parser.parse_args()
     
+    if args.input_file is None:
+        if not args.build_lexicon:
+            parser.error("input_file is required unless --build-lexicon is given")
+        success = build_lexicon(
+            DATA_DIR / 'coca_frequency.json',
+            DATA_DIR / 'lexile_scores.json',
+            DATA_DIR / LEXICON_FILENAME
+        )
+        sys.exit(0 if success else 1)
+    
     input_path = Path(args.input_file)
     output_path = Path(args.output)
     
@@ -171,6 +220,15 @@ def main():
     if success:
         logger.info(f"Successfully processed {input_path}")
         logger.info(f"Output saved to: {output_path}")
+        
+        if args.build_lexicon:
+            success = build_lexicon(
+                output_path,
+                output_path.parent / 'lexile_scores.json',
+                output_path.parent / LEXICON_FILENAME
+            )
+            if not success:
+                sys.exit(1)
     else:
         logger.error("Failed to process file")
         sys.exit(1)
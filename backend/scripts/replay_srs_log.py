@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+SRS Review Log Replay
+Recomputes every card's SM-2 schedule from a review log using the batched
+scheduler (nlp/srs_batch.py), e.g. after a scheduling bug fix or to audit
+srs_progress against the raw review history.
+
+The log is a CSV with columns: student_id, word_id, quality, reviewed_at
+(ISO date or timestamp). The output CSV has one row per (student_id, word_id)
+with the columns of the srs_progress table.
+
+Usage:
+    python scripts/replay_srs_log.py reviews.csv -o schedules.csv
+    python scripts/replay_srs_log.py reviews.csv -o schedules.csv --verify
+"""
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from nlp.srs_batch import from_ordinal_day, replay_review_log, replay_review_log_scalar, to_ordinal_days
+
+
+def read_log(path: str):
+    """Review log -> (card keys, card index per event, quality, review day)"""
+    card_index = {}
+    cards = []
+    qualities = []
+    dates = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            key = (row['student_id'], row['word_id'])
+            cards.append(card_index.setdefault(key, len(card_index)))
+            qualities.append(int(row['quality']))
+            dates.append(row['reviewed_at'])
+    return (
+        list(card_index),
+        np.array(cards, dtype=np.int64),
+        np.array(qualities, dtype=np.int64),
+        to_ordinal_days(dates)
+    )
+
+
+def write_schedules(path: str, keys: list, state: dict):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['student_id', 'word_id', 'ease_factor', 'interval', 'repetitions', 'due_date', 'last_reviewed', 'reviews'])
+        for index, (student_id, word_id) in enumerate(keys):
+            writer.writerow([
+                student_id,
+                word_id,
+                repr(float(state['ease_factor'][index])),
+                int(state['interval'][index]),
+                int(state['repetitions'][index]),
+                from_ordinal_day(state['due_day'][index]).isoformat(),
+                from_ordinal_day(state['last_reviewed_day'][index]).isoformat(),
+                int(state['reviews'][index])
+            ])
+
+
+def verify(cards: np.ndarray, quality: np.ndarray, review_day: np.ndarray, state: dict) -> int:
+    """Replay with the scalar SM2Algorithm and count cards that differ"""
+    expected = replay_review_log_scalar(cards.tolist(), quality.tolist(), review_day.tolist())
+    mismatches = 0
+    for card, data in expected.items():
+        if (
+            state['ease_factor'][card] != data.ease_factor
+            or state['interval'][card] != data.interval
+            or state['repetitions'][card] != data.repetitions
+            or state['due_day'][card] != data.due_date.toordinal()
+        ):
+            mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an SRS review log with the batched SM-2 scheduler")
+    parser.add_argument('log', type=str, help="Review log CSV (student_id, word_id, quality, reviewed_at)")
+    parser.add_argument('-o', '--output', type=str, required=True, help="Output CSV of recomputed schedules")
+    parser.add_argument('--verify', action='store_true', help="Also replay with the scalar scheduler and compare")
+    args = parser.parse_args()
+
+    keys, cards, quality, review_day = read_log(args.log)
+    print(f"Loaded {len(cards)} reviews of {len(keys)} cards")
+
+    start = time.perf_counter()
+    state = replay_review_log(cards, quality, review_day)
+    print(f"Replayed in {time.perf_counter() - start:.2f}s")
+
+    write_schedules(args.output, keys, state)
+    print(f"Wrote {len(keys)} schedules to {args.output}")
+
+    if args.verify:
+        mismatches = verify(cards, quality, review_day, state)
+        if mismatches:
+            print(f"ERROR: {mismatches} cards differ from the scalar scheduler")
+            sys.exit(1)
+        print("Verified: identical to the scalar scheduler")
+
+
+if __name__ == "__main__":
+    main()
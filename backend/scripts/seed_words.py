@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from db.words import create_word
+from db.word_cache import WORD_CACHE_TTL
 from db.supabase_client import get_supabase_client
 from nlp.dataset_loader import get_dataset_loader
 
@@ -85,6 +86,9 @@ async def seed_words_from_datasets(limit: int = 1000):
     print(f"\nSeeding complete!")
     print(f"  - Seeded: {seeded_count} words")
     print(f"  - Skipped: {skipped_count} words")
+    
+    # Running API servers notice the new rows on their next word cache check
+    print(f"  - Running servers will pick up new words within {int(WORD_CACHE_TTL)}s (WORD_CACHE_TTL)")
 
 async def main():
     """Main function"""
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+SRS Scheduler Simulator
+Compares the SRS schedulers (nlp/schedulers.py) on simulated students:
+reviews needed, recall rate at review time and retention at the end.
+
+Cards are introduced on the days they first appear in a review log
+(student_id, word_id, quality, reviewed_at; the format replay_srs_log.py
+reads), or spread evenly over the first days of the period without a log.
+Recall is simulated with a perturbed FSRS memory model (nlp/srs_simulation.py).
+
+Usage:
+    python scripts/simulate_schedulers.py --cards 2000 --days 365
+    python scripts/simulate_schedulers.py --log reviews.csv --days 180
+    python scripts/simulate_schedulers.py --fsrs-weights 0.41,1.18,...  # fitted parameters
+"""
+import argparse
+import csv
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nlp.schedulers import FSRSScheduler, SM2Scheduler
+from nlp.srs_simulation import introductions_from_log, simulate, true_memory_model
+
+def read_introductions(path: str):
+    """Introduction day of every (student, word) card in a review log"""
+    with open(path, newline='', encoding='utf-8') as f:
+        events = (
+            ((row['student_id'], row['word_id']), date.fromisoformat(row['reviewed_at'][:10]).toordinal())
+            for row in csv.DictReader(f)
+        )
+        return introductions_from_log(events)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SRS schedulers on simulated students")
+    parser.add_argument('--log', type=str, default=None, help="Review log CSV to take card introduction days from")
+    parser.add_argument('--cards', type=int, default=2000, help="Cards to simulate without a log")
+    parser.add_argument('--intro-days', type=int, default=60, help="Days over which cards are introduced without a log")
+    parser.add_argument('--days', type=int, default=365, help="Days simulated after the first introduction")
+    parser.add_argument('--truth-noise', type=float, default=0.2, help="Perturbation of the true memory model's weights")
+    parser.add_argument('--retention', type=float, nargs='+', default=[0.9, 0.95, 0.97],
+                        help="FSRS desired retention(s) to simulate")
+    parser.add_argument('--fsrs-weights', type=str, default=None, help="17 comma-separated FSRS weights to test")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.log:
+        introductions, _ = read_introductions(args.log)
+        start_day = min(introductions)
+    else:
+        start_day = date.today().toordinal()
+        introductions = [start_day + card * args.intro_days // args.cards for card in range(args.cards)]
+    end_day = start_day + args.days
+
+    weights = [float(weight) for weight in args.fsrs_weights.split(',')] if args.fsrs_weights else None
+    schedulers = [('sm2', SM2Scheduler())] + [
+        (f"fsrs@{retention:g}", FSRSScheduler(weights, desired_retention=retention)) for retention in args.retention
+    ]
+    truth = true_memory_model(args.truth_noise, seed=args.seed)
+
+    print(f"{len(introductions)} cards over {args.days} days (truth noise {args.truth_noise})")
+    print(f"{'scheduler':<10} {'reviews':>9} {'per card':>9} {'recalled':>9} {'retention':>10} {'per retained':>13} {'seconds':>8}")
+    results = {}
+    for name, scheduler in schedulers:
+        start = time.perf_counter()
+        result = simulate(scheduler, introductions, end_day, truth, seed=args.seed)
+        seconds = time.perf_counter() - start
+        results[name] = result
+        print(
+            f"{name:<10} {result['reviews']:>9} {result['reviews_per_card']:>9.2f} "
+            f"{result['recall_rate']:>9.1%} {result['retention']:>10.1%} "
+            f"{result['reviews_per_retained_card']:>13.2f} {seconds:>8.2f}"
+        )
+
+    sm2 = results.pop('sm2')
+    print()
+    for name, result in results.items():
+        print(
+            f"{name} vs sm2: {result['reviews'] / sm2['reviews'] - 1:+.1%} reviews, "
+            f"{result['retention'] - sm2['retention']:+.1%} end retention"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Tests for the single-pass profile accumulator
+Checks ProfileAccumulator against fixed profiles of docs built without a
+trained spaCy model (the per-metric methods it replaced reproduce them, see
+scripts/bench_profiler_metrics.py)
+"""
+import json
+import random
+import pytest
+import spacy
+from spacy.tokens import Doc
+from nlp.accumulator import ProfileAccumulator
+from nlp.dataset_loader import DatasetLoader
+from nlp.profiler import StoryProfiler
+
+
+POS_TAGS = ['NOUN', 'PROPN', 'VERB', 'ADJ', 'ADV', 'NUM', 'PUNCT']
+STOP_WORDS = ['the', 'and', 'was', 'with', 'they', 'into', 'a', 'of']
+
+# Word frequencies and Lexile scores for the fixed profiles (other words use the heuristic estimate)
+COCA = {'cat': 20000, 'run': 4000, 'big': 700, 'tiny': 400, 'luminous': 40, 'cavern': 2}
+LEXILE = {
+    'cat': 100, 'run': 300, 'explorer': 900, 'ancient': 1100, 'luminous': 1400,
+    'crystal': 1000, 'discover': 800, 'quickly': 600
+}
+
+
+def summary(profile):
+    """Profile with word entries reduced to tuples, for compact expected values"""
+    resonance_data = dict(profile['resonance_data'])
+    categories = resonance_data.pop('word_categories')
+    return {
+        'word_scores': {
+            word: (score['difficulty_score'], score['relic_type'], score['frequency'], score['pos'], score['count'])
+            for word, score in profile['word_scores'].items()
+        },
+        'resonance_data': resonance_data,
+        'word_categories': {
+            category: [(entry['word'], entry['grade_level']) for entry in entries]
+            for category, entries in categories.items()
+        }
+    }
+
+
+class TestProfileAccumulator:
+    """Test suite for ProfileAccumulator"""
+
+    @pytest.fixture
+    def vocabulary(self):
+        """Synthetic words spread across every frequency band and Lexile range"""
+        rng = random.Random(7)
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        return [''.join(rng.choice(letters) for _ in range(rng.randint(1, 13))) for _ in range(600)]
+
+    @pytest.fixture(params=[300, 900, 1700])
+    def dataset_loader(self, request, tmp_path, vocabulary):
+        """Loader whose Lexile ceiling puts the synthetic essays at different grade levels"""
+        rng = random.Random(11)
+        coca = {}
+        lexile = {}
+        for word in vocabulary:
+            roll = rng.random()
+            if roll < 0.1:
+                coca[word] = rng.choice([2, 40, 400, 700, 4000, 20000, 20000])
+            elif roll < 0.98:
+                lexile[word] = rng.randint(0, request.param)
+            # Remaining words fall back to the heuristic estimate
+        (tmp_path / "coca_frequency.json").write_text(json.dumps(coca), encoding='utf-8')
+        (tmp_path / "lexile_scores.json").write_text(json.dumps(lexile), encoding='utf-8')
+        return DatasetLoader(data_dir=str(tmp_path))
+
+    @pytest.fixture
+    def fixed_loader(self, tmp_path):
+        (tmp_path / "coca_frequency.json").write_text(json.dumps(COCA), encoding='utf-8')
+        (tmp_path / "lexile_scores.json").write_text(json.dumps(LEXILE), encoding='utf-8')
+        return DatasetLoader(data_dir=str(tmp_path))
+
+    @pytest.fixture
+    def vocab(self):
+        return spacy.blank("en").vocab
+
+    def make_doc(self, vocab, vocabulary, length, seed):
+        rng = random.Random(seed)
+        words = []
+        for _ in range(length):
+            roll = rng.random()
+            if roll < 0.2:
+                words.append(rng.choice(STOP_WORDS))
+            elif roll < 0.25:
+                words.append(rng.choice(['42', 'x-ray', ',', 'ab']))
+            else:
+                words.append(rng.choice(vocabulary))
+        pos = [rng.choice(POS_TAGS) for _ in words]
+        # Lemmas differ in case so first-occurrence deduplication is exercised
+        lemmas = [word.upper() if rng.random() < 0.1 else word for word in words]
+        return Doc(vocab, words=words, pos=pos, lemmas=lemmas)
+
+    def profile(self, loader, doc):
+        accumulator = ProfileAccumulator(loader)
+        accumulator.add_doc(doc)
+        return accumulator.result()
+
+    def test_advanced_story(self, fixed_loader, vocab):
+        """Stop words, punctuation, numbers and short words are skipped; repeats keep their first entry"""
+        words = [
+            'The', 'explorer', 'run', 'quickly', 'into', 'the', 'ancient', 'cavern', 'and', 'discover',
+            'luminous', 'crystal', ',', 'tiny', 'cat', 'run', 'big', 'Cat', '42', 'ab', 'explorer', '.'
+        ]
+        pos = [
+            'DET', 'NOUN', 'VERB', 'ADV', 'ADP', 'DET', 'ADJ', 'NOUN', 'CCONJ', 'VERB',
+            'ADJ', 'NOUN', 'PUNCT', 'ADJ', 'NOUN', 'VERB', 'ADJ', 'PROPN', 'NUM', 'NOUN', 'NOUN', 'PUNCT'
+        ]
+        doc = Doc(vocab, words=words, pos=pos, lemmas=[word.lower() for word in words])
+        profile = self.profile(fixed_loader, doc)
+
+        assert summary(profile) == {
+            'word_scores': {
+                'explorer': (56, 'resonance', 0, 'NOUN', 1),
+                'run': (18, 'whisper', 4000, 'VERB', 1),
+                'quickly': (37, 'echo', 0, 'ADV', 1),
+                'ancient': (68, 'resonance', 0, 'ADJ', 1),
+                'cavern': (90, 'thunder', 2, 'NOUN', 1),
+                'discover': (50, 'resonance', 0, 'VERB', 1),
+                'luminous': (87, 'thunder', 40, 'ADJ', 1),
+                'crystal': (62, 'resonance', 0, 'NOUN', 1),
+                'tiny': (50, 'resonance', 400, 'ADJ', 1),
+                'cat': (6, 'whisper', 20000, 'NOUN', 1),
+                'big': (50, 'resonance', 700, 'ADJ', 1)
+            },
+            'resonance_data': {
+                'vocabulary_level': '12+',
+                'total_words': 11,
+                'unique_words': 11,
+                'relic_distribution': {'whisper': 2, 'echo': 1, 'resonance': 6, 'thunder': 2},
+                'themes': ['explorer', 'cat', 'cavern'],
+                'complexity_score': pytest.approx(0.5218181818181818),
+                'lexical_diversity': 1.0,
+                'sophistication_score': pytest.approx(4 / 11),
+                'pos_distribution': {'NOUN': 4, 'VERB': 2, 'ADV': 1, 'ADJ': 4}
+            },
+            'word_categories': {
+                'uses_well': [('cavern', '12+'), ('luminous', '12+'), ('ancient', '12+')],
+                'needs_practice': [('cat', 'K-1'), ('run', '2-3')],
+                'to_master': []
+            }
+        }
+        # Words keep first-occurrence order
+        assert list(profile['word_scores']) == [
+            'explorer', 'run', 'quickly', 'ancient', 'cavern', 'discover', 'luminous', 'crystal', 'tiny', 'cat', 'big'
+        ]
+        assert profile['vocabulary_level'] == '12+'
+        assert profile['word_categories'] is profile['resonance_data']['word_categories']
+        assert profile['word_categories']['uses_well'][0] == {
+            'word': 'cavern', 'difficulty_score': 90, 'grade_level': '12+', 'relic_type': 'thunder',
+            'frequency': 2, 'pos': 'NOUN', 'count': 1
+        }
+
+    def test_simple_story(self, fixed_loader, vocab):
+        """Common words below the student's level are gaps; rare ones just below it are not"""
+        words = ['My', 'cat', 'can', 'run', 'and', 'run', 'with', 'the', 'big', 'dog', 'quickly', '.']
+        pos = ['PRON', 'NOUN', 'AUX', 'VERB', 'CCONJ', 'VERB', 'ADP', 'DET', 'ADJ', 'NOUN', 'ADV', 'PUNCT']
+        doc = Doc(vocab, words=words, pos=pos, lemmas=[word.lower() for word in words])
+
+        assert summary(self.profile(fixed_loader, doc)) == {
+            'word_scores': {
+                'cat': (6, 'whisper', 20000, 'NOUN', 1),
+                'run': (18, 'whisper', 4000, 'VERB', 1),
+                'big': (50, 'resonance', 700, 'ADJ', 1),
+                'dog': (50, 'resonance', 0, 'NOUN', 1),
+                'quickly': (37, 'echo', 0, 'ADV', 1)
+            },
+            'resonance_data': {
+                'vocabulary_level': '8-9',
+                'total_words': 5,
+                'unique_words': 5,
+                'relic_distribution': {'whisper': 2, 'echo': 1, 'resonance': 2, 'thunder': 0},
+                'themes': ['cat', 'dog'],
+                'complexity_score': pytest.approx(0.322),
+                'lexical_diversity': 1.0,
+                'sophistication_score': 0.0,
+                'pos_distribution': {'NOUN': 2, 'VERB': 1, 'ADJ': 1, 'ADV': 1}
+            },
+            'word_categories': {
+                'uses_well': [('big', '8-9'), ('dog', '8-9')],
+                'needs_practice': [('cat', 'K-1'), ('run', '2-3')],
+                'to_master': []
+            }
+        }
+
+    def test_analyze_doc_uses_accumulator(self, dataset_loader, vocab, vocabulary):
+        """StoryProfiler._analyze_doc returns the accumulator's profile"""
+        profiler = object.__new__(StoryProfiler)
+        profiler.dataset_loader = dataset_loader
+        doc = self.make_doc(vocab, vocabulary, 200, 5)
+        assert profiler._analyze_doc(doc) == self.profile(dataset_loader, doc)
+
+    def test_empty_doc(self, dataset_loader, vocab):
+        """Docs with only stop words and punctuation produce an empty profile"""
+        doc = Doc(vocab, words=['the', 'and', ','], pos=['DET', 'CCONJ', 'PUNCT'])
+        categories = {'uses_well': [], 'needs_practice': [], 'to_master': []}
+        assert self.profile(dataset_loader, doc) == {
+            'word_scores': {},
+            'resonance_data': {
+                'vocabulary_level': 'K-1',
+                'total_words': 0,
+                'unique_words': 0,
+                'relic_distribution': {'whisper': 0, 'echo': 0, 'resonance': 0, 'thunder': 0},
+                'themes': [],
+                'complexity_score': 0.0,
+                'lexical_diversity': 0.0,
+                'sophistication_score': 0.0,
+                'pos_distribution': {},
+                'word_categories': categories
+            },
+            'vocabulary_level': 'K-1',
+            'word_categories': categories
+        }
+
+    def test_multiple_docs_match_single_doc(self, dataset_loader, vocab, vocabulary):
+        """Feeding a transcript in pieces gives the same profile as one doc"""
+        doc = self.make_doc(vocab, vocabulary, 1200, 6)
+        whole = ProfileAccumulator(dataset_loader)
+        whole.add_doc(doc)
+
+        pieces = ProfileAccumulator(dataset_loader)
+        for start in range(0, len(doc), 250):
+            pieces.add_doc(doc[start:start + 250])
+
+        assert pieces.result() == whole.result()
@@ -0,0 +1,111 @@
+"""
+Automated tests for the achievement rules and batched awarding
+"""
+import pytest
+from db import achievements as db_achievements
+from db import student_progress as db_progress
+from db.achievements import check_and_award_achievements, earned_achievements
+
+
+class FakeAchievementsTable:
+    """Supabase client with an achievements table, counting round trips"""
+
+    def __init__(self, awarded=()):
+        self.rows = [{'student_id': 's1', 'achievement_type': achievement_type} for achievement_type in awarded]
+        self.round_trips = []
+
+    def table(self, name):
+        assert name == 'achievements'
+        return Query(self)
+
+
+class Query:
+    def __init__(self, db):
+        self.db = db
+        self.action = None
+        self.filters = {}
+
+    def select(self, columns):
+        self.action = ('select', columns)
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def upsert(self, rows, on_conflict, ignore_duplicates):
+        assert (on_conflict, ignore_duplicates) == ('student_id,achievement_type', True)
+        self.action = ('upsert', rows)
+        return self
+
+    async def execute(self):
+        self.db.round_trips.append(self.action[0])
+        if self.action[0] == 'select':
+            data = [row for row in self.db.rows if row['student_id'] == self.filters['student_id']]
+        else:
+            existing = {(row['student_id'], row['achievement_type']) for row in self.db.rows}
+            data = [row for row in self.action[1] if (row['student_id'], row['achievement_type']) not in existing]
+            self.db.rows += data
+        return type('Result', (), {'data': data})()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    client = FakeAchievementsTable(awarded=['first_story'])
+    monkeypatch.setattr(db_achievements, 'get_async_client', lambda: client)
+    return client
+
+
+PROGRESS = {
+    'student_id': 's1', 'submission_count': 12, 'current_streak': 8,
+    'total_words_written': 1500, 'vocabulary_level': 'advanced'
+}
+
+
+class TestEarnedAchievements:
+    """Test suite for the achievement rule table"""
+
+    def test_rules(self):
+        assert earned_achievements(PROGRESS) == [
+            'first_story', 'streak_7', 'words_1000', 'vocabulary_master', 'consistent_writer'
+        ]
+
+    def test_missing_and_null_columns(self):
+        assert earned_achievements({}) == []
+        assert earned_achievements({'submission_count': None, 'vocabulary_level': None, 'total_words_written': 5000}) == [
+            'words_1000', 'words_5000'
+        ]
+
+    def test_rule_types_are_known(self):
+        for rule in db_achievements.ACHIEVEMENT_RULES:
+            assert rule.achievement_type in db_achievements.ACHIEVEMENT_TYPES
+
+
+class TestCheckAndAwardAchievements:
+    """Test suite for check_and_award_achievements"""
+
+    @pytest.mark.asyncio
+    async def test_one_read_one_batch_insert(self, db):
+        awarded = await check_and_award_achievements('s1', progress=PROGRESS)
+        assert [row['achievement_type'] for row in awarded] == [
+            'streak_7', 'words_1000', 'vocabulary_master', 'consistent_writer'
+        ]
+        assert db.round_trips == ['select', 'upsert']
+
+        # Nothing new the second time
+        assert await check_and_award_achievements('s1', progress=PROGRESS) == []
+        assert db.round_trips == ['select', 'upsert', 'select']
+
+    @pytest.mark.asyncio
+    async def test_nothing_earned_skips_database(self, db):
+        assert await check_and_award_achievements('s1', progress={'submission_count': 0}) == []
+        assert db.round_trips == []
+
+    @pytest.mark.asyncio
+    async def test_reads_progress_without_snapshot(self, db, monkeypatch):
+        async def get_progress(student_id):
+            return {'submission_count': 1}
+
+        monkeypatch.setattr(db_progress, 'get_progress', get_progress)
+        assert await check_and_award_achievements('s2') != []
+        assert db.round_trips == ['select', 'upsert']
@@ -0,0 +1,116 @@
+"""
+Tests for the transcript analysis cache
+"""
+import pytest
+from nlp.analysis_cache import AnalysisCache
+from nlp.executor import ProfilingExecutor
+
+
+def make_analysis(level='4-5', words=10):
+    return {
+        'word_scores': {f'word{i}': {'difficulty_score': 30 + i, 'relic_type': 'echo'} for i in range(words)},
+        'resonance_data': {'vocabulary_level': level},
+        'vocabulary_level': level,
+        'word_categories': {}
+    }
+
+
+class TestAnalysisCache:
+    """Test suite for AnalysisCache"""
+    
+    def test_round_trip_returns_copy(self):
+        """Hits return equal data that callers can modify freely"""
+        cache = AnalysisCache(max_bytes=1024 * 1024, disk_dir=None)
+        cache.put('k', make_analysis())
+        
+        first = cache.get('k')
+        assert first == make_analysis()
+        first['vocabulary_level'] = 'changed'
+        assert cache.get('k')['vocabulary_level'] == '4-5'
+        assert cache.hits == 2
+    
+    def test_key_includes_versions(self):
+        """Model or lexicon upgrades produce new keys"""
+        base = AnalysisCache.make_key('some text', 'model-1', 'lexicon-1')
+        assert base == AnalysisCache.make_key('some text', 'model-1', 'lexicon-1')
+        assert base != AnalysisCache.make_key('some text', 'model-2', 'lexicon-1')
+        assert base != AnalysisCache.make_key('some text', 'model-1', 'lexicon-2')
+        assert base != AnalysisCache.make_key('other text', 'model-1', 'lexicon-1')
+    
+    def test_evicts_least_recently_used_by_size(self):
+        """Total stored bytes stay under max_bytes"""
+        cache = AnalysisCache(max_bytes=3000, disk_dir=None)
+        for i in range(10):
+            cache.put(f'k{i}', make_analysis(words=10))
+            cache.get('k0')  # Keep k0 recently used
+        
+        assert cache.size_bytes <= 3000
+        assert cache.get('k0') is not None
+        assert cache.get('k1') is None
+        assert cache.get('k9') is not None
+    
+    def test_disk_tier(self, tmp_path):
+        """Entries evicted from memory (or written by another worker) are read back from disk"""
+        writer = AnalysisCache(max_bytes=1024 * 1024, disk_dir=str(tmp_path))
+        writer.put('k', make_analysis())
+        
+        reader = AnalysisCache(max_bytes=1024 * 1024, disk_dir=str(tmp_path))
+        assert reader.get('k') == make_analysis()
+        assert len(reader) == 1  # Promoted to memory
+    
+    def test_disk_tier_pruned(self, tmp_path):
+        """The disk tier is kept under its byte budget"""
+        cache = AnalysisCache(max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=5000)
+        for i in range(20):
+            cache.put(f'k{i}', make_analysis(words=10))
+        
+        total = sum(path.stat().st_size for path in tmp_path.iterdir())
+        assert total <= 5000
+        assert cache.get('k19') is not None
+
+
+class TestExecutorCaching:
+    """ProfilingExecutor consults the cache before using the pool"""
+    
+    @pytest.fixture
+    def executor(self):
+        executor = ProfilingExecutor(max_workers=0, cache=AnalysisCache(disk_dir=None))
+        executor.calls = []
+        
+        async def fake_submit(fn, *args):
+            executor.calls.append(args)
+            if len(args) == 2:
+                return [make_analysis(level=text[:3]) for text in args[0]]
+            return make_analysis(level=args[0][:3])
+        
+        executor._submit = fake_submit
+        return executor
+    
+    @pytest.mark.asyncio
+    async def test_repeat_transcript_hits_cache(self, executor):
+        """Identical (after cleaning) transcripts are analyzed once"""
+        text = "My favorite game is tag because it's exciting and fast."
+        first = await executor.analyze_transcript(text)
+        second = await executor.analyze_transcript("  My favorite game   is tag because it's exciting and fast.\n")
+        
+        assert first == second
+        assert len(executor.calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_analyze_many_only_submits_misses(self, executor):
+        """Cached and duplicate transcripts are skipped in batches"""
+        cached_text = "aaa This transcript was analyzed before."
+        await executor.analyze_transcript(cached_text)
+        
+        texts = [cached_text, "bbb A brand new transcript here.", "bbb A brand new transcript here."]
+        results = await executor.analyze_many(texts)
+        
+        assert [r['vocabulary_level'] for r in results] == ['aaa', 'bbb', 'bbb']
+        assert results[1] is not results[2]
+        assert executor.calls[-1] == (["bbb A brand new transcript here."], 32)
+    
+    @pytest.mark.asyncio
+    async def test_analyze_many_short_transcript_index(self, executor):
+        """Short transcripts are reported by their position in the request"""
+        with pytest.raises(ValueError, match="Transcript 1 too short"):
+            await executor.analyze_many(["A long enough transcript here.", "hi"])
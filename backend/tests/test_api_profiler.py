@@ -86,6 +86,31 @@ class TestProfileAPI:
         
         # Should return error for too short transcript
         assert response.status_code in [400, 422, 500]
+    
+    def test_create_profiles_batch_endpoint(self, sample_transcript):
+        """Test POST /api/profile/batch endpoint"""
+        response = client.post(
+            "/api/profile/batch",
+            json={
+                "profiles": [
+                    {"transcript": sample_transcript, "inputMode": "text"},
+                    {"transcript": sample_transcript + " Reading is fun.", "inputMode": "text"}
+                ]
+            }
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data['profiles']) == 2
+        for profile in data['profiles']:
+            assert 'word_scores' in profile
+            assert 'vocabulary_level' in profile
+    
+    def test_create_profiles_batch_empty(self):
+        """Test batch profile creation with no transcripts"""
+        response = client.post("/api/profile/batch", json={"profiles": []})
+        
+        assert response.status_code == 400
 
 
 class TestRecommendAPI:
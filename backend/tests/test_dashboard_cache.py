@@ -0,0 +1,178 @@
+"""
+Automated tests for the student dashboard cache and the dashboard endpoint
+"""
+import asyncio
+import httpx
+import pytest
+from api import students
+from db import dashboard_cache
+from db import achievements as db_achievements
+from db import student_progress as db_progress
+from db import submissions as db_submissions
+from db.dashboard_cache import DashboardCache, invalidate_student_dashboard
+from main import app
+
+
+class Loader:
+    """Counting section loader that can be held open mid-read"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self):
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        return self.value
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = DashboardCache(ttl_seconds=60, max_students=2)
+    monkeypatch.setattr(dashboard_cache, '_dashboard_cache', cache)
+    return cache
+
+
+class TestDashboardCache:
+    """Test suite for DashboardCache"""
+
+    @pytest.mark.asyncio
+    async def test_read_through(self, cache):
+        load = Loader({'total_points': 10})
+        assert await cache.get('s1', 'progress', load) == {'total_points': 10}
+        assert await cache.get('s1', 'progress', load) == {'total_points': 10}
+        assert load.calls == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_params_are_part_of_the_key(self, cache):
+        load = Loader([{'id': 'sub-1'}])
+        await cache.get('s1', 'submissions', load, 50)
+        await cache.get('s1', 'submissions', load, 10)
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_bumps_version(self, cache):
+        load = Loader([{'achievement_type': 'first_story'}])
+        await cache.get('s1', 'achievements', load)
+        invalidate_student_dashboard('s1')
+        assert cache.version('s1') == 1
+        await cache.get('s1', 'achievements', load)
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_read_in_flight_during_write_not_stored(self, cache):
+        load = Loader({'total_points': 10})
+        load.release = asyncio.Event()
+        reader = asyncio.create_task(cache.get('s1', 'progress', load))
+        await asyncio.sleep(0)
+        cache.invalidate('s1')  # A submission was saved while the row was being read
+        load.release.set()
+        assert await reader == {'total_points': 10}
+
+        load.release = None
+        await cache.get('s1', 'progress', load)
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_read(self, cache):
+        load = Loader({'total_points': 10})
+        load.release = asyncio.Event()
+        readers = [asyncio.create_task(cache.get('s1', 'progress', load)) for _ in range(10)]
+        await asyncio.sleep(0)
+        load.release.set()
+        assert await asyncio.gather(*readers) == [{'total_points': 10}] * 10
+        assert load.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_results_not_kept(self, cache):
+        load = Loader([])
+        await cache.get('s1', 'achievements', load)
+        await cache.get('s1', 'achievements', load)
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self, cache):
+        cache.ttl_seconds = 0
+        load = Loader({'total_points': 10})
+        await cache.get('s1', 'progress', load)
+        await cache.get('s1', 'progress', load)
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recent_student_evicted(self, cache):
+        load = Loader({'total_points': 10})
+        for student_id in ('s1', 's2', 's1', 's3'):
+            await cache.get(student_id, 'progress', load)
+        assert len(cache) == 2
+        await cache.get('s2', 'progress', load)
+        assert load.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, cache):
+        calls = []
+
+        async def fail():
+            calls.append(1)
+            raise ConnectionError("database unavailable")
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await cache.get('s1', 'progress', fail)
+        assert len(calls) == 2
+
+
+class TestDashboardEndpoint:
+    """Test suite for GET /api/students/{id}/dashboard"""
+
+    PROGRESS = {
+        'student_id': 's1', 'vocabulary_level': 'intermediate', 'total_words_written': 300,
+        'submission_count': 2, 'current_streak': 1, 'total_points': 40
+    }
+
+    @pytest.fixture
+    def reads(self, cache, monkeypatch):
+        reads = []
+
+        def read(name, value):
+            async def run(*args):
+                reads.append(name)
+                return value
+            return run
+
+        async def load_recommendations(student_id):
+            reads.append('recommendations')
+            return {'recommended_words': [{'word': 'luminous'}], 'vocabulary_level': 'intermediate'}
+
+        monkeypatch.setattr(db_progress, 'get_or_create_progress', read('progress', self.PROGRESS))
+        monkeypatch.setattr(db_achievements, 'get_student_achievements', read('achievements', [{'achievement_type': 'first_story'}]))
+        monkeypatch.setattr(db_submissions, 'get_student_submissions', read('submissions', [{'id': 'sub-1'}]))
+        monkeypatch.setattr(students, '_load_recommendations', load_recommendations)
+        return reads
+
+    @pytest.mark.asyncio
+    async def test_dashboard_assembled_from_cache(self, reads):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            response = await client.get('/api/students/s1/dashboard')
+            assert response.status_code == 200
+            data = response.json()
+            assert data['progress']['total_points'] == 40
+            assert data['achievements'] == [{'achievement_type': 'first_story'}]
+            assert data['recommended_words'] == [{'word': 'luminous'}]
+            assert data['submissions'] == [{'id': 'sub-1'}]
+            assert sorted(reads) == ['achievements', 'progress', 'recommendations', 'submissions']
+
+            # The single-section endpoints, student and parent, share the cached reads
+            await client.get('/api/students/s1/dashboard')
+            await client.get('/api/students/s1/progress')
+            await client.get('/api/students/s1/recommendations')
+            await client.get('/api/parents/children/s1/achievements', headers={'Authorization': 'Bearer token'})
+            await client.get('/api/parents/children/s1/submissions', headers={'Authorization': 'Bearer token'})
+            assert len(reads) == 4
+
+            invalidate_student_dashboard('s1')
+            await client.get('/api/students/s1/dashboard')
+            assert len(reads) == 8
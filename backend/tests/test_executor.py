@@ -0,0 +1,149 @@
+"""
+Automated tests for the profiling executor's load shedding
+Tests the bounded queue, slot release on errors, pool reset and the 503 response
+"""
+import asyncio
+import threading
+from concurrent.futures.process import BrokenProcessPool
+import httpx
+import pytest
+from api import submissions
+from main import app
+from nlp.analysis_cache import AnalysisCache
+from nlp.executor import ProfilerBusyError, ProfilingExecutor
+
+
+def fail(error):
+    raise error
+
+
+@pytest.fixture
+def executor():
+    """In-thread executor with room for one job"""
+    return ProfilingExecutor(max_workers=0, max_pending=1, retry_after=7, cache=AnalysisCache(disk_dir=None))
+
+
+@pytest.fixture
+async def blocked(executor):
+    """Fill the executor's only slot with a job that runs until the test ends"""
+    release = threading.Event()
+    job = asyncio.ensure_future(executor._submit(release.wait))
+    await asyncio.sleep(0.01)
+    yield job
+    release.set()
+    await job
+
+
+class TestLoadShedding:
+    """Test suite for ProfilingExecutor._submit"""
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_work(self, executor, blocked):
+        with pytest.raises(ProfilerBusyError) as error:
+            await executor._submit(len, "transcript")
+        assert error.value.retry_after == 7
+        assert not blocked.done()
+
+    @pytest.mark.asyncio
+    async def test_slot_released_after_error(self, executor):
+        with pytest.raises(ValueError):
+            await executor._submit(fail, ValueError("bad transcript"))
+        assert await executor._submit(len, "transcript") == 10
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_reset(self, executor):
+        class Pool:
+            stopped = False
+
+            def shutdown(self, wait, cancel_futures):
+                self.stopped = True
+
+        pool = executor._pool = Pool()
+        with pytest.raises(BrokenProcessPool):
+            await executor._submit(fail, BrokenProcessPool("worker died"))
+        assert pool.stopped
+        assert executor._pool is None
+        assert await executor._submit(len, "transcript") == 10
+
+
+class TestReserve:
+    """Test suite for ProfilingExecutor.reserve"""
+
+    @pytest.mark.asyncio
+    async def test_reserved_slot_runs_the_analysis(self, executor):
+        with executor.reserve():
+            # The queue is full, but this request already holds a slot
+            assert await executor._submit(len, "transcript") == 10
+            assert await executor._submit(len, "again") == 5
+        assert await executor._submit(len, "transcript") == 10  # Released
+
+    @pytest.mark.asyncio
+    async def test_refused_when_full(self, executor, blocked):
+        with pytest.raises(ProfilerBusyError):
+            with executor.reserve():
+                pytest.fail("reserve() should refuse before the block runs")
+
+    @pytest.mark.asyncio
+    async def test_released_after_error(self, executor):
+        with pytest.raises(ValueError):
+            with executor.reserve():
+                raise ValueError("student not found")
+        with executor.reserve():
+            pass
+
+
+class TestBusyResponse:
+    """Test suite for the 503 returned while the profiler is saturated"""
+
+    CONTENT = ' '.join(['word'] * 30)
+
+    @pytest.fixture
+    def stored(self, executor, monkeypatch):
+        """Submissions written to the (fake) database"""
+        stored = []
+
+        async def verify_student(student_id):
+            pass
+
+        async def create_submission(**fields):
+            stored.append(fields)
+            return 'sub-1'
+
+        executor._cache_key = lambda cleaned_text: cleaned_text
+        monkeypatch.setattr(submissions, '_verify_student', verify_student)
+        monkeypatch.setattr(submissions.db_submissions, 'create_submission', create_submission)
+        monkeypatch.setattr(submissions, 'get_profiling_executor', lambda: executor)
+        return stored
+
+    async def post(self, *args, **kwargs):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post(*args, **kwargs)
+
+    def assert_refused(self, response, stored):
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '7'
+        # Nothing was saved, so retrying can't create a duplicate or count progress twice
+        assert stored == []
+
+    @pytest.mark.asyncio
+    async def test_submission_refused_before_storing(self, blocked, stored):
+        response = await self.post('/api/submissions/', json={
+            'student_id': 's1', 'type': 'story-spark', 'source': 'text', 'content': self.CONTENT
+        })
+        self.assert_refused(response, stored)
+
+    @pytest.mark.asyncio
+    async def test_upload_refused_before_storing(self, blocked, stored):
+        response = await self.post(
+            '/api/submissions/upload', params={'student_id': 's1'},
+            files={'file': ('essay.txt', self.CONTENT.encode(), 'text/plain')}
+        )
+        self.assert_refused(response, stored)
+
+    @pytest.mark.asyncio
+    async def test_stream_refused_before_storing(self, blocked, stored):
+        response = await self.post(
+            '/api/submissions/stream', params={'student_id': 's1'}, content=self.CONTENT.encode()
+        )
+        self.assert_refused(response, stored)
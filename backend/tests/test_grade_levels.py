@@ -0,0 +1,70 @@
+"""
+Tests for the shared grade level lookups
+"""
+import pytest
+from nlp.grade_levels import (
+    GRADE_SEQUENCE,
+    difficulty_to_grade_level,
+    grade_level_to_difficulty_range,
+    get_next_grade_levels,
+    grade_level_to_progress_level
+)
+
+
+class TestGradeLevels:
+    """Test suite for difficulty <-> grade level mapping"""
+    
+    @pytest.mark.parametrize("difficulty,expected", [
+        (0, 'K-1'),
+        (14.9, 'K-1'),
+        (15, '2-3'),
+        (34.99, '4-5'),
+        (35, '6-7'),
+        (54, '8-9'),
+        (64.5, '10-11'),
+        (65, '12+'),
+        (100, '12+')
+    ])
+    def test_difficulty_to_grade_level(self, difficulty, expected):
+        """Band boundaries are lower-inclusive"""
+        assert difficulty_to_grade_level(difficulty) == expected
+    
+    def test_ranges_round_trip(self):
+        """Every band's lower bound maps back to the same band"""
+        for grade in GRADE_SEQUENCE:
+            low, high = grade_level_to_difficulty_range(grade)
+            assert low < high
+            if grade != 'K-1':
+                assert difficulty_to_grade_level(low) == grade
+    
+    def test_unknown_grade_defaults(self):
+        """Unknown grades fall back to 4-5"""
+        assert grade_level_to_difficulty_range('unknown') == (25, 35)
+        assert get_next_grade_levels('unknown') == ['4-5', '6-7']
+    
+    def test_next_grade_levels(self):
+        """ZPD targets the next one or two bands, capped at 12+"""
+        assert get_next_grade_levels('K-1') == ['2-3', '4-5']
+        assert get_next_grade_levels('10-11') == ['12+']
+        assert get_next_grade_levels('12+') == ['12+']
+    
+    def test_next_grade_levels_returns_copy(self):
+        """Callers can mutate the result without affecting the lookup table"""
+        grades = get_next_grade_levels('4-5')
+        grades.append('12+')
+        assert get_next_grade_levels('4-5') == ['6-7', '8-9']
+
+    @pytest.mark.parametrize("grade_level,expected", [
+        ('K-1', 'beginner'),
+        ('6-7', 'intermediate'),
+        ('10-11', 'advanced'),
+        ('12+', 'expert'),
+        ('advanced', 'advanced'),
+        ('college', None)
+    ])
+    def test_grade_level_to_progress_level(self, grade_level, expected):
+        """Grade bands map onto the student_progress level values"""
+        assert grade_level_to_progress_level(grade_level) == expected
+    
+    def test_every_grade_has_progress_level(self):
+        assert all(grade_level_to_progress_level(grade) for grade in GRADE_SEQUENCE)
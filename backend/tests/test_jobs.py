@@ -0,0 +1,209 @@
+"""
+Automated tests for the background job queue and the submission job endpoints
+"""
+import asyncio
+import json
+import httpx
+import pytest
+from main import app
+from api import submissions
+from api.submissions import SubmissionResponse
+from nlp.executor import ProfilerBusyError
+from utils import jobs
+from utils.jobs import JobQueue, JobQueueFullError
+
+
+class TestJobQueue:
+    """Test suite for JobQueue"""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_and_keeps_results(self):
+        queue = JobQueue(workers=2)
+
+        async def double(job):
+            job.set_stage('doubling')
+            await asyncio.sleep(0)
+            return 21 * 2
+
+        job = queue.submit(double, kind='math')
+        assert job.status == 'queued'
+        await queue.join()
+        assert queue.get(job.id).to_dict()['status'] == 'completed'
+        assert job.result == 42
+        assert job.stage == 'doubling'
+        await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_job(self):
+        queue = JobQueue(workers=1)
+
+        async def fail(job):
+            raise RuntimeError("no database")
+
+        job = queue.submit(fail, kind='math', job_id='j1')
+        await queue.join()
+        assert queue.get('j1') is job
+        assert (job.status, job.error) == ('failed', 'no database')
+        await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_refuses_jobs_when_full(self):
+        queue = JobQueue(workers=1, max_queued=2, retry_after=7)
+        release = asyncio.Event()
+
+        async def wait(job):
+            await release.wait()
+
+        queue.submit(wait, kind='wait')
+        await asyncio.sleep(0)  # First job starts running
+        queue.submit(wait, kind='wait')
+        queue.submit(wait, kind='wait')
+        with pytest.raises(JobQueueFullError) as error:
+            queue.submit(wait, kind='wait')
+        assert error.value.retry_after == 7
+        release.set()
+        await queue.join()
+        await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_reserved_places(self):
+        queue = JobQueue(workers=1, max_queued=1)
+
+        async def noop(job):
+            pass
+
+        with queue.reserve():
+            with pytest.raises(JobQueueFullError):
+                queue.reserve().__enter__()
+            with pytest.raises(JobQueueFullError):
+                queue.submit(noop, kind='noop')
+            queue.submit(noop, kind='noop', reserved=True)
+        await queue.join()
+        with queue.reserve():
+            pass
+        await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_drops_oldest_finished_jobs(self):
+        queue = JobQueue(workers=1, max_results=2)
+
+        async def nothing(job):
+            return None
+
+        ids = [queue.submit(nothing, kind='noop').id for _ in range(3)]
+        await queue.join()
+        assert [queue.get(job_id) is not None for job_id in ids] == [False, True, True]
+        await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_updates_until_done(self):
+        queue = JobQueue(workers=1)
+        proceed = asyncio.Event()
+
+        async def staged(job):
+            job.set_stage('first')
+            await proceed.wait()
+            job.set_stage('second')
+            return 'ok'
+
+        job = queue.submit(staged, kind='staged')
+        seen = []
+        async for state in job.updates(keepalive=0.01):
+            seen.append(state and (state['status'], state['stage']))
+            if state is None:
+                proceed.set()
+        assert seen[0] == ('queued', None)
+        assert None in seen  # Keep-alive while waiting
+        assert seen[-1] == ('completed', 'second')
+        await queue.shutdown()
+
+
+@pytest.fixture
+async def job_api(monkeypatch):
+    """Submission job endpoints with the database and profiler replaced"""
+    queue = JobQueue(workers=1)
+    monkeypatch.setattr(jobs, '_job_queue', queue)
+    calls = {'busy': 1, 'completed': []}
+
+    async def accept_submission(request):
+        if request.student_id == 'missing':
+            raise submissions.HTTPException(status_code=404, detail="Student missing not found")
+        return 'sub-1', request.content, len(request.content.split())
+
+    class Executor:
+        async def analyze_transcript(self, transcript):
+            if calls['busy']:
+                calls['busy'] -= 1
+                raise ProfilerBusyError(0)
+            return {'vocabulary_level': 'intermediate'}
+
+    async def complete_submission(request, submission_id, analysis, word_count):
+        calls['completed'].append(submission_id)
+        return SubmissionResponse(
+            id=submission_id, student_id=request.student_id, type=request.type, source=request.source,
+            word_count=word_count, vocabulary_level=analysis['vocabulary_level'], created_at='today'
+        )
+
+    monkeypatch.setattr(submissions, '_accept_submission', accept_submission)
+    monkeypatch.setattr(submissions, 'get_profiling_executor', lambda: Executor())
+    monkeypatch.setattr(submissions, '_complete_submission', complete_submission)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        yield client, queue, calls
+    await queue.shutdown()
+
+
+class TestSubmissionJobAPI:
+    """Test suite for the /api/submissions/jobs endpoints"""
+
+    BODY = {'student_id': 's1', 'type': 'story-spark', 'content': 'word ' * 30, 'source': 'text'}
+
+    @pytest.mark.asyncio
+    async def test_job_lifecycle(self, job_api):
+        client, queue, calls = job_api
+        response = await client.post('/api/submissions/jobs', json=self.BODY)
+        assert response.status_code == 202
+        assert response.json() == {'job_id': 'sub-1', 'submission_id': 'sub-1', 'status': 'queued', 'word_count': 30}
+
+        response = await client.get('/api/submissions/jobs/sub-1/events')
+        assert response.headers['content-type'].startswith('text/event-stream')
+        states = [json.loads(line[len('data: '):]) for line in response.text.splitlines() if line.startswith('data: ')]
+        assert states[-1]['status'] == 'completed'
+        assert 'analyzing' in [state['stage'] for state in states]
+
+        status = (await client.get('/api/submissions/jobs/sub-1')).json()
+        assert status['status'] == 'completed'
+        assert status['result']['vocabulary_level'] == 'intermediate'
+        assert calls == {'busy': 0, 'completed': ['sub-1']}  # Retried after the busy profiler
+
+    @pytest.mark.asyncio
+    async def test_errors(self, job_api, monkeypatch):
+        client, queue, _ = job_api
+        response = await client.post('/api/submissions/jobs', json={**self.BODY, 'student_id': 'missing'})
+        assert response.status_code == 404
+
+        assert (await client.get('/api/submissions/jobs/unknown')).status_code == 404
+
+        monkeypatch.setattr(queue, 'max_queued', 0)
+        response = await client.post('/api/submissions/jobs', json=self.BODY)
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == str(queue.retry_after)
+
+    @pytest.mark.asyncio
+    async def test_burst_refused_before_storing(self, job_api, monkeypatch):
+        """Requests past the queue limit are refused before their submission is stored"""
+        client, queue, _ = job_api
+        stored = []
+
+        async def accept_submission(request):
+            await asyncio.sleep(0.01)  # Database round trips
+            stored.append(request.student_id)
+            return f'sub-{len(stored)}', request.content, len(request.content.split())
+
+        monkeypatch.setattr(submissions, '_accept_submission', accept_submission)
+        monkeypatch.setattr(queue, 'max_queued', 2)
+        responses = await asyncio.gather(*(client.post('/api/submissions/jobs', json=self.BODY) for _ in range(6)))
+        statuses = sorted(response.status_code for response in responses)
+        assert statuses == [202, 202, 503, 503, 503, 503]
+        assert len(stored) == 2  # Every stored submission was queued
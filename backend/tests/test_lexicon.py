@@ -0,0 +1,125 @@
+"""
+Tests for the compiled, memory-mapped lexicon
+"""
+import json
+import os
+import pytest
+from nlp.lexicon import Lexicon, LexiconFormatError, LEXICON_FILENAME
+from nlp.dataset_loader import DatasetLoader
+
+
+COCA = {'the': 1000000, 'resilient': 5000, 'perseverance': 800, 'naïve': 120, 'zephyr': 3}
+LEXILE = {'the': 200, 'resilient': 800, 'perseverance': 1100, 'ubiquitous': 1400}
+
+
+class TestLexicon:
+    """Test suite for Lexicon"""
+    
+    @pytest.fixture
+    def lexicon(self, tmp_path):
+        """Build and open a small lexicon"""
+        path = tmp_path / LEXICON_FILENAME
+        Lexicon.build(COCA, LEXILE, path)
+        lexicon = Lexicon(path)
+        yield lexicon
+        lexicon.close()
+    
+    def test_columns_match_source_dicts(self, lexicon):
+        """Both columns round-trip exactly, including non-ASCII words"""
+        assert dict(lexicon.frequencies.items()) == COCA
+        assert dict(lexicon.lexile_scores.items()) == LEXILE
+        assert len(lexicon.frequencies) == len(COCA)
+        assert len(lexicon.lexile_scores) == len(LEXILE)
+    
+    def test_missing_values(self, lexicon):
+        """Words absent from a column behave like missing dict keys"""
+        assert lexicon.frequencies.get('ubiquitous', 0) == 0
+        assert lexicon.lexile_scores.get('zephyr') is None
+        assert 'unknownword' not in lexicon.frequencies
+        with pytest.raises(KeyError):
+            lexicon.lexile_scores['zephyr']
+    
+    def test_precomputed_difficulties(self, lexicon):
+        """Difficulty is precomputed for dataset words and left out otherwise"""
+        assert lexicon.difficulties['resilient'] == 50  # Lexile 800 / 1600
+        assert lexicon.difficulties['zephyr'] == 90  # COCA-only, rare
+        assert 'unknownword' not in lexicon.difficulties
+    
+    def test_version_tracks_content(self, lexicon, tmp_path):
+        """Rebuilding with different data changes the version"""
+        other_path = tmp_path / "other.bin"
+        Lexicon.build({**COCA, 'extra': 1}, LEXILE, other_path)
+        other = Lexicon(other_path)
+        assert other.version != lexicon.version
+        other.close()
+    
+    def test_rejects_non_lexicon_file(self, tmp_path):
+        """Garbage files raise LexiconFormatError"""
+        path = tmp_path / "bad.bin"
+        path.write_bytes(b"not a lexicon" * 10)
+        with pytest.raises(LexiconFormatError):
+            Lexicon(path)
+
+
+class TestDatasetLoaderLexicon:
+    """DatasetLoader gives the same answers from JSON and from the lexicon"""
+    
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        (tmp_path / "coca_frequency.json").write_text(json.dumps(COCA), encoding='utf-8')
+        (tmp_path / "lexile_scores.json").write_text(json.dumps(LEXILE), encoding='utf-8')
+        return tmp_path
+    
+    def test_lexicon_matches_json(self, data_dir):
+        """get_word_frequency / get_lexile_score / calculate_difficulty_score are unchanged"""
+        json_loader = DatasetLoader(str(data_dir))
+        Lexicon.build(COCA, LEXILE, data_dir / LEXICON_FILENAME)
+        lexicon_loader = DatasetLoader(str(data_dir))
+        
+        assert json_loader.lexicon is None
+        assert lexicon_loader.lexicon is not None
+        
+        for word in list(COCA) + list(LEXILE) + ['Resilient', 'unknownword', 'quixotic']:
+            assert lexicon_loader.get_word_frequency(word) == json_loader.get_word_frequency(word)
+            assert lexicon_loader.get_lexile_score(word) == json_loader.get_lexile_score(word)
+            assert lexicon_loader.calculate_difficulty_score(word) == json_loader.calculate_difficulty_score(word)
+    
+    def test_score_many_matches_single(self, data_dir):
+        """score_many returns calculate_difficulty_score for each word, in order"""
+        loader = DatasetLoader(str(data_dir))
+        words = ['Resilient', 'the', 'quixotic', 'photosynthesis', 'resilient', 'zephyr']
+        assert loader.score_many(words) == [loader.calculate_difficulty_score(w) for w in words]
+    
+    def test_stale_lexicon_falls_back_to_json(self, data_dir):
+        """A lexicon older than its JSON sources is ignored"""
+        lexicon_path = data_dir / LEXICON_FILENAME
+        Lexicon.build(COCA, LEXILE, lexicon_path)
+        stale = lexicon_path.stat().st_mtime - 60
+        os.utime(lexicon_path, (stale, stale))
+        
+        loader = DatasetLoader(str(data_dir))
+        assert loader.lexicon is None
+        assert loader.get_word_frequency('resilient') == 5000
+    
+    def test_load_dataset_file_after_lexicon(self, data_dir, tmp_path):
+        """Merging extra data copies the read-only lexicon views into dicts"""
+        Lexicon.build(COCA, LEXILE, data_dir / LEXICON_FILENAME)
+        loader = DatasetLoader(str(data_dir))
+        
+        extra_path = tmp_path / "extra.json"
+        extra_path.write_text(json.dumps({'newword': 42}), encoding='utf-8')
+        loader.load_dataset_file(str(extra_path), 'coca')
+        
+        assert loader.get_word_frequency('newword') == 42
+        assert loader.get_word_frequency('resilient') == 5000
+    
+    def test_load_dataset_file_refreshes_scores(self, data_dir, tmp_path):
+        """Cached scores are dropped when new data is merged"""
+        loader = DatasetLoader(str(data_dir))
+        assert loader.calculate_difficulty_score('quixotic') == (70, 'resonance')
+        
+        extra_path = tmp_path / "extra.json"
+        extra_path.write_text(json.dumps({'quixotic': 1600}), encoding='utf-8')
+        loader.load_dataset_file(str(extra_path), 'lexile')
+        
+        assert loader.calculate_difficulty_score('quixotic') == (100, 'thunder')
@@ -0,0 +1,118 @@
+"""
+Automated tests for the SRS word mastery cache
+Tests loading, incremental updates from review writes and the review endpoint hook
+"""
+from datetime import date
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from db import classes as db_classes, srs as db_srs
+from nlp import mastery_cache
+from nlp.mastery_cache import MasteryCache, mastered_word_ids
+from nlp.schedulers import SM2Scheduler
+
+client = TestClient(app)
+
+
+def schedule(word_id, repetitions, ease_factor=2.5):
+    return {
+        'word_id': word_id, 'ease_factor': ease_factor, 'interval': 10, 'repetitions': repetitions,
+        'due_date': date.today().isoformat(), 'last_reviewed': '2024-01-01T00:00:00'
+    }
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Reviewed schedules per student, counting loads"""
+    db = {
+        'schedules': {'s1': [schedule('w1', 6), schedule('w2', 1), schedule('w3', 5, ease_factor=1.3)]},
+        'loads': 0
+    }
+
+    async def get_reviewed_schedules(student_id):
+        db['loads'] += 1
+        return db['schedules'].get(student_id, [])
+
+    async def get_student_scheduler(student_id):
+        return None
+
+    monkeypatch.setattr(db_srs, 'get_reviewed_schedules', get_reviewed_schedules)
+    monkeypatch.setattr(db_classes, 'get_student_scheduler', get_student_scheduler)
+    return db
+
+
+class TestMasteryCache:
+    """Test suite for MasteryCache"""
+
+    def test_mastery_threshold(self):
+        """SM-2 needs several successful reviews at a good ease to count as mastered"""
+        records = [schedule('w1', 6), schedule('w2', 1), schedule('w3', 5, ease_factor=1.3)]
+        assert mastered_word_ids(records, SM2Scheduler()) == {'w1'}
+
+    @pytest.mark.asyncio
+    async def test_loads_once(self, db):
+        cache = MasteryCache()
+        assert await cache.get('s1') == {'w1'}
+        assert await cache.get('s1') == {'w1'}
+        assert db['loads'] == 1
+
+    @pytest.mark.asyncio
+    async def test_review_writes_update_cached_set(self, db):
+        cache = MasteryCache()
+        await cache.get('s1')
+
+        cache.record('s1', 'w2', 0.85)
+        cache.record('s1', 'w1', 0.1)  # Lapsed
+
+        assert await cache.get('s1') == {'w2'}
+        assert db['loads'] == 1
+
+    @pytest.mark.asyncio
+    async def test_uncached_student_is_not_loaded_by_writes(self, db):
+        cache = MasteryCache()
+        cache.record('s2', 'w1', 1.0)
+        assert 's2' not in cache
+        assert db['loads'] == 0
+
+    @pytest.mark.asyncio
+    async def test_write_during_load_is_applied(self, db, monkeypatch):
+        cache = MasteryCache()
+
+        async def get_reviewed_schedules(student_id):
+            cache.record(student_id, 'w9', 0.9)  # Review lands while the rows are read
+            return [schedule('w1', 6)]
+
+        monkeypatch.setattr(db_srs, 'get_reviewed_schedules', get_reviewed_schedules)
+        assert await cache.get('s1') == {'w1', 'w9'}
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_student_evicted(self, db):
+        cache = MasteryCache(max_students=1)
+        await cache.get('s1')
+        await cache.get('s2')
+        assert 's1' not in cache and 's2' in cache
+
+
+class TestReviewUpdatesMastery:
+    """The SRS review endpoints keep the cache current"""
+
+    def test_review_batch_records_mastery(self, db, monkeypatch):
+        async def get_srs_progress_many(student_id, word_ids):
+            return {'w2': schedule('w2', 4)}
+
+        async def upsert_srs_progress_many(student_id, schedules):
+            return len(schedules)
+
+        cache = MasteryCache()
+        monkeypatch.setattr(mastery_cache, '_mastery_cache', cache)
+        monkeypatch.setattr(db_srs, 'get_srs_progress_many', get_srs_progress_many)
+        monkeypatch.setattr(db_srs, 'upsert_srs_progress_many', upsert_srs_progress_many)
+        cache._mastered['s1'] = {'w1'}
+
+        response = client.post("/api/srs/review-batch", json={
+            "student_id": "s1",
+            "reviews": [{'word_id': 'w2', 'quality': 5}, {'word_id': 'w1', 'quality': 0}]
+        })
+
+        assert response.status_code == 200
+        assert cache._mastered['s1'] == {'w2'}  # w2 reached 5 repetitions, w1 lapsed
@@ -3,6 +3,7 @@ Automated tests for the profiling pipeline
 Tests transcript analysis, vocabulary level calculation, and profile creation
 """
 import pytest
+from nlp import profiler as profiler_module
 from nlp.profiler import StoryProfiler
 from nlp.dataset_loader import DatasetLoader
 
@@ -98,6 +99,42 @@ class TestProfiler:
         with pytest.raises(ValueError, match="too short"):
             profiler.analyze_transcript("hi")
     
+    def test_analyze_many_matches_single(self, profiler, sample_transcript_short, sample_transcript_long):
+        """Test that batch analysis returns the same profiles as one-at-a-time analysis"""
+        transcripts = [sample_transcript_short, sample_transcript_long]
+        results = profiler.analyze_many(transcripts, batch_size=2)
+        
+        assert len(results) == 2
+        for transcript, result in zip(transcripts, results):
+            assert result == profiler.analyze_transcript(transcript)
+    
+    def test_analyze_many_short_transcript_error(self, profiler, sample_transcript_long):
+        """Test that batch analysis rejects a too-short transcript"""
+        with pytest.raises(ValueError, match="too short"):
+            profiler.analyze_many([sample_transcript_long, "hi"])
+    
+    def test_analyze_stream_matches_single(self, profiler, sample_transcript_long):
+        """A stream that fits in one doc gives the same profile as the whole transcript"""
+        chunks = [sample_transcript_long[i:i + 7] for i in range(0, len(sample_transcript_long), 7)]
+        assert profiler.analyze_stream(chunks) == profiler.analyze_transcript(sample_transcript_long)
+    
+    def test_analyze_stream_bounded_docs(self, profiler, sample_transcript_long):
+        """Small docs still profile every part of the transcript"""
+        result = profiler.analyze_stream([sample_transcript_long] * 20, doc_chars=60)
+        assert result['resonance_data']['unique_words'] > 5
+        assert 'explorer' in result['word_scores']
+    
+    def test_analyze_file(self, profiler, sample_transcript_long, tmp_path):
+        """Profiling workers read transcript files themselves"""
+        from nlp.executor import _run_analyze_file
+        path = tmp_path / "transcript.txt"
+        path.write_text(sample_transcript_long, encoding="utf-8")
+        assert _run_analyze_file(str(path)) == profiler.analyze_transcript(sample_transcript_long)
+    
+    def test_analyze_stream_short_transcript_error(self, profiler):
+        with pytest.raises(ValueError, match="too short"):
+            profiler.analyze_stream(["h", "i "])
+    
     def test_relic_distribution(self, profiler, sample_transcript_long):
         """Test that relic distribution is calculated"""
         result = profiler.analyze_transcript(sample_transcript_long)
@@ -107,6 +144,24 @@ class TestProfiler:
         assert 'whisper' in distribution or 'echo' in distribution or 'resonance' in distribution or 'thunder' in distribution
 
 
+class TestBoundedTexts:
+    """Test suite for regrouping streamed text into bounded docs"""
+    
+    def test_cuts_at_whitespace(self):
+        chunks = ["The brave expl", "orer found ancient", " artifacts in the forest"]
+        texts = list(profiler_module.bounded_texts(chunks, max_chars=20))
+        assert all(len(text) <= 20 for text in texts)
+        assert ' '.join(texts).split() == ''.join(chunks).split()
+    
+    def test_long_word_is_cut(self):
+        """A word longer than a doc is split rather than buffered without bound"""
+        texts = list(profiler_module.bounded_texts(["a" * 25], max_chars=10))
+        assert texts == ["a" * 10, "a" * 10, "a" * 5]
+    
+    def test_texts_are_cleaned(self):
+        assert list(profiler_module.bounded_texts(["  Hello,\n\n  world  ", "\t#tag  "])) == ["Hello, world tag"]
+
+
 class TestDatasetLoader:
     """Test suite for DatasetLoader"""
     
@@ -144,6 +199,26 @@ class TestDatasetLoader:
         assert relic_type in ['whisper', 'echo', 'resonance', 'thunder']
 
 
+class TestPipelineProfiles:
+    """Test suite for PROFILER_PIPELINE selection"""
+    
+    def test_known_profile(self, monkeypatch):
+        """Configured profiles are used as-is and keyed into the model version"""
+        monkeypatch.setattr(profiler_module, 'PROFILER_PIPELINE', 'lean')
+        assert profiler_module.get_pipeline_profile() == 'lean'
+        assert '-lean-' in profiler_module.get_model_version()
+    
+    def test_unknown_profile_falls_back_to_full(self, monkeypatch):
+        """A typo in PROFILER_PIPELINE loads the whole pipeline rather than failing"""
+        monkeypatch.setattr(profiler_module, 'PROFILER_PIPELINE', 'typo')
+        assert profiler_module.get_pipeline_profile() == 'full'
+    
+    def test_lean_excludes_unused_components(self):
+        """The lean profile drops the parser and NER"""
+        assert set(profiler_module.PIPELINE_PROFILES['lean']) == {'parser', 'ner'}
+        assert profiler_module.PIPELINE_PROFILES['full'] == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -112,6 +112,60 @@ class TestRecommender:
         assert len(overlap) < len(rec_words), "Too many recommendations match existing vocabulary"
 
 
+
+class TestMasteredWords:
+    """Test suite for skipping words the student has mastered in SRS"""
+
+    @pytest.fixture
+    def recommender(self, monkeypatch):
+        """Recommender over a fixed pool of words with ids"""
+        recommender = WordRecommender()
+        pool = [
+            {'id': f'id-{i}', 'word': word, 'difficulty_score': 40 + i, 'definition': 'a definition'}
+            for i, word in enumerate(['venture', 'harbor', 'lantern', 'glimmer', 'summit', 'ember'])
+        ]
+        requested = {}
+
+        async def get_word_pool(limit=500, min_difficulty=20, max_difficulty=90):
+            requested['limit'] = limit
+            return [dict(word) for word in pool]
+
+        monkeypatch.setattr(recommender, '_get_word_pool', get_word_pool)
+        recommender.requested = requested
+        return recommender
+
+    @pytest.mark.asyncio
+    async def test_mastered_words_are_skipped(self, recommender):
+        words = await recommender._find_zpd_words(35, (0.7, 0.8), 10, exclude_ids={'id-1', 'id-4'})
+        assert {w['word'] for w in words} == {'venture', 'lantern', 'glimmer', 'ember'}
+        assert recommender.requested['limit'] == 102  # Extra room for the excluded words
+
+    @pytest.mark.asyncio
+    async def test_recommend_for_student_uses_mastery_cache(self, recommender, monkeypatch):
+        async def get_mastered_word_ids(student_id):
+            assert student_id == 's1'
+            return {'id-0', 'id-2'}
+
+        monkeypatch.setattr(recommender, '_get_mastered_word_ids', get_mastered_word_ids)
+        profile = {'word_scores': {}, 'resonance_data': {'vocabulary_level': '4-5'}}
+
+        recommendations = await recommender.recommend_words(profile, count=6, student_id='s1')
+
+        words = {rec['word'] for rec in recommendations}
+        assert words and not words & {'venture', 'lantern'}
+
+    @pytest.mark.asyncio
+    async def test_mastery_errors_do_not_block_recommendations(self, recommender, monkeypatch):
+        from nlp import mastery_cache
+
+        class FailingCache:
+            async def get(self, student_id):
+                raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(mastery_cache, '_mastery_cache', FailingCache())
+        assert await recommender._get_mastered_word_ids('s1') == set()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
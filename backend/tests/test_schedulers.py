@@ -0,0 +1,187 @@
+"""
+Automated tests for the pluggable SRS schedulers
+Tests the SM-2 and FSRS engines, scheduler selection and the offline simulator
+"""
+from datetime import date, datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from db import classes as db_classes
+from nlp import schedulers
+from nlp.schedulers import FSRS_DEFAULT_WEIGHTS, FSRSScheduler, Scheduler, SM2Scheduler, get_scheduler
+from nlp.srs import SM2Algorithm, SRSData
+from nlp.srs_simulation import introductions_from_log, simulate, true_memory_model
+
+client = TestClient(app)
+
+REVIEW_DATE = date(2024, 3, 1)
+
+
+class TestSM2Scheduler:
+    """Test suite for the SM-2 scheduler wrapper"""
+
+    def test_matches_sm2_algorithm(self):
+        scheduler = SM2Scheduler()
+        current = SRSData(ease_factor=2.2, interval=6, repetitions=2)
+        for quality in range(6):
+            expected = SM2Algorithm.calculate_next_review(current, quality, review_date=REVIEW_DATE)
+            result = scheduler.next_review(current, quality, review_date=REVIEW_DATE)
+            assert result == expected
+            assert scheduler.mastery_level(result) == SM2Algorithm.calculate_mastery_level(expected)
+
+
+class TestFSRSScheduler:
+    """Test suite for the FSRS-style scheduler"""
+
+    @pytest.fixture
+    def fsrs(self):
+        return FSRSScheduler()
+
+    def test_quality_to_grade(self):
+        assert [FSRSScheduler.grade(q) for q in range(-1, 7)] == [1, 1, 1, 1, 2, 3, 4, 4]
+
+    def test_first_review_uses_initial_stability(self, fsrs):
+        """A new card's stability is the initial stability of its grade"""
+        for quality, grade in ((1, 1), (3, 2), (4, 3), (5, 4)):
+            result = fsrs.next_review(SRSData(), quality, review_date=REVIEW_DATE)
+            assert result.stability == FSRS_DEFAULT_WEIGHTS[grade - 1]
+            assert result.last_reviewed == REVIEW_DATE
+            assert result.due_date == REVIEW_DATE + timedelta(days=result.interval)
+
+    def test_interval_hits_desired_retention(self, fsrs):
+        """At 90% desired retention the interval equals the stability"""
+        assert fsrs.next_interval(49.4) == 49
+        assert fsrs.retrievability(49.4, 49.4) == pytest.approx(0.9)
+        assert FSRSScheduler(desired_retention=0.8).next_interval(49.4) > 49
+
+    def test_successful_reviews_grow_interval(self, fsrs):
+        data = SRSData()
+        day = REVIEW_DATE
+        intervals = []
+        for _ in range(4):
+            data = fsrs.next_review(data, 4, review_date=day)
+            intervals.append(data.interval)
+            day = data.due_date
+        assert intervals == sorted(intervals) and intervals[-1] > intervals[0]
+        assert data.repetitions == 4
+
+    def test_lapse_resets_repetitions_and_shrinks_stability(self, fsrs):
+        data = SRSData(interval=30, repetitions=4, last_reviewed=REVIEW_DATE - timedelta(days=30),
+                       stability=30.0, difficulty=5.0)
+        result = fsrs.next_review(data, 1, review_date=REVIEW_DATE)
+        assert result.repetitions == 0
+        assert result.stability < 30.0
+        assert result.difficulty > 5.0
+
+    def test_starts_sm2_cards_from_their_interval(self, fsrs):
+        """Cards last scheduled by SM-2 keep their ease factor and start from their interval"""
+        data = SRSData(ease_factor=2.5, interval=20, repetitions=3,
+                       last_reviewed=datetime(2024, 2, 10, 15, 30))
+        assert fsrs.memory_state(data) == (20.0, fsrs.initial_difficulty(3))
+        result = fsrs.next_review(data, 4, review_date=REVIEW_DATE)
+        assert result.ease_factor == 2.5
+        assert result.interval > 20
+
+    def test_mastery_is_predicted_recall(self, fsrs):
+        assert fsrs.mastery_level(SRSData()) == 0.0
+        weak = SRSData(repetitions=1, stability=2.0, difficulty=5.0)
+        strong = SRSData(repetitions=5, stability=200.0, difficulty=5.0)
+        assert 0 < fsrs.mastery_level(weak) < fsrs.mastery_level(strong) < 1
+
+    def test_rejects_wrong_number_of_weights(self):
+        with pytest.raises(ValueError):
+            FSRSScheduler([1.0, 2.0])
+
+
+class TestSchedulerInterface:
+    """Test suite for the Scheduler base class"""
+
+    def test_incomplete_scheduler_cannot_be_created(self):
+        class NoMastery(Scheduler):
+            name = "partial"
+
+            def next_review(self, current_data, quality, review_date=None):
+                return current_data
+
+        with pytest.raises(TypeError):
+            NoMastery()
+        with pytest.raises(TypeError):
+            Scheduler()
+
+
+class TestGetScheduler:
+    """Test suite for scheduler selection"""
+
+    def test_named_scheduler(self):
+        assert get_scheduler('fsrs').name == 'fsrs'
+        assert get_scheduler('sm2').name == 'sm2'
+        assert get_scheduler('fsrs') is get_scheduler('fsrs')
+
+    def test_falls_back_to_default(self, monkeypatch):
+        monkeypatch.setattr(schedulers, 'SRS_SCHEDULER', 'sm2')
+        assert get_scheduler(None).name == 'sm2'
+        assert get_scheduler('unknown').name == 'sm2'
+        monkeypatch.setattr(schedulers, 'SRS_SCHEDULER', 'fsrs')
+        assert get_scheduler(None).name == 'fsrs'
+
+
+class TestSimulation:
+    """Test suite for the offline scheduler simulator"""
+
+    def test_simulation_is_repeatable(self):
+        truth = true_memory_model(0.2, seed=1)
+        start = REVIEW_DATE.toordinal()
+        introductions = [start + i % 10 for i in range(100)]
+        first = simulate(FSRSScheduler(), introductions, start + 120, truth, seed=2)
+        second = simulate(FSRSScheduler(), introductions, start + 120, truth, seed=2)
+
+        assert first == second
+        assert first['cards'] == 100
+        assert first['reviews'] >= 100
+        assert 0 < first['retention'] <= 1
+
+    def test_higher_desired_retention_costs_more_reviews(self):
+        truth = true_memory_model(0.2, seed=1)
+        start = REVIEW_DATE.toordinal()
+        introductions = [start] * 200
+        relaxed = simulate(FSRSScheduler(desired_retention=0.8), introductions, start + 180, truth)
+        strict = simulate(FSRSScheduler(desired_retention=0.95), introductions, start + 180, truth)
+
+        assert strict['reviews'] > relaxed['reviews']
+        assert strict['recall_rate'] > relaxed['recall_rate']
+
+    def test_introductions_from_log(self):
+        events = [(('s1', 'a'), 5), (('s1', 'b'), 3), (('s1', 'a'), 2), (('s2', 'a'), 9)]
+        introductions, last_day = introductions_from_log(events)
+        assert sorted(introductions) == [2, 3, 9]
+        assert last_day == 9
+
+
+class TestClassSchedulerEndpoint:
+    """Test suite for PUT /api/srs/class/{class_id}/scheduler"""
+
+    @pytest.fixture
+    def updates(self, monkeypatch):
+        updates = []
+
+        async def set_class_scheduler(class_id, teacher_id, scheduler):
+            updates.append((class_id, teacher_id, scheduler))
+            return teacher_id == 't1'
+
+        monkeypatch.setattr(db_classes, 'set_class_scheduler', set_class_scheduler)
+        return updates
+
+    def test_sets_scheduler(self, updates):
+        response = client.put("/api/srs/class/c1/scheduler", json={"teacher_id": "t1", "scheduler": "fsrs"})
+        assert response.status_code == 200
+        assert response.json() == {'class_id': 'c1', 'scheduler': 'fsrs'}
+        assert updates == [('c1', 't1', 'fsrs')]
+
+    def test_rejects_unknown_scheduler(self, updates):
+        response = client.put("/api/srs/class/c1/scheduler", json={"teacher_id": "t1", "scheduler": "leitner"})
+        assert response.status_code == 400
+        assert updates == []
+
+    def test_other_teachers_class(self, updates):
+        response = client.put("/api/srs/class/c1/scheduler", json={"teacher_id": "t2", "scheduler": "sm2"})
+        assert response.status_code == 404
@@ -0,0 +1,445 @@
+"""
+Automated tests for the spaced repetition system
+Tests SM-2 scheduling (scalar and batched), due-word selection and the SRS endpoints
+"""
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from db import srs as db_srs, words as db_words
+from nlp.srs import SM2Algorithm, SRSData, srs_data_from_record
+from nlp.srs_batch import forecast_due_counts, next_review_batch, replay_review_log, replay_review_log_scalar
+from nlp import srs_sessions
+from nlp.srs_sessions import SessionStore, seconds_until
+
+client = TestClient(app)
+
+STUDENT_ID = "44444444-4444-4444-4444-444444444444"
+
+
+def srs_record(word_id, due_date, repetitions=1, last_reviewed="2024-01-01T00:00:00"):
+    return {
+        'word_id': word_id,
+        'repetitions': repetitions,
+        'due_date': due_date.isoformat(),
+        'last_reviewed': last_reviewed,
+        'words': {'word': f'word-{word_id}', 'definition': 'a definition', 'relic_type': 'echo', 'difficulty_score': 40}
+    }
+
+
+class TestSM2DueWords:
+    """Test suite for SM2Algorithm.get_due_words"""
+
+    def test_reviews_most_overdue_first(self):
+        """Due reviews are ordered by due date and capped at review_count"""
+        today = date.today()
+        records = [
+            {'id': 'today', 'repetitions': 2, 'due_date': today.isoformat(), 'last_reviewed': 'x'},
+            {'id': 'future', 'repetitions': 2, 'due_date': (today + timedelta(days=3)).isoformat(), 'last_reviewed': 'x'},
+            {'id': 'old', 'repetitions': 2, 'due_date': (today - timedelta(days=9)).isoformat(), 'last_reviewed': 'x'},
+            {'id': 'recent', 'repetitions': 2, 'due_date': (today - timedelta(days=1)).isoformat(), 'last_reviewed': 'x'},
+            {'id': 'new', 'repetitions': 0, 'due_date': today.isoformat(), 'last_reviewed': None},
+        ]
+
+        due = SM2Algorithm.get_due_words(records, new_word_count=4, review_count=3)
+
+        assert [r['id'] for r in due['review']] == ['old', 'recent', 'today']
+        assert [r['id'] for r in due['new']] == ['new']
+
+
+    def test_due_date_ties_keep_record_order(self):
+        """Reviews due the same day come back in the order of the records"""
+        today = date.today()
+        records = [
+            {'id': i, 'repetitions': 1, 'due_date': (today - timedelta(days=i % 3)).isoformat(), 'last_reviewed': 'x'}
+            for i in range(30)
+        ]
+
+        due = SM2Algorithm.get_due_words(records, new_word_count=0, review_count=30)
+
+        expected = sorted(records, key=lambda r: r['due_date'])
+        assert [r['id'] for r in due['review']] == [r['id'] for r in expected]
+
+
+class TestSRSData:
+    """Test suite for the SRSData value class"""
+
+    def test_due_date_defaults_to_today(self):
+        assert SRSData().due_date == date.today()
+        assert SRSData(due_date=date(2024, 1, 1)).due_date == date(2024, 1, 1)
+
+    def test_equality_by_value(self):
+        assert SRSData(interval=6, repetitions=2) == SRSData(interval=6, repetitions=2)
+        assert SRSData(interval=6) != SRSData(interval=7)
+
+    def test_has_no_instance_dict(self):
+        with pytest.raises(AttributeError):
+            SRSData().extra = 1
+
+
+class TestBatchScheduler:
+    """Test suite for the numpy SM-2 scheduler in nlp/srs_batch.py"""
+
+    def test_step_matches_scalar(self):
+        """One batched step equals calculate_next_review for every state/quality combination"""
+        review_date = date(2024, 3, 1)
+        states = [
+            (ease, interval, repetitions)
+            for ease in (1.3, 1.37, 2.5, 2.9)
+            for interval in (1, 6, 15, 97)
+            for repetitions in (0, 1, 2, 7)
+        ]
+        ease, interval, repetitions = (np.array(column) for column in zip(*states))
+        for quality in range(-1, 7):
+            new_ease, new_interval, new_repetitions, due_day = next_review_batch(
+                ease, interval, repetitions, np.full(len(states), quality), review_date.toordinal()
+            )
+            for i, (e, n, r) in enumerate(states):
+                expected = SM2Algorithm.calculate_next_review(
+                    SRSData(ease_factor=e, interval=n, repetitions=r), quality, review_date=review_date
+                )
+                assert new_ease[i] == expected.ease_factor
+                assert new_interval[i] == expected.interval
+                assert new_repetitions[i] == expected.repetitions
+                assert due_day[i] == expected.due_date.toordinal()
+
+    def test_replay_matches_scalar(self):
+        """Replaying a shuffled log gives the scalar result for every card"""
+        rng = np.random.default_rng(3)
+        start = date(2024, 1, 1).toordinal()
+        cards = rng.integers(0, 300, 3000)
+        quality = rng.integers(0, 6, 3000)
+        review_day = rng.integers(start, start + 120, 3000)
+
+        state = replay_review_log(cards, quality, review_day)
+        expected = replay_review_log_scalar(cards.tolist(), quality.tolist(), review_day.tolist())
+
+        for card, data in expected.items():
+            assert state['ease_factor'][card] == data.ease_factor
+            assert state['interval'][card] == data.interval
+            assert state['repetitions'][card] == data.repetitions
+            assert state['due_day'][card] == data.due_date.toordinal()
+            assert state['last_reviewed_day'][card] == data.last_reviewed.toordinal()
+        assert state['reviews'].sum() == 3000
+
+    def test_forecast_counts_recurring_reviews(self):
+        """Overdue cards land on day one and come back after their new interval"""
+        today = date(2024, 5, 1).toordinal()
+        counts = forecast_due_counts(
+            ease_factor=[2.5, 2.5, 2.5],
+            interval=[1, 1, 30],
+            repetitions=[0, 1, 3],
+            due_day=[today - 4, today + 2, today + 40],
+            start_day=today,
+            days=10
+        )
+
+        # Card 0: due now, then 1 day later, then 6 days after that
+        # Card 1: due on day 2, then 6 days later; card 2 is outside the window
+        assert counts.tolist() == [1, 1, 1, 0, 0, 0, 0, 1, 1, 0]
+
+
+class TestDueWordsEndpoint:
+    """Test suite for POST /api/srs/due-words"""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        """Replace the database queries with in-memory fakes that record their arguments"""
+        calls = {}
+        today = date.today()
+
+        async def get_due_reviews(student_id, today=None, limit=8):
+            calls['reviews'] = (student_id, today, limit)
+            return [srs_record('r1', today - timedelta(days=2)), srs_record('r2', today)][:limit]
+
+        async def get_unreviewed_words(student_id, limit=4):
+            calls['unreviewed'] = (student_id, limit)
+            return [srs_record('n1', today, repetitions=0, last_reviewed=None)][:limit]
+
+        async def search_words(min_difficulty=None, max_difficulty=None, limit=100, **kwargs):
+            return [
+                {'id': word_id, 'word': word_id, 'definition': 'a definition'}
+                for word_id in ['n1', 'r1', 'w1', 'w2', 'w3', 'w4']
+            ][:limit]
+
+        async def get_practiced_word_ids(student_id, word_ids):
+            calls['practiced'] = list(word_ids)
+            return {'n1', 'r1'} & set(word_ids)
+
+        monkeypatch.setattr(db_srs, 'get_due_reviews', get_due_reviews)
+        monkeypatch.setattr(db_srs, 'get_unreviewed_words', get_unreviewed_words)
+        monkeypatch.setattr(db_srs, 'get_practiced_word_ids', get_practiced_word_ids)
+        monkeypatch.setattr(db_words, 'search_words', search_words)
+        monkeypatch.setattr(srs_sessions, '_session_store', SessionStore())
+        return calls
+
+    def test_limits_are_pushed_to_queries(self, calls):
+        """Review and new-word queries receive the session limits"""
+        response = client.post(
+            "/api/srs/due-words",
+            json={"student_id": STUDENT_ID, "new_count": 3, "review_count": 2}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert calls['reviews'] == (STUDENT_ID, date.today(), 2)
+        assert calls['unreviewed'] == (STUDENT_ID, 3)
+        assert [w['id'] for w in data['review_words']] == ['r1', 'r2']
+        assert data['review_words'][0]['word'] == 'word-r1'
+
+    def test_new_words_skip_practiced_candidates(self, calls):
+        """Top-up words exclude words the student already has progress for"""
+        response = client.post(
+            "/api/srs/due-words",
+            json={"student_id": STUDENT_ID, "new_count": 3, "review_count": 2}
+        )
+
+        data = response.json()
+        # Only the candidate words are checked against the student's progress
+        assert calls['practiced'] == ['n1', 'r1', 'w1', 'w2', 'w3', 'w4']
+        assert [w['id'] for w in data['new_words']] == ['n1', 'w1', 'w2']
+
+    def test_session_is_built_once_per_day(self, calls):
+        """A second session start is served from the store without queries"""
+        body = {"student_id": STUDENT_ID, "new_count": 3, "review_count": 2}
+        first = client.post("/api/srs/due-words", json=body).json()
+        calls.clear()
+
+        second = client.post("/api/srs/due-words", json=body).json()
+
+        assert second == first
+        assert calls == {}
+        assert srs_sessions.get_session_store().hits == 1
+
+    def test_precomputed_session_is_served(self, calls):
+        response = client.post("/api/srs/precompute", json={"student_ids": [STUDENT_ID, STUDENT_ID]})
+        assert response.status_code == 200
+        assert response.json()['built'] == 1
+        calls.clear()
+
+        response = client.post("/api/srs/due-words", json={"student_id": STUDENT_ID})
+
+        assert response.status_code == 200
+        assert calls == {}
+
+    def test_review_invalidates_session(self, calls, monkeypatch):
+        """Writing a review drops the student's stored session"""
+        from db import classes as db_classes
+
+        async def get_srs_progress_many(student_id, word_ids):
+            return {}
+
+        async def upsert_srs_progress_many(student_id, schedules):
+            return len(schedules)
+
+        async def get_student_scheduler(student_id):
+            return None
+
+        monkeypatch.setattr(db_srs, 'get_srs_progress_many', get_srs_progress_many)
+        monkeypatch.setattr(db_srs, 'upsert_srs_progress_many', upsert_srs_progress_many)
+        monkeypatch.setattr(db_classes, 'get_student_scheduler', get_student_scheduler)
+        body = {"student_id": STUDENT_ID, "new_count": 3, "review_count": 2}
+        client.post("/api/srs/due-words", json=body)
+        assert len(srs_sessions.get_session_store()) == 1
+
+        client.post("/api/srs/review-batch", json={"student_id": STUDENT_ID, "reviews": [{'word_id': 'r1', 'quality': 4}]})
+        calls.clear()
+        client.post("/api/srs/due-words", json=body)
+
+        assert 'reviews' in calls  # Rebuilt from the database
+
+
+class TestSessionStore:
+    """Test suite for the precomputed session store"""
+
+    @pytest.fixture
+    def builds(self, monkeypatch):
+        builds = []
+
+        async def build_session(student_id, new_count, review_count, today):
+            builds.append(student_id)
+            return {'new': [{'id': f'{student_id}-new'}], 'review': []}
+
+        monkeypatch.setattr(srs_sessions, 'build_session', build_session)
+        return builds
+
+    @pytest.mark.asyncio
+    async def test_session_expires_next_day(self, builds):
+        store = SessionStore()
+        today = date(2024, 3, 1)
+        await store.get('s1', today=today)
+        await store.get('s1', today=today)
+        await store.get('s1', today=today + timedelta(days=1))
+        assert builds == ['s1', 's1']
+
+    @pytest.mark.asyncio
+    async def test_different_counts_are_rebuilt(self, builds):
+        store = SessionStore()
+        await store.get('s1', new_count=4, review_count=8)
+        await store.get('s1', new_count=2, review_count=8)
+        assert builds == ['s1', 's1']
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self, builds):
+        store = SessionStore(max_sessions=2)
+        await store.get('s1')
+        await store.get('s2')
+        await store.get('s1')
+        await store.get('s3')
+        assert store.peek('s2', 4, 8) is None
+        assert store.peek('s1', 4, 8) is not None
+
+    @pytest.mark.asyncio
+    async def test_invalidated_during_build_is_not_stored(self, monkeypatch):
+        store = SessionStore()
+
+        async def build_session(student_id, new_count, review_count, today):
+            store.invalidate(student_id)  # A review lands while the queries run
+            return {'new': [{'id': 'w1'}], 'review': []}
+
+        monkeypatch.setattr(srs_sessions, 'build_session', build_session)
+        session = await store.get('s1')
+        assert session['new'] == [{'id': 'w1'}]
+        assert len(store) == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_session_is_not_stored(self, monkeypatch):
+        async def build_session(student_id, new_count, review_count, today):
+            return {'new': [], 'review': []}
+
+        monkeypatch.setattr(srs_sessions, 'build_session', build_session)
+        store = SessionStore()
+        await store.get('s1')
+        assert len(store) == 0
+
+    def test_seconds_until(self):
+        from datetime import datetime
+        now = datetime(2024, 3, 1, 6, 0)
+        assert seconds_until("05:30", now) == 23.5 * 3600
+        assert seconds_until("06:15", now) == 15 * 60
+
+
+class TestReviewBatchEndpoint:
+    """Test suite for POST /api/srs/review-batch"""
+
+    @pytest.fixture
+    def db(self, monkeypatch):
+        """In-memory srs_progress for one student, counting round trips"""
+        db = {
+            'rows': {
+                'w1': {'word_id': 'w1', 'ease_factor': 2.5, 'interval': 6, 'repetitions': 2,
+                       'due_date': date.today().isoformat(), 'last_reviewed': '2024-01-01T00:00:00'}
+            },
+            'reads': 0,
+            'writes': 0
+        }
+
+        async def get_srs_progress_many(student_id, word_ids):
+            db['reads'] += 1
+            return {word_id: db['rows'][word_id] for word_id in word_ids if word_id in db['rows']}
+
+        async def upsert_srs_progress_many(student_id, schedules):
+            db['writes'] += 1
+            for schedule in schedules:
+                db['rows'][schedule['word_id']] = schedule
+            return len(schedules)
+
+        async def get_student_scheduler(student_id):
+            return db['scheduler']
+
+        from db import classes as db_classes
+        db['scheduler'] = None  # Not in a class: default scheduler
+        monkeypatch.setattr(db_srs, 'get_srs_progress_many', get_srs_progress_many)
+        monkeypatch.setattr(db_srs, 'upsert_srs_progress_many', upsert_srs_progress_many)
+        monkeypatch.setattr(db_classes, 'get_student_scheduler', get_student_scheduler)
+        return db
+
+    def test_one_read_one_write(self, db):
+        """A whole session costs one read and one upsert"""
+        reviews = [{'word_id': f'w{i}', 'quality': 4} for i in range(12)]
+        response = client.post("/api/srs/review-batch", json={"student_id": STUDENT_ID, "reviews": reviews})
+
+        assert response.status_code == 200
+        assert db['reads'] == 1
+        assert db['writes'] == 1
+        assert [card['word_id'] for card in response.json()['cards']] == [f'w{i}' for i in range(12)]
+
+    def test_matches_single_review_schedule(self, db):
+        """Each card gets the same schedule as the scalar SM-2 update"""
+        expected_existing = SM2Algorithm.calculate_next_review(srs_data_from_record(db['rows']['w1']), 5)
+        expected_new = SM2Algorithm.calculate_next_review(SRSData(), 2)
+
+        response = client.post("/api/srs/review-batch", json={
+            "student_id": STUDENT_ID,
+            "reviews": [{'word_id': 'w1', 'quality': 5}, {'word_id': 'w9', 'quality': 2}]
+        })
+
+        cards = {card['word_id']: card for card in response.json()['cards']}
+        for word_id, expected in (('w1', expected_existing), ('w9', expected_new)):
+            assert cards[word_id]['ease_factor'] == expected.ease_factor
+            assert cards[word_id]['interval'] == expected.interval
+            assert cards[word_id]['repetitions'] == expected.repetitions
+            assert cards[word_id]['due_date'] == expected.due_date.isoformat()
+            assert cards[word_id]['mastery_level'] == SM2Algorithm.calculate_mastery_level(expected)
+
+    def test_repeated_card_builds_on_previous_review(self, db):
+        """A card failed and then recalled in one session is written once, from its last review"""
+        response = client.post("/api/srs/review-batch", json={
+            "student_id": STUDENT_ID,
+            "reviews": [{'word_id': 'w1', 'quality': 1}, {'word_id': 'w1', 'quality': 4}]
+        })
+
+        cards = response.json()['cards']
+        assert len(cards) == 1
+        assert cards[0]['repetitions'] == 1  # Reset by the failure, then one success
+        assert db['rows']['w1']['repetitions'] == 1
+
+    def test_uses_class_scheduler(self, db):
+        """Students in an FSRS class are scheduled by FSRS and keep a memory state"""
+        db['scheduler'] = 'fsrs'
+        response = client.post("/api/srs/review-batch", json={
+            "student_id": STUDENT_ID,
+            "reviews": [{'word_id': 'w9', 'quality': 4}]
+        })
+
+        card = response.json()['cards'][0]
+        assert card['scheduler'] == 'fsrs'
+        assert card['interval'] == 4  # FSRS first "good" review: stability 3.7 days
+        assert db['rows']['w9']['stability'] == pytest.approx(3.7145)
+        assert db['rows']['w9']['difficulty'] is not None
+
+
+class TestClassForecastEndpoint:
+    """Test suite for GET /api/srs/class/{class_id}/forecast"""
+
+    def test_forecast_for_class(self, monkeypatch):
+        """Schedules of every student in the class are forecast together"""
+        from db import classes as db_classes
+        today = date.today()
+
+        async def get_class_students(class_id):
+            return [{'student_id': 's1'}, {'student_id': 's2'}]
+
+        async def get_schedules_for_students(student_ids):
+            assert student_ids == ['s1', 's2']
+            return [
+                {'ease_factor': 2.5, 'interval': 6, 'repetitions': 2, 'due_date': (today - timedelta(days=3)).isoformat()},
+                {'ease_factor': 2.5, 'interval': 1, 'repetitions': 1, 'due_date': (today + timedelta(days=1)).isoformat()},
+            ]
+
+        monkeypatch.setattr(db_classes, 'get_class_students', get_class_students)
+        monkeypatch.setattr(db_srs, 'get_schedules_for_students', get_schedules_for_students)
+
+        response = client.get("/api/srs/class/c1/forecast?days=7")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['students'] == 2
+        assert data['cards'] == 2
+        assert [day['due'] for day in data['days']] == [1, 1, 0, 0, 0, 0, 0]
+        assert data['days'][0]['date'] == today.isoformat()
+
+    def test_rejects_bad_window(self):
+        response = client.get("/api/srs/class/c1/forecast?days=0")
+        assert response.status_code == 400
@@ -0,0 +1,139 @@
+"""
+Automated tests for the stage graph runner and the submission analysis stages
+"""
+import asyncio
+import time
+import pytest
+from api import submissions
+from db import achievements as db_achievements, profiles as db_profiles
+from db import recommendations as db_recommendations, student_progress as db_progress
+from db import submissions as db_submissions
+from utils.stages import Stage, StageError, run_stages
+
+
+def recorder(log, name, result=None, delay=0.0, error=None):
+    async def run(results):
+        log.append(('start', name))
+        await asyncio.sleep(delay)
+        log.append(('end', name))
+        if error:
+            raise error
+        return result
+    return run
+
+
+class TestRunStages:
+    """Test suite for run_stages"""
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_overlap(self):
+        log = []
+        run = await run_stages([
+            Stage('a', recorder(log, 'a', 1, delay=0.01)),
+            Stage('b', recorder(log, 'b', 2, delay=0.01)),
+            Stage('c', recorder(log, 'c', 3), after=('a', 'b')),
+        ])
+        assert log[:2] == [('start', 'a'), ('start', 'b')]
+        assert log[-2:] == [('start', 'c'), ('end', 'c')]
+        assert run.results == {'a': 1, 'b': 2, 'c': 3}
+        assert list(run.timings) == ['a', 'b', 'c']
+        run.raise_for_errors()
+
+    @pytest.mark.asyncio
+    async def test_results_passed_to_dependents(self):
+        async def double(results):
+            return results['a'] * 2
+
+        run = await run_stages([Stage('a', recorder([], 'a', 21)), Stage('b', double, after=('a',))])
+        assert run.results['b'] == 42
+
+    @pytest.mark.asyncio
+    async def test_failures_collected_and_dependents_skipped(self):
+        log = []
+        run = await run_stages([
+            Stage('a', recorder(log, 'a', error=RuntimeError("insert failed"))),
+            Stage('b', recorder(log, 'b', error=ValueError("bad level"))),
+            Stage('c', recorder(log, 'c'), after=('a',)),
+            Stage('d', recorder(log, 'd', 4)),
+            Stage('e', recorder(log, 'e'), after=('c',)),
+        ])
+        assert run.results == {'d': 4}
+        assert list(run.errors) == ['a', 'b']
+        assert run.skipped == ['c', 'e']
+        with pytest.raises(StageError) as error:
+            run.raise_for_errors()
+        assert str(error.value) == "2 stage(s) failed (a: insert failed; b: bad level), skipped c, e"
+
+    @pytest.mark.asyncio
+    async def test_stage_order_checked(self):
+        with pytest.raises(ValueError):
+            await run_stages([Stage('b', recorder([], 'b'), after=('a',)), Stage('a', recorder([], 'a'))])
+        with pytest.raises(ValueError):
+            await run_stages([Stage('a', recorder([], 'a')), Stage('a', recorder([], 'a'))])
+
+
+class TestSaveAnalysis:
+    """Test suite for the create_submission analysis stages"""
+
+    DELAY = 0.05  # Simulated database round trip
+
+    @pytest.fixture
+    def db(self, monkeypatch):
+        calls = []
+        self.kwargs = {}
+        delay = self.DELAY
+
+        def write(name, result=True):
+            async def run(*args, **kwargs):
+                calls.append(name)
+                self.kwargs[name] = kwargs
+                await asyncio.sleep(delay)
+                return result
+            return run
+
+        class Recommender:
+            async def recommend_words(self, profile, count, student_id):
+                calls.append('recommend')
+                await asyncio.sleep(delay)
+                return [{'word': 'luminous'}]
+
+        monkeypatch.setattr(db_profiles, 'create_profile', write('create_profile', 'p1'))
+        monkeypatch.setattr(db_submissions, 'update_submission_profile', write('link'))
+        monkeypatch.setattr(submissions.recommender, 'WordRecommender', Recommender)
+        monkeypatch.setattr(db_recommendations, 'create_recommendations_batch', write('store_recommendations'))
+        monkeypatch.setattr(db_progress, 'apply_progress_delta', write('progress', {'total_points': 20}))
+        monkeypatch.setattr(db_achievements, 'check_and_award_achievements', write('achievements', []))
+        return calls
+
+    ANALYSIS = {'resonance_data': {}, 'word_scores': {}, 'vocabulary_level': '6-7'}  # Profiler grade band
+
+    @pytest.mark.asyncio
+    async def test_writes_run_concurrently(self, db):
+        started = time.perf_counter()
+        profile_id, recommendations = await submissions._save_analysis('s1', 'sub-1', self.ANALYSIS, 250)
+        elapsed = time.perf_counter() - started
+        assert (profile_id, recommendations) == ('p1', [{'word': 'luminous'}])
+        assert sorted(db) == sorted([
+            'create_profile', 'link', 'recommend', 'store_recommendations', 'progress', 'achievements'
+        ])
+        # Two round trips deep instead of six in a row
+        assert elapsed < 4 * self.DELAY
+
+    @pytest.mark.asyncio
+    async def test_progress_level_fits_column(self, db):
+        """student_progress.vocabulary_level only accepts beginner..expert, not grade bands"""
+        await submissions._save_analysis('s1', 'sub-1', self.ANALYSIS, 250)
+        # Words, count and streak were recorded when the submission was stored
+        assert self.kwargs['progress'] == {'points': 20, 'vocabulary_level': 'intermediate'}
+
+    @pytest.mark.asyncio
+    async def test_failures_reported_together(self, db, monkeypatch):
+        async def fail(*args, **kwargs):
+            raise RuntimeError("profiles table unavailable")
+
+        monkeypatch.setattr(db_profiles, 'create_profile', fail)
+        with pytest.raises(StageError) as error:
+            await submissions._save_analysis('s1', 'sub-1', self.ANALYSIS, 250)
+        assert list(error.value.errors) == ['profile']
+        assert error.value.skipped == ['link', 'store_recommendations']
+        assert 'progress' in db and 'achievements' in db
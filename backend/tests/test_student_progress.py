@@ -0,0 +1,149 @@
+"""
+Automated tests for atomic student progress updates
+Tests the apply_progress_delta RPC call, its locked fallback and the streak rule
+"""
+import asyncio
+from datetime import date
+import pytest
+from postgrest.exceptions import APIError
+from db import student_progress as db_progress
+from db.student_progress import apply_progress_delta, next_streak
+
+
+TODAY = date(2024, 3, 10)
+
+
+class FakeRPC:
+    """Supabase client whose rpc() returns a row, or fails like a missing function"""
+
+    def __init__(self, missing=False):
+        self.missing = missing
+        self.calls = []
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        client = self
+
+        class Request:
+            async def execute(self):
+                if client.missing:
+                    raise APIError({'code': 'PGRST202', 'message': 'Could not find the function', 'hint': None, 'details': None})
+                return type('Result', (), {'data': {'student_id': params['p_student_id'], 'total_points': 15}})()
+        return Request()
+
+
+@pytest.fixture
+def rpc(monkeypatch):
+    client = FakeRPC()
+    monkeypatch.setattr(db_progress, 'get_async_client', lambda: client)
+    monkeypatch.setattr(db_progress, '_delta_rpc_available', True)
+    return client
+
+
+@pytest.fixture
+def table(monkeypatch, rpc):
+    """In-memory student_progress rows behind a missing RPC function, with a delay per round trip"""
+    rpc.missing = True
+    rows = {}
+
+    async def get_or_create_progress(student_id):
+        await asyncio.sleep(0.001)
+        return dict(rows.setdefault(student_id, {
+            'student_id': student_id, 'vocabulary_level': 'beginner', 'total_words_written': 0,
+            'submission_count': 0, 'current_streak': 0, 'total_points': 0, 'last_submission_date': None
+        }))
+
+    async def update_progress(student_id, **fields):
+        await asyncio.sleep(0.001)
+        rows[student_id].update(fields)
+        return True
+
+    monkeypatch.setattr(db_progress, 'get_or_create_progress', get_or_create_progress)
+    monkeypatch.setattr(db_progress, 'update_progress', update_progress)
+    return rows
+
+
+class TestApplyProgressDelta:
+    """Test suite for apply_progress_delta"""
+
+    @pytest.mark.asyncio
+    async def test_one_rpc_call(self, rpc):
+        row = await apply_progress_delta('s1', words=120, submissions=1, points=15, vocabulary_level='advanced', today=TODAY)
+        assert row == {'student_id': 's1', 'total_points': 15}
+        assert rpc.calls == [('apply_progress_delta', {
+            'p_student_id': 's1', 'p_words': 120, 'p_submissions': 1, 'p_points': 15,
+            'p_vocabulary_level': 'advanced', 'p_today': '2024-03-10'
+        })]
+
+    @pytest.mark.asyncio
+    async def test_fallback_is_safe_under_concurrency(self, rpc, table):
+        """Without the function, concurrent updates for a student are serialized"""
+        await asyncio.gather(*(
+            apply_progress_delta('s1', words=100, submissions=1, points=15, today=TODAY) for _ in range(20)
+        ))
+        assert table['s1']['total_words_written'] == 2000
+        assert table['s1']['submission_count'] == 20
+        assert table['s1']['total_points'] == 300
+        assert table['s1']['current_streak'] == 1
+        assert len(rpc.calls) == 1  # The missing function is only tried once
+
+    @pytest.mark.asyncio
+    async def test_fallback_returns_updated_row(self, rpc, table):
+        row = await apply_progress_delta('s1', points=5, vocabulary_level='intermediate', today=TODAY)
+        assert row['total_points'] == 5
+        assert row['vocabulary_level'] == 'intermediate'
+        assert row['last_submission_date'] is None  # Not a submission: streak untouched
+
+    @pytest.mark.asyncio
+    async def test_other_errors_raised(self, rpc, monkeypatch):
+        class Broken:
+            def rpc(self, name, params):
+                raise ConnectionError("database unavailable")
+
+        monkeypatch.setattr(db_progress, 'get_async_client', lambda: Broken())
+        with pytest.raises(ConnectionError):
+            await apply_progress_delta('s1', points=5)
+        assert db_progress._delta_rpc_available
+
+
+class TestNextStreak:
+    """Test suite for the submission streak rule"""
+
+    @pytest.mark.parametrize('last_date, streak, expected', [
+        (None, 0, 1),
+        ('2024-03-09', 4, 5),
+        ('2024-03-09T18:30:00Z', 4, 5),
+        (date(2024, 3, 10), 4, 4),
+        ('2024-03-07', 4, 1),
+        ('2024-03-11', 4, 1),
+    ])
+    def test_streak(self, last_date, streak, expected):
+        assert next_streak({'last_submission_date': last_date, 'current_streak': streak}, TODAY) == expected
+
+
+class TestSubmissionProgress:
+    """Submissions count toward progress when stored, before analysis"""
+
+    @pytest.mark.asyncio
+    async def test_create_submission_records_progress(self, monkeypatch):
+        from db import submissions as db_submissions
+        deltas = []
+
+        class Insert:
+            def table(self, name):
+                return self
+
+            def insert(self, row):
+                self.row = row
+                return self
+
+            async def execute(self):
+                return type('Result', (), {'data': [self.row]})()
+
+        async def apply(student_id, **delta):
+            deltas.append((student_id, delta))
+
+        monkeypatch.setattr(db_submissions, 'get_async_client', lambda: Insert())
+        monkeypatch.setattr(db_progress, 'apply_progress_delta', apply)
+        await db_submissions.create_submission('s1', 'story-spark', 'text', 'text', word_count=120)
+        assert deltas == [('s1', {'words': 120, 'submissions': 1})]
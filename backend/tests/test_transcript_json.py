@@ -0,0 +1,85 @@
+"""
+Tests for the incremental JSON transcript reader
+"""
+import json
+import pytest
+from nlp.transcript_json import JSONTranscriptError, JSONTranscriptReader
+
+
+DOCUMENT = json.dumps({
+    'meta': {'tool': 'recorder', 'words': [{'w': 'a "quoted" ]} word', 't': [0.5, 1.0]}]},
+    'speakers': [
+        {'name': 'Teacher', 'text': 'What happened?'},
+        {'speaker': 'Maya', 'content': 'The fox ran \\ away.'},
+        'not an item',
+        {'label': 'Leo', 'text': ''},
+        {'text': 'Nobody said this.'}
+    ],
+    'duration': 12.5
+}, indent=1)
+
+
+def read_in_chunks(document, size):
+    reader = JSONTranscriptReader()
+    events = []
+    for start in range(0, len(document), size):
+        events += reader.feed(document[start:start + size])
+    events += reader.close()
+    return reader, events
+
+
+class TestJSONTranscriptReader:
+    """Test suite for JSONTranscriptReader"""
+
+    @pytest.mark.parametrize('size', [1, 2, 5, 64, len(DOCUMENT)])
+    def test_events_for_any_chunking(self, size):
+        """Items with text become events however the document is split"""
+        reader, events = read_in_chunks(DOCUMENT, size)
+        assert [(key, speaker, text) for key, _, speaker, text in events] == [
+            ('speakers', 'Teacher', 'What happened?'),
+            ('speakers', 'Maya', 'The fox ran \\ away.'),
+            ('speakers', 'Unknown', 'Nobody said this.')
+        ]
+        assert reader.done
+        assert reader.arrays == {'speakers': 1}
+
+    def test_events_as_items_arrive(self):
+        """An item is returned as soon as it is complete"""
+        reader = JSONTranscriptReader()
+        assert reader.feed('{"transcript": [{"speaker": "Maya", "text": "Hi"}, {"speak') == [
+            ('transcript', 1, 'Maya', 'Hi')
+        ]
+        assert reader.feed('er": "Leo", "text": "Hello"}]}') == [('transcript', 1, 'Leo', 'Hello')]
+        assert reader.close() == []
+
+    def test_consumed_text_is_dropped(self):
+        """Only the incomplete tail of a long document is kept"""
+        reader = JSONTranscriptReader()
+        reader.feed('{"transcript": [')
+        for _ in range(5000):
+            reader.feed('{"speaker": "Maya", "text": "and then the fox ran"}, ')
+            assert len(reader._buffer) < 70 * 1024
+        reader.feed('{}]}')
+        reader.close()
+
+    def test_repeated_and_non_array_keys(self):
+        """The last value of a key decides whether it holds an array"""
+        reader, events = read_in_chunks('{"speakers": [{"text": "a"}], "transcript": [], "speakers": {}}', 3)
+        assert events == [('speakers', 1, 'Unknown', 'a')]
+        assert reader.arrays == {'speakers': 0, 'transcript': 2}
+
+    @pytest.mark.parametrize('document', [
+        '',
+        '[{"text": "a"}]',
+        '{"speakers": [{"text": "a"},]}',
+        '{"speakers": [{"text": "a"}] "x": 1}',
+        '{"speakers": [{"text": "a"}]} extra',
+        '{"speakers": [{"text": "a"}]',
+        '{"x": tru}',
+        '{"x": "line\nbreak"}',
+        "{'speakers': []}",
+    ])
+    def test_invalid_documents(self, document):
+        """Anything json.loads rejects (or that is not an object) raises"""
+        with pytest.raises(JSONTranscriptError):
+            read_in_chunks(document, 4)
@@ -0,0 +1,135 @@
+"""
+Tests for transcript speaker detection
+"""
+import json
+import pytest
+from nlp.transcript_parser import TranscriptParser
+
+
+def speaker_texts(result):
+    return {speaker['name']: speaker['text'] for speaker in result['speakers']}
+
+
+class TestTranscriptParser:
+    """Test suite for TranscriptParser"""
+
+    @pytest.fixture
+    def parser(self):
+        return TranscriptParser()
+
+    def test_empty_transcript(self, parser):
+        """Blank transcripts are plain with no speakers"""
+        result = parser.parse("   ")
+        assert result['format_detected'] == 'plain'
+        assert result['speakers'] == []
+
+    def test_plain_transcript(self, parser):
+        """Text without labels is one speaker"""
+        result = parser.parse("The dragon flew over the castle.\nIt was very big.")
+        assert result['format_detected'] == 'plain'
+        assert result['speakers'] == [{
+            'name': 'Speaker',
+            'text': "The dragon flew over the castle.\nIt was very big.",
+            'word_count': 10
+        }]
+
+    def test_json_transcript(self, parser):
+        """JSON speaker lists are combined per speaker"""
+        transcript = json.dumps({'transcript': [
+            {'speaker': 'Teacher', 'text': 'What happened?'},
+            {'speaker': 'Maya', 'text': 'The fox ran.'},
+            {'speaker': 'Maya', 'text': 'Then it hid.'}
+        ]})
+        result = parser.parse(transcript)
+        assert result['format_detected'] == 'json'
+        assert speaker_texts(result) == {'Teacher': 'What happened?', 'Maya': 'The fox ran. Then it hid.'}
+
+    @pytest.mark.parametrize('transcript', [
+        json.dumps({'speakers': [{'name': 'Teacher', 'text': 'Hi'}, {'label': 'Maya', 'content': 'Hello'}], 'x': [1, {}]}),
+        json.dumps({'transcript': [{'speaker': 'Maya', 'text': 'a'}], 'speakers': [{'name': 'Leo', 'text': 'b'}]}),
+        '{"speakers": [{"text": "a"}], "speakers": {"text": "b"}, "transcript": [{"text": "c"}]}',
+        '{"speakers": [], "transcript": [{"text": "c"}]}',
+        '{"speakers": [{"speaker": ["x"], "text": "a"}]}',
+        '{"transcript": [{"speaker": ["x"], "text": "a"}], "transcript": [{"text": "b"}]}',
+        '{"speakers": [{"text": ["a"]}]}',
+        '  {"speakers": [{"text": "Teacher: hi"}]} x',
+        '{"speakers": [{"text": "a"}]',
+    ])
+    def test_incremental_json_matches_json_loads(self, parser, transcript, monkeypatch):
+        """Above the size threshold JSON is read item by item with the same result"""
+        expected = parser.parse(transcript)
+        monkeypatch.setattr('nlp.transcript_parser.JSON_INCREMENTAL_CHARS', 0)
+        monkeypatch.setattr('nlp.transcript_parser.JSON_READ_CHARS', 3)
+        assert parser.parse(transcript) == expected
+
+    def test_large_json_transcript(self, parser, monkeypatch):
+        """A large document is read incrementally without json.loads"""
+        items = [{'speaker': 'Teacher' if i % 2 else 'Maya', 'text': f'Turn {i}.'} for i in range(20000)]
+        transcript = json.dumps({'transcript': items})
+        monkeypatch.setattr('nlp.transcript_parser.JSON_INCREMENTAL_CHARS', 100000)
+        monkeypatch.setattr('nlp.transcript_parser.json.loads', None)
+        result = parser.parse(transcript)
+        assert result['format_detected'] == 'json'
+        assert speaker_texts(result)['Maya'].startswith('Turn 0. Turn 2.')
+        assert result['speakers'][1]['word_count'] == 20000
+
+    def test_colon_labels_multiline(self, parser):
+        """Turns on separate lines are joined per speaker in first-seen order"""
+        transcript = "Teacher: What did you read?\nMaya: A story about a fox.\nTeacher: Why?\nMaya: Because it was funny."
+        result = parser.parse(transcript)
+        assert result['format_detected'] == 'labeled'
+        assert [speaker['name'] for speaker in result['speakers']] == ['Teacher', 'Maya']
+        assert speaker_texts(result)['Maya'] == "A story about a fox. Because it was funny."
+        assert result['speakers'][1]['word_count'] == 9
+
+    def test_labels_on_one_line(self, parser):
+        """Labels are found mid-line, not just at line starts"""
+        result = parser.parse("Teacher: Hi there. Maya: Hello! Teacher: Ready?")
+        assert speaker_texts(result) == {'Teacher': 'Hi there. Ready?', 'Maya': 'Hello!'}
+
+    @pytest.mark.parametrize('transcript', [
+        "[Teacher]: What happened?\n[Maya]: The fox ran.",
+        "<Teacher> What happened?\n<Maya> The fox ran.",
+        "Teacher - What happened?\nMaya - The fox ran.",
+    ])
+    def test_label_styles(self, parser, transcript):
+        result = parser.parse(transcript)
+        assert result['format_detected'] == 'labeled'
+        assert speaker_texts(result) == {'Teacher': 'What happened?', 'Maya': 'The fox ran.'}
+
+    def test_style_priority(self, parser):
+        """The first style found anywhere wins; other labels stay in the text"""
+        result = parser.parse("<Teacher> Say the time.\n<Maya> It is 10:30 now.")
+        assert speaker_texts(result) == {'10': '30 now.'}
+
+        result = parser.parse("[Teacher]: A well-known fox.\n[Maya]: Yes.")
+        assert speaker_texts(result) == {'Teacher': 'A well-known fox.', 'Maya': 'Yes.'}
+
+    def test_hyphens_read_as_dash_labels(self, parser):
+        """Without other labels, a hyphenated word splits the text"""
+        result = parser.parse("It was a well-known story")
+        assert result['format_detected'] == 'labeled'
+        assert speaker_texts(result) == {'well': 'known story'}
+
+    def test_empty_segments_dropped(self, parser):
+        """Labels with no text are skipped; all-empty labels fall back to plain"""
+        result = parser.parse("Teacher:\nMaya: Hi")
+        assert speaker_texts(result) == {'Maya': 'Hi'}
+
+        result = parser.parse("a:b:")
+        assert result['format_detected'] == 'plain'
+
+    def test_large_transcript(self, parser):
+        """Many turns are attributed like a short transcript"""
+        turns = ["Teacher: Question number %d?" % i if i % 2 == 0 else "Maya: Answer %d." % i for i in range(20000)]
+        result = parser.parse('\n'.join(turns))
+        texts = speaker_texts(result)
+        assert len(result['speakers']) == 2
+        assert texts['Teacher'].startswith("Question number 0? Question number 2?")
+        assert texts['Maya'].endswith("Answer 19999.")
+
+    def test_extract_student_text(self, parser):
+        result = parser.parse("Teacher: What happened?\nMaya: The fox ran.")
+        assert parser.extract_student_text(result, 'maya') == 'The fox ran.'
+        assert parser.extract_student_text(result) == 'What happened?'
+        assert parser.extract_student_text({'speakers': [], 'raw_text': 'raw'}) == 'raw'
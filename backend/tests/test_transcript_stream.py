@@ -0,0 +1,171 @@
+"""
+Tests for streamed transcript speaker attribution
+"""
+import io
+import json
+import random
+import pytest
+from nlp.transcript_json import JSONTranscriptError
+from nlp.transcript_parser import TranscriptParser
+from nlp.transcript_stream import TranscriptStream, SpeakerSummary
+
+
+TRANSCRIPTS = [
+    "Teacher: What did you read?\nMaya: A story about a fox.\nTeacher: Why?\nMaya: Because it was funny.",
+    "Teacher: Hi there. Maya: Hello! Teacher: Ready? Maya:",
+    "[Teacher]: What happened?\n[Maya]: The fox ran, at 10:30.\n[Teacher]: A well-known fox!",
+    "<Teacher> What happened?\n<Maya> The fox ran.\n\n<Maya>   It hid.",
+    "Teacher   -   What happened?\nMaya - The fox ran.\nTeacher -\n - Maya - ok",
+    "Intro text before labels. Teacher: first turn\nMaya: second turn",
+    "The dragon flew over the castle.\nIt was very big and nobody saw it.",
+]
+
+
+def stream_in_chunks(transcript, sizes, **kwargs):
+    """Feed a transcript in chunks of the given sizes (cycled) and collect fragments"""
+    stream = TranscriptStream(**kwargs)
+    fragments = []
+    position = 0
+    index = 0
+    while position < len(transcript):
+        size = sizes[index % len(sizes)]
+        fragments += stream.feed(transcript[position:position + size])
+        position += size
+        index += 1
+    fragments += stream.close()
+    return stream, fragments
+
+
+def joined_texts(fragments):
+    texts = {}
+    for speaker, text in fragments:
+        texts.setdefault(speaker, []).append(text)
+    return {speaker: ' '.join(' '.join(parts).split()) for speaker, parts in texts.items()}
+
+
+def parsed_texts(transcript):
+    result = TranscriptParser().parse(transcript)
+    return {speaker['name']: ' '.join(speaker['text'].split()) for speaker in result['speakers']}
+
+
+class TestTranscriptStream:
+    """Test suite for TranscriptStream"""
+
+    @pytest.mark.parametrize('transcript', TRANSCRIPTS)
+    @pytest.mark.parametrize('sizes', [[1], [3, 7], [4096]])
+    def test_matches_parser(self, transcript, sizes):
+        """Any chunking attributes the same words to the same speakers, in order"""
+        stream, fragments = stream_in_chunks(transcript, sizes)
+        assert list(joined_texts(fragments).items()) == list(parsed_texts(transcript).items())
+        assert stream.format_detected == TranscriptParser().parse(transcript)['format_detected']
+
+    def test_random_transcripts(self):
+        """Long generated transcripts match the parser for random chunk sizes"""
+        rng = random.Random(7)
+        words = "the fox ran well-known into a den and Maya said hello again".split()
+        for _ in range(20):
+            turns = [
+                f"{rng.choice(['Teacher', 'Maya', 'Leo'])}: " + ' '.join(rng.choice(words) for _ in range(rng.randint(0, 40)))
+                for _ in range(rng.randint(1, 50))
+            ]
+            transcript = rng.choice(['\n', ' ', '\n\n']).join(turns)
+            sizes = [rng.randint(1, 50) for _ in range(5)]
+            _, fragments = stream_in_chunks(transcript, sizes)
+            assert list(joined_texts(fragments).items()) == list(parsed_texts(transcript).items())
+
+    def test_holds_only_a_bounded_tail(self):
+        """A long monologue is emitted as it arrives instead of being buffered"""
+        stream = TranscriptStream(detect_chars=10)
+        stream.feed("Maya: ")
+        emitted = 0
+        for _ in range(1000):
+            emitted += sum(len(text) for _, text in stream.feed("and then the fox ran "))
+            assert len(stream._buffer) < 100
+        assert emitted > 19000
+
+    def test_label_split_across_chunks(self):
+        """A label cut between two chunks is still recognised"""
+        _, fragments = stream_in_chunks("Teacher - Hello there Maya\n   - Hi", [22, 3], detect_chars=5)
+        assert joined_texts(fragments) == {'Teacher': 'Hello there', 'Maya': 'Hi'}
+
+    def test_style_fixed_from_detection_window(self):
+        """Labels of a higher-priority style after the window do not change the format"""
+        transcript = "<Teacher> What time is it?\n<Maya> It is 10:30 now."
+        _, fragments = stream_in_chunks(transcript, [5], detect_chars=10)
+        assert joined_texts(fragments) == {'Teacher': 'What time is it?', 'Maya': 'It is 10:30 now.'}
+
+    def test_plain_transcript(self):
+        stream, fragments = stream_in_chunks("   Once upon a time\nthere was a fox.  ", [4])
+        assert stream.format_detected == 'plain'
+        assert joined_texts(fragments) == {'Speaker': 'Once upon a time there was a fox.'}
+
+    def test_json_transcript(self):
+        """JSON items are emitted as they arrive"""
+        transcript = json.dumps({'speakers': [{'name': 'Maya', 'text': 'The fox ran.'}, {'name': 'Leo', 'text': 'It hid.'}]})
+        stream, fragments = stream_in_chunks(transcript, [10], detect_chars=5)
+        assert stream.format_detected == 'json'
+        assert fragments == [('Maya', 'The fox ran.'), ('Leo', 'It hid.')]
+
+        stream = TranscriptStream(detect_chars=5)
+        assert stream.feed('{"speakers": [{"name": "Maya", "text": "Hi"}, {') == [('Maya', 'Hi')]
+
+    def test_json_first_array_only(self):
+        """Fragments come from the first transcript array in the document"""
+        transcript = json.dumps({'transcript': [{'speaker': 'Maya', 'text': 'a'}], 'speakers': [{'name': 'Leo', 'text': 'b'}]})
+        _, fragments = stream_in_chunks(transcript, [4], detect_chars=5)
+        assert fragments == [('Maya', 'a')]
+
+    @pytest.mark.parametrize('transcript', [
+        '{"speakers": [{"name": "Maya", "text": "a"}',
+        '{"speakers": [{"name": "Maya", "text": 5}]}',
+    ])
+    def test_invalid_json_transcript(self, transcript):
+        with pytest.raises(JSONTranscriptError):
+            stream_in_chunks(transcript, [4], detect_chars=5)
+
+
+class TestSpeakerSummary:
+    """Test suite for SpeakerSummary"""
+
+    def test_counts_and_previews(self):
+        summary = SpeakerSummary(preview_chars=20)
+        summary.add('Maya', 'The fox ran')
+        summary.add('Leo', 'Hi')
+        summary.add('Maya', 'into a very deep den')
+        assert summary.speakers() == [
+            {'name': 'Maya', 'word_count': 8, 'preview': 'The fox ran into a v...'},
+            {'name': 'Leo', 'word_count': 1, 'preview': 'Hi'}
+        ]
+        assert summary.find('maya') == 'Maya'
+        assert summary.find('Ana') is None
+
+
+class TestReadTranscriptStream:
+    """Test suite for the submissions API stream reader"""
+
+    @staticmethod
+    async def chunks(transcript, size):
+        for start in range(0, len(transcript), size):
+            yield transcript[start:start + size]
+
+    @pytest.mark.asyncio
+    async def test_spools_selected_speaker(self):
+        from api.submissions import _read_transcript_stream
+
+        spool = io.StringIO()
+        stream, summary, stored, word_count = await _read_transcript_stream(
+            self.chunks(TRANSCRIPTS[0], 5), 'maya', spool
+        )
+        assert ' '.join(spool.getvalue().split()) == "A story about a fox. Because it was funny."
+        assert word_count == 9
+        assert stored == TRANSCRIPTS[0]
+        assert [speaker['name'] for speaker in summary.speakers()] == ['Teacher', 'Maya']
+
+    @pytest.mark.asyncio
+    async def test_spools_whole_transcript_without_speaker(self):
+        from api.submissions import _read_transcript_stream
+
+        spool = io.StringIO()
+        _, _, _, word_count = await _read_transcript_stream(self.chunks(TRANSCRIPTS[0], 3), None, spool)
+        assert spool.getvalue() == TRANSCRIPTS[0]
+        assert word_count == len(TRANSCRIPTS[0].split())
@@ -0,0 +1,88 @@
+"""
+Tests for the in-memory word pool cache
+"""
+import pytest
+from db.word_cache import WordPoolCache
+
+
+class StubWordPoolCache(WordPoolCache):
+    """WordPoolCache backed by a list instead of Supabase"""
+    
+    def __init__(self, rows, **kwargs):
+        super().__init__(**kwargs)
+        self.rows = rows
+        self.fetches = 0
+    
+    async def _fetch_table_version(self):
+        return (len(self.rows), None)
+    
+    async def _fetch_words(self):
+        self.fetches += 1
+        return list(self.rows)
+
+
+def make_rows(difficulties):
+    return [
+        {'id': str(i), 'word': f'word{i}', 'difficulty_score': d}
+        for i, d in enumerate(difficulties)
+    ]
+
+
+class TestWordPoolCache:
+    """Test suite for WordPoolCache"""
+    
+    @pytest.mark.asyncio
+    async def test_get_range_inclusive(self):
+        """Range queries include both bounds and come back sorted"""
+        cache = StubWordPoolCache(make_rows([50, 10, 35, 45, 35, 80]))
+        words = await cache.get_range(35, 50)
+        assert [w['difficulty_score'] for w in words] == [35, 35, 45, 50]
+    
+    @pytest.mark.asyncio
+    async def test_get_range_limit_spans_range(self):
+        """Limited results are sampled across the whole range, not just the easiest words"""
+        cache = StubWordPoolCache(make_rows(range(100)))
+        words = await cache.get_range(0, 99, limit=10)
+        difficulties = [w['difficulty_score'] for w in words]
+        assert len(words) == 10
+        assert difficulties[0] == 0
+        assert difficulties[-1] >= 90
+    
+    @pytest.mark.asyncio
+    async def test_results_are_copies(self):
+        """Mutating returned rows does not change the cache"""
+        cache = StubWordPoolCache(make_rows([40]))
+        words = await cache.get_range(0, 100)
+        words[0]['difficulty_score'] = 99
+        assert (await cache.get_range(0, 100))[0]['difficulty_score'] == 40
+    
+    @pytest.mark.asyncio
+    async def test_loads_once_within_ttl(self):
+        """Repeated queries reuse the cached rows"""
+        cache = StubWordPoolCache(make_rows([10, 20, 30]))
+        for _ in range(5):
+            await cache.get_range(0, 100)
+        assert cache.fetches == 1
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads(self):
+        """Invalidation picks up new words on the next query"""
+        cache = StubWordPoolCache(make_rows([10, 20]))
+        assert len(await cache.get_range(0, 100)) == 2
+        
+        cache.rows.append({'id': 'new', 'word': 'new', 'difficulty_score': 30})
+        cache.invalidate()
+        assert len(await cache.get_range(0, 100)) == 3
+        assert cache.fetches == 2
+    
+    @pytest.mark.asyncio
+    async def test_expired_but_unchanged_skips_reload(self):
+        """After the TTL, rows are only refetched if the table version changed"""
+        cache = StubWordPoolCache(make_rows([10, 20]), ttl_seconds=0)
+        await cache.get_range(0, 100)
+        await cache.get_range(0, 100)
+        assert cache.fetches == 1
+        
+        cache.rows.append({'id': 'new', 'word': 'new', 'difficulty_score': 30})
+        assert len(await cache.get_range(0, 100)) == 3
+        assert cache.fetches == 2
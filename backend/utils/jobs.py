@@ -0,0 +1,242 @@
+"""
+Background Jobs
+In-process job queue for work that should not hold an HTTP request open
+
+A job is queued with the coroutine that runs it and handed to one of a fixed
+number of worker tasks, so a burst of submissions waits in the queue instead
+of competing for the profiler. Job state (status, current stage, result or
+error) is kept in memory for polling and event streams; finished jobs are
+dropped oldest first past JOB_RESULTS_MAX. Jobs live and die with the
+process (the API runs as a single uvicorn process).
+"""
+import asyncio
+import contextlib
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+from uuid import uuid4
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Queue settings (override via environment)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # Jobs run at once
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "500"))  # Queued jobs before new ones are refused
+JOB_RESULTS_MAX = int(os.getenv("JOB_RESULTS_MAX", "5000"))  # Finished jobs kept for polling
+JOB_RETRY_AFTER = int(os.getenv("JOB_RETRY_AFTER", "10"))  # Seconds clients should wait when the queue is full
+
+JOB_STATUSES = ('queued', 'running', 'completed', 'failed')
+
+
+class JobQueueFullError(Exception):
+    """Raised when the queue is full and the job should be submitted again later"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class Job:
+    """State of one queued job; updates wake anyone watching it"""
+
+    def __init__(self, job_id: str, kind: str):
+        self.id = job_id
+        self.kind = kind
+        self.status = 'queued'
+        self.stage: Optional[str] = None  # Set by the job as it runs
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.version = 0  # Incremented on every update
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    def update(self, **fields):
+        """Change job fields and notify watchers"""
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.version += 1
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def set_stage(self, stage: str):
+        self.update(stage=stage)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'stage': self.stage,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+    async def updates(self, keepalive: float) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        The job's state now and after each change, until it is done
+
+        Yields None when nothing changed for keepalive seconds.
+        """
+        seen = -1
+        while True:
+            changed = self._changed
+            if self.version != seen:
+                seen = self.version
+                yield self.to_dict()
+                if self.done:
+                    return
+                continue
+            try:
+                await asyncio.wait_for(changed.wait(), keepalive)
+            except asyncio.TimeoutError:
+                yield None
+
+
+JobRunner = Callable[[Job], Awaitable[Any]]
+
+
+class JobQueue:
+    """Bounded FIFO of jobs run by a fixed pool of asyncio worker tasks"""
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_queued: int = JOB_QUEUE_MAX,
+        max_results: int = JOB_RESULTS_MAX,
+        retry_after: int = JOB_RETRY_AFTER
+    ):
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.max_results = max_results
+        self.retry_after = retry_after
+        self._jobs: Dict[str, Job] = {}  # Queued and running jobs
+        self._reserved = 0  # Places held by reserve() for jobs not submitted yet
+        self._finished: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @contextlib.contextmanager
+    def reserve(self) -> Iterator[None]:
+        """
+        Hold a place in the queue for a job submitted inside the block
+
+        Raises JobQueueFullError straight away when the queue (counting other
+        reservations) is full, so a caller can refuse a request before its
+        awaited writes. Submit the job with reserved=True.
+        """
+        if self.queued + self._reserved >= self.max_queued:
+            raise JobQueueFullError(self.retry_after)
+        self._reserved += 1
+        try:
+            yield
+        finally:
+            self._reserved -= 1
+
+    def submit(self, run: JobRunner, kind: str, job_id: Optional[str] = None, reserved: bool = False) -> Job:
+        """
+        Queue a job (call from the event loop)
+
+        Args:
+            run: Coroutine function called with the Job; its return value is the result
+            kind: What the job does (reported with its status)
+            job_id: Id to use instead of a new UUID
+            reserved: The caller holds a place from reserve(), so the job is always accepted
+
+        Raises:
+            JobQueueFullError: if max_queued jobs are already waiting or reserved
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if not reserved and self._queue.qsize() + self._reserved >= self.max_queued:
+            raise JobQueueFullError(self.retry_after)
+        if not self._tasks:
+            loop = asyncio.get_running_loop()
+            self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+        job = Job(job_id or str(uuid4()), kind)
+        self._jobs[job.id] = job
+        self._queue.put_nowait((job, run))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A queued, running or recently finished job"""
+        return self._jobs.get(job_id) or self._finished.get(job_id)
+
+    async def _work(self):
+        while True:
+            job, run = await self._queue.get()
+            try:
+                await self._run(job, run)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job, run: JobRunner):
+        job.update(status='running', started_at=datetime.utcnow().isoformat())
+        try:
+            result = await run(job)
+            job.update(status='completed', result=result, finished_at=datetime.utcnow().isoformat())
+        except Exception as e:
+            logger.error(f"Error running {job.kind} job {job.id}: {e}")
+            job.update(status='failed', error=str(e) or type(e).__name__, finished_at=datetime.utcnow().isoformat())
+
+        self._jobs.pop(job.id, None)
+        self._finished[job.id] = job
+        while len(self._finished) > self.max_results:
+            self._finished.popitem(last=False)
+
+    async def join(self):
+        """Wait until every queued job has finished"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def shutdown(self):
+        """Cancel the workers; jobs still queued are not run"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+
+# Global queue (created on first use)
+_job_queue: Optional[JobQueue] = None
+
+def get_job_queue() -> JobQueue:
+    """Get or create the global job queue"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
+
+async def shutdown_job_queue():
+    """Stop the job workers (app shutdown hook)"""
+    global _job_queue
+    if _job_queue is not None:
+        await _job_queue.shutdown()
+        _job_queue = None
+
+def queue_full_exception(error: JobQueueFullError):
+    """HTTP 503 telling the client when to retry"""
+    from fastapi import HTTPException
+    return HTTPException(
+        status_code=503,
+        detail="Too many submissions are waiting to be analyzed. Please try again shortly.",
+        headers={"Retry-After": str(error.retry_after)}
+    )
@@ -0,0 +1,107 @@
+"""
+Stage Graph
+Runs a pipeline's async stages concurrently, each as soon as the stages it
+depends on have finished
+
+Every stage runs even if an unrelated one failed; stages that depend on a
+failed stage are skipped. Failures are collected into one StageError rather
+than stopping at the first, and each stage is timed.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Stage(NamedTuple):
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]  # Called with the results of earlier stages
+    after: Tuple[str, ...] = ()  # Stages whose results it needs
+
+
+class StageError(Exception):
+    """One or more stages failed; errors and skipped hold the details"""
+
+    def __init__(self, errors: Dict[str, Exception], skipped: List[str]):
+        failed = '; '.join(f"{name}: {error}" for name, error in errors.items())
+        message = f"{len(errors)} stage(s) failed ({failed})"
+        if skipped:
+            message += f", skipped {', '.join(skipped)}"
+        super().__init__(message)
+        self.errors = errors
+        self.skipped = skipped
+
+
+class StageRun(NamedTuple):
+    results: Dict[str, Any]  # Stage name -> return value, for stages that succeeded
+    timings: Dict[str, float]  # Stage name -> seconds, for stages that ran
+    errors: Dict[str, Exception]
+    skipped: List[str]  # Not run because a stage they depend on failed
+
+    def timing_summary(self) -> str:
+        return ', '.join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.timings.items())
+
+    def raise_for_errors(self):
+        """Raise StageError if any stage failed"""
+        if self.errors:
+            raise StageError(self.errors, self.skipped)
+
+
+async def run_stages(stages: List[Stage]) -> StageRun:
+    """
+    Run stages concurrently in dependency order
+
+    Args:
+        stages: Stages listed after the stages they depend on
+
+    Returns:
+        StageRun (failures are reported, not raised: see raise_for_errors)
+    """
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    errors: Dict[str, Exception] = {}
+    skipped: List[str] = []
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_stage(stage: Stage):
+        if stage.after:
+            await asyncio.wait([tasks[name] for name in stage.after])
+        if any(name not in results for name in stage.after):
+            skipped.append(stage.name)
+            return
+        started = time.perf_counter()
+        try:
+            results[stage.name] = await stage.run(results)
+        except Exception as e:
+            errors[stage.name] = e
+        finally:
+            timings[stage.name] = time.perf_counter() - started
+
+    listed = set()
+    for stage in stages:
+        if stage.name in listed:
+            raise ValueError(f"Duplicate stage '{stage.name}'")
+        unknown = [name for name in stage.after if name not in listed]
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on {unknown}, which must be listed before it")
+        listed.add(stage.name)
+
+    loop = asyncio.get_running_loop()
+    for stage in stages:
+        tasks[stage.name] = loop.create_task(run_stage(stage))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    # Report in the order the stages were listed
+    order = {stage.name: index for index, stage in enumerate(stages)}
+    timings = dict(sorted(timings.items(), key=lambda item: order[item[0]]))
+    errors = dict(sorted(errors.items(), key=lambda item: order[item[0]]))
+    skipped.sort(key=order.get)
+    return StageRun(results, timings, errors, skipped)
+
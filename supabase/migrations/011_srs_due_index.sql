@@ -0,0 +1,16 @@
+-- SRS Due-Word Indexes
+-- Session start asks for a student's due reviews (due_date <= today, most
+-- overdue first) and a few never-reviewed words, instead of loading every
+-- srs_progress row the student has.
+
+-- Due reviews: equality on student_id, range + ORDER BY on due_date
+CREATE INDEX IF NOT EXISTS idx_srs_progress_student_due
+    ON public.srs_progress(student_id, due_date, word_id);
+
+-- New words: only rows that have never been reviewed, oldest first
+CREATE INDEX IF NOT EXISTS idx_srs_progress_student_unreviewed
+    ON public.srs_progress(student_id, created_at, word_id)
+    WHERE repetitions = 0 AND last_reviewed IS NULL;
+
+-- The composite index covers lookups by student_id alone
+DROP INDEX IF EXISTS public.idx_srs_progress_student_id;
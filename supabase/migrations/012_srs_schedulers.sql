@@ -0,0 +1,12 @@
+-- SRS Scheduler Selection
+-- Classes choose the algorithm that schedules their students' reviews
+-- (see backend/nlp/schedulers.py). FSRS keeps a memory state per card.
+
+ALTER TABLE public.classes
+    ADD COLUMN IF NOT EXISTS scheduler TEXT NOT NULL DEFAULT 'sm2'
+    CHECK (scheduler IN ('sm2', 'fsrs'));
+
+-- FSRS memory state (NULL for cards last scheduled by SM-2)
+ALTER TABLE public.srs_progress
+    ADD COLUMN IF NOT EXISTS stability REAL,
+    ADD COLUMN IF NOT EXISTS difficulty REAL;
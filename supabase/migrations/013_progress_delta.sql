@@ -0,0 +1,52 @@
+-- Atomic Student Progress Updates
+-- Applies a submission's word, submission and point deltas, the daily streak
+-- and the vocabulary level in one statement, so concurrent submissions for a
+-- student cannot lose updates (see backend/db/student_progress.py).
+--
+-- Streak: a submission the day after the last one extends it, one on the
+-- same day keeps it, anything else starts a new streak of 1.
+
+CREATE OR REPLACE FUNCTION public.apply_progress_delta(
+    p_student_id UUID,
+    p_words INTEGER DEFAULT 0,
+    p_submissions INTEGER DEFAULT 0,
+    p_points INTEGER DEFAULT 0,
+    p_vocabulary_level TEXT DEFAULT NULL,
+    p_today DATE DEFAULT CURRENT_DATE
+)
+RETURNS public.student_progress AS $$
+    INSERT INTO public.student_progress AS p (
+        student_id,
+        vocabulary_level,
+        total_words_written,
+        submission_count,
+        current_streak,
+        last_submission_date,
+        total_points
+    )
+    VALUES (
+        p_student_id,
+        COALESCE(p_vocabulary_level, 'beginner'),
+        p_words,
+        p_submissions,
+        CASE WHEN p_submissions > 0 THEN 1 ELSE 0 END,
+        CASE WHEN p_submissions > 0 THEN p_today END,
+        p_points
+    )
+    ON CONFLICT (student_id) DO UPDATE SET
+        total_words_written = COALESCE(p.total_words_written, 0) + p_words,
+        submission_count = COALESCE(p.submission_count, 0) + p_submissions,
+        total_points = COALESCE(p.total_points, 0) + p_points,
+        vocabulary_level = COALESCE(p_vocabulary_level, p.vocabulary_level),
+        current_streak = CASE
+            WHEN p_submissions = 0 THEN p.current_streak
+            WHEN p.last_submission_date = p_today - 1 THEN COALESCE(p.current_streak, 0) + 1
+            WHEN p.last_submission_date = p_today THEN COALESCE(p.current_streak, 0)
+            ELSE 1
+        END,
+        last_submission_date = CASE
+            WHEN p_submissions > 0 THEN p_today
+            ELSE p.last_submission_date
+        END
+    RETURNING p.*;
+$$ LANGUAGE sql;